@@ -10,9 +10,19 @@ from fastapi import APIRouter, Query
 from app.api.deps import CurrentSession, SessionAdmin, SessionDeveloper
 from app.models.auth import Account
 from app.models.library import Library
+from app.schemas.admin import CacheStatsSchema
 from app.schemas.auth import CurrentUserSchema, PaginatedUsersSchema, UpdateUserRoleSchema
 from app.schemas.library import NoteSchema, SearchIndexStatsSchema
-from app.services import cache_service, search_service, task_client
+from app.services import (
+    cache_service,
+    leaderboard_service,
+    local_search_index,
+    search_cache_warmer,
+    search_service,
+    suggest_service,
+    task_client,
+)
+from app.utils.exceptions import AppError
 
 router = APIRouter()
 
@@ -29,7 +39,9 @@ async def approve_note(
     Admin-only endpoint that marks a note as approved, making it visible
     to all users in the library. This is the final step in the content
     moderation workflow. The document is automatically queued for indexing
-    to OpenSearch via a background Celery task.
+    to OpenSearch via a background Celery task, or written straight to the
+    Postgres search backend when that one is configured, which still has the
+    task service extract the document's content.
 
     Args:
         session: Active database session
@@ -46,25 +58,35 @@ async def approve_note(
     """
     note = await Library.approve_note(session, id)
 
-    await task_client.trigger_index_document(
-        doc_id=note.id,
-        document_name=note.document_name,
-        category=note.doc_category.name,
-        subject=note.doc_subject.name,
-        doc_type=note.doc_type.name,
-        year=note.year,
-        uploaded_by=note.account.username,
-        uploaded_on=note.uploaded_on,
-        file_name=note.file_name,
-        extension=note.extension,
-        view_count=note.view_count,
-        category_id=note.doc_category.id,
-        subject_id=note.doc_subject.id,
-        type_id=note.doc_type.id,
-        user_id=note.account.user_id,
-    )
+    document = {
+        "doc_id": note.id,
+        "document_name": note.document_name,
+        "category": note.doc_category.name,
+        "subject": note.doc_subject.name,
+        "doc_type": note.doc_type.name,
+        "year": note.year,
+        "uploaded_by": note.account.username,
+        "uploaded_on": note.uploaded_on,
+        "file_name": note.file_name,
+        "extension": note.extension,
+        "view_count": note.view_count,
+        "category_id": note.doc_category.id,
+        "subject_id": note.doc_subject.id,
+        "type_id": note.doc_type.id,
+        "user_id": note.account.user_id,
+    }
+    task_id = None
+    if search_service.queue_writes:
+        task_id = await task_client.trigger_index_document(**document)
+    else:
+        await search_service.index_document(**document)
 
-    await cache_service.delete_pattern("search:*")
+    suggest_service.add_document(note.id, note.document_name, note.view_count)
+    local_search_index.add_document({**document, "id": note.id})
+
+    await leaderboard_service.refresh_users(session, note.uploaded_by)
+    await cache_service.invalidate_search(note.doc_category.name, note.doc_subject.name)
+    search_cache_warmer.schedule(task_id)
 
     return note
 
@@ -76,6 +98,7 @@ async def get_all_account(
     page: int = Query(1, title="Page number", gt=0),
     size: int = Query(20, title="Page size", gt=0, le=50),
     search: str | None = Query(None, title="Search by username"),
+    cursor: str | None = Query(None, title="Opaque cursor from a previous next_cursor"),
 ) -> PaginatedUsersSchema:
     """
     Get paginated list of all registered users.
@@ -89,14 +112,18 @@ async def get_all_account(
         page: Page number (1-indexed)
         size: Number of items per page (max 50)
         search: Optional username search filter (case-insensitive partial match)
+        cursor: Continuation cursor returned as next_cursor; page is ignored when given
 
     Returns:
         PaginatedUsersSchema: Paginated list of users with metadata
 
     Raises:
+        HTTPException(400): If the cursor is malformed
         HTTPException(403): If user is not a developer
     """
-    res = await Account.get_all_users_paginated(session, page=page, size=size, search=search)
+    res = await Account.get_all_users_paginated(
+        session, page=page, size=size, search=search, cursor=cursor
+    )
     return res
 
 
@@ -159,6 +186,33 @@ async def update_account(
     return res
 
 
+@router.get("/cache/status", response_model=CacheStatsSchema)
+async def get_cache_status(
+    authenticated: SessionDeveloper,  # noqa: ARG001
+    limit: int = Query(20, title="Number of top queries", gt=0, le=200),
+) -> CacheStatsSchema:
+    """
+    Get hit and miss counters for the search cache tiers.
+
+    Developer-only endpoint reporting how often reads were answered by the
+    in-process L1 cache and by Redis, as seen by the worker serving the request,
+    and the hit rate of the most looked-up canonical search queries across workers.
+
+    Args:
+        authenticated: Developer user with access permissions
+        limit: Number of top queries to include
+
+    Returns:
+        CacheStatsSchema: Per-tier counters, L1 occupancy and per-query hit rates
+    """
+    return CacheStatsSchema(
+        enabled=cache_service.is_enabled,
+        l1_enabled=cache_service.use_local,
+        top_queries=await cache_service.get_query_stats(limit),
+        **cache_service.stats,
+    )
+
+
 @router.get("/search/status", response_model=SearchIndexStatsSchema)
 async def get_search_index_status(
     authenticated: SessionDeveloper,
@@ -167,7 +221,7 @@ async def get_search_index_status(
     Get OpenSearch index status and statistics.
 
     Developer-only endpoint that returns information about the search index
-    including availability, document count, and storage size.
+    including availability, circuit breaker state, document count, and storage size.
 
     Args:
         authenticated: Developer user with access permissions
@@ -175,19 +229,24 @@ async def get_search_index_status(
     Returns:
         SearchIndexStatsSchema: Index statistics and health status
     """
-    available = await search_service.is_available()
+    available = await search_service.is_available(refresh=True)
+    breaker_state = search_service.health.state
     if not available:
-        return SearchIndexStatsSchema(available=False)
+        return SearchIndexStatsSchema(available=False, breaker_state=breaker_state)
 
     stats = await search_service.get_index_stats()
     if stats is None:
-        return SearchIndexStatsSchema(available=True, exists=False)
+        return SearchIndexStatsSchema(available=True, exists=False, breaker_state=breaker_state)
 
     return SearchIndexStatsSchema(
         available=True,
         exists=stats.get("exists", False),
+        index=stats.get("index"),
         doc_count=stats.get("doc_count", 0),
         size_mb=stats.get("size_mb", 0.0),
+        breaker_state=breaker_state,
+        versions=await search_service.list_index_versions(),
+        tiers=search_service.tier_stats,
     )
 
 
@@ -195,25 +254,38 @@ async def get_search_index_status(
 async def reindex_search(
     session: CurrentSession,
     authenticated: SessionDeveloper,  # noqa: ARG001
-    recreate_index: bool = Query(False, title="Delete and recreate index"),
+    recreate_index: bool = Query(False, title="Build a new index version"),
 ) -> dict:
     """
     Trigger a full reindex of all approved documents to OpenSearch.
 
     Developer-only endpoint that queues Celery tasks for each approved document,
-    ensuring full PDF text extraction. Can optionally delete and recreate the
-    index before queuing tasks.
+    ensuring full PDF text extraction. With ``recreate_index`` the tasks fill a
+    new index version while searches keep using the live one; call
+    ``/search/promote`` once the queue drains to switch over.
+
+    The Postgres search backend is refreshed in place instead, keeping any
+    content already extracted by ``scripts/build_search_index.py``.
 
     Args:
         session: Active database session
         authenticated: Developer user with reindex permissions
-        recreate_index: If True, delete existing index before reindexing
+        recreate_index: If True, build into a new index version instead of the live one
 
     Returns:
-        dict: Status message with count of queued tasks
+        dict: Status message with count of queued tasks and the target index
+
+    Raises:
+        HTTPException(400): If a new index version could not be created
+        HTTPException(503): If ``recreate_index`` is set and the search backend is down
     """
-    if recreate_index and await search_service.is_available():
-        await search_service.create_index(delete_existing=True)
+    target_index = None
+    if recreate_index:
+        if not await search_service.is_available(refresh=True):
+            raise AppError.SERVICE_UNAVAILABLE_ERROR
+        target_index = await search_service.begin_reindex()
+        if target_index is None:
+            raise AppError.BAD_REQUEST_ERROR
 
     from sqlalchemy import select
     from sqlalchemy.orm import selectinload
@@ -248,13 +320,22 @@ async def reindex_search(
             "subject_id": doc.doc_subject.id,
             "type_id": doc.doc_type.id,
             "user_id": doc.account.user_id,
+            "index": target_index,
         }
         for doc in documents
     ]
 
-    queued, failed = await task_client.trigger_bulk_index(docs_to_index)
+    if search_service.queue_writes:
+        task_ids, failed = await task_client.trigger_bulk_index(docs_to_index)
+        queued = len(task_ids)
+    else:
+        queued, failed = await search_service.bulk_index_documents(
+            [{**doc, "id": doc["doc_id"]} for doc in docs_to_index], index=target_index
+        )
 
-    await cache_service.delete_pattern("search:*")
+    if target_index is None:
+        # Not warmed: pages are loaded by lookups while thousands of tasks drain.
+        await cache_service.invalidate_search()
 
     return {
         "status": "started",
@@ -263,4 +344,69 @@ async def reindex_search(
         "queued": queued,
         "failed": failed,
         "recreate_index": recreate_index,
+        "index": target_index,
     }
+
+
+@router.post("/search/promote", response_model=SearchIndexStatsSchema)
+async def promote_search_index(
+    authenticated: SessionDeveloper,  # noqa: ARG001
+    index: str = Query(..., title="Index version to serve searches from"),
+) -> SearchIndexStatsSchema:
+    """
+    Switch searches over to a rebuilt index version.
+
+    Developer-only endpoint that restores normal refresh and replica settings
+    on the given version, atomically moves the search alias onto it and
+    deletes versions beyond the retention limit.
+
+    Args:
+        authenticated: Developer user with reindex permissions
+        index: Name of the index version returned by ``/search/reindex``
+
+    Returns:
+        SearchIndexStatsSchema: Index status after the switch
+
+    Raises:
+        HTTPException(404): If the index version does not exist
+        HTTPException(400): If the alias could not be moved
+    """
+    versions = await search_service.list_index_versions()
+    if not any(version["index"] == index for version in versions):
+        raise AppError.RESOURCES_NOT_FOUND_ERROR
+
+    if not await search_service.promote_index(index):
+        raise AppError.BAD_REQUEST_ERROR
+
+    await cache_service.invalidate_search()
+    search_cache_warmer.schedule()
+
+    return await get_search_index_status(authenticated)
+
+
+@router.post("/search/rollback", response_model=SearchIndexStatsSchema)
+async def rollback_search_index(
+    authenticated: SessionDeveloper,  # noqa: ARG001
+) -> SearchIndexStatsSchema:
+    """
+    Point searches back at the previous index version.
+
+    Developer-only endpoint that atomically moves the search alias to the
+    newest retained version older than the live one.
+
+    Args:
+        authenticated: Developer user with reindex permissions
+
+    Returns:
+        SearchIndexStatsSchema: Index status after the rollback
+
+    Raises:
+        HTTPException(404): If there is no older version to roll back to
+    """
+    if await search_service.rollback_index() is None:
+        raise AppError.RESOURCES_NOT_FOUND_ERROR
+
+    await cache_service.invalidate_search()
+    search_cache_warmer.schedule()
+
+    return await get_search_index_status(authenticated)
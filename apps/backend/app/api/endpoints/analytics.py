@@ -5,11 +5,15 @@ This module provides endpoints for retrieving Google Analytics data
 and other platform usage metrics to monitor user engagement and
 content performance.
 """
+from typing import Any
+
 from fastapi import APIRouter
+from redis import RedisError
 
 from app.api.deps import CurrentSession
 from app.models.analytics import Analytics
 from app.schemas.analytics import AnalyticsResponse
+from app.schemas.library import SearchContentSchema
 
 router = APIRouter()
 
@@ -34,7 +38,7 @@ async def fetch_google_analytics(session: CurrentSession):
 
 
 @router.post("/update_scoreboard")
-async def update_scoreboard(session: CurrentSession):
+async def update_scoreboard(session: CurrentSession) -> dict[str, Any]:
     """
     Update scoreboard rankings for all users.
 
@@ -44,13 +48,69 @@ async def update_scoreboard(session: CurrentSession):
     Args:
         session: Active database session
 
+    Counts are maintained as notes are approved and deleted, so this is a
+    consistency check that reports how many rows had drifted. The Redis
+    leaderboard is then rebuilt from the reconciled counts; if Redis is
+    unreachable the size is None and reads fall back to Postgres.
+
     Returns:
-        dict: Success status and message
+        dict: Success status, message, number of corrected rows and leaderboard size
     """
     from app.models.scoreboard import Scoreboard
+    from app.services import leaderboard_service
+
+    corrected = await Scoreboard.update_scoreboard_users(session=session)
+    try:
+        ranked: int | None = await leaderboard_service.rebuild(session)
+    except RedisError:
+        ranked = None
+    return {
+        "status": "success",
+        "message": "Scoreboard updated",
+        "corrected": corrected,
+        "leaderboard_size": ranked,
+    }
+
+
+@router.post("/update_search_popularity")
+async def update_search_popularity(session: CurrentSession):
+    """
+    Push changed download counters into the search index.
+
+    This endpoint is called by the task service to refresh the
+    popularity and recent-downloads ranking signals of documents
+    downloaded since the last run.
+
+    Args:
+        session: Active database session
+
+    Returns:
+        dict: Success status and number of documents updated
+    """
+    from app.services import popularity_service
+
+    result = await popularity_service.sync_search_index(session)
+    return {"status": "success", **result}
+
+
+@router.post("/update_search_content")
+async def update_search_content(data: SearchContentSchema) -> dict[str, Any]:
+    """
+    Store the text extracted from an approved note.
+
+    This endpoint is called back by the task service's content extraction
+    task, which the Postgres search backend queues on approval.
+
+    Args:
+        data: Note ID and its extracted text
+
+    Returns:
+        dict: Success status and whether the text was stored
+    """
+    from app.services import search_service
 
-    await Scoreboard.update_scoreboard_users(session=session)
-    return {"status": "success", "message": "Scoreboard updated"}
+    stored = await search_service.store_content(data.doc_id, data.content)
+    return {"status": "success", "stored": stored}
 
 
 @router.get("/get_latest_analytics", response_model=AnalyticsResponse)
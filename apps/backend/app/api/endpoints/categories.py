@@ -5,10 +5,12 @@ This module provides endpoints for managing categories (education levels),
 subjects, and document types. These form the taxonomy for organizing
 educational resources in the library system.
 """
-from fastapi import APIRouter
-from sqlalchemy.orm import joinedload
+from typing import Any
+
+from fastapi import APIRouter, Request, Response, status
 
 from app.api.deps import CurrentSession, SessionDeveloper
+from app.core.config import settings
 from app.models.categories import CategoryLevel, DocumentTypes, Subjects
 from app.schemas.categories import (
     CategoryCreateSchema,
@@ -21,23 +23,39 @@ from app.schemas.categories import (
     SubjectSchema,
     SubjectUpdateSchema,
 )
+from app.services import cache_service, suggest_service, taxonomy_service
+from app.services.cache import FACET_TREE_CACHE_KEY
+from app.services.taxonomy import etag_matches
+from app.utils.exceptions import AppError
 
 router = APIRouter()
 
 
+def _taxonomy_response(request: Request, payload: tuple[bytes, str]) -> Response:
+    body, etag = payload
+    headers = {"ETag": etag, "Cache-Control": settings.taxonomy_cache_control}
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
 @router.get("/all_subjects", response_model=list[SubjectSchema])
 async def get_subjects_list(
+    request: Request,
     session: CurrentSession,
     category_id: int = None,
-) -> list[SubjectSchema]:
+) -> Response:
     """
     Get list of all available subjects with optional category filtering.
 
     Returns all subjects in the system, optionally filtered by education level
-    (category). Includes category information for each subject.
+    (category). Includes category information for each subject. Served from
+    the in-memory taxonomy snapshot with a strong ETag; a matching
+    If-None-Match gets 304 Not Modified.
 
     Args:
-        session: Active database session
+        request: Incoming request, for If-None-Match
+        session: Active database session, used only to load the snapshot
         category_id: Optional filter by category/education level ID
 
     Returns:
@@ -46,36 +64,37 @@ async def get_subjects_list(
     Example:
         GET /all_subjects?category_id=1 returns all O-Level subjects
     """
-    filter_ = {"category_id": category_id} if category_id is not None else None
-    data = await Subjects.get_all(session, filter_=filter_, options=[joinedload(Subjects.category)])
-    return data
+    snapshot = await taxonomy_service.get(session)
+    return _taxonomy_response(request, snapshot.subjects_payload(category_id))
 
 
 @router.get("/all_category_level", response_model=list[CategorySchema])
 async def get_category_level_list(
+    request: Request,
     session: CurrentSession,
-) -> list[CategorySchema]:
+) -> Response:
     """
     Get list of all education levels/categories.
 
     Returns all available education levels in the system
-    (e.g., O-Level, A-Level, IB).
+    (e.g., O-Level, A-Level, IB), from the taxonomy snapshot with a strong ETag.
 
     Args:
-        session: Active database session
+        request: Incoming request, for If-None-Match
+        session: Active database session, used only to load the snapshot
 
     Returns:
         List[CategorySchema]: List of all education level categories
     """
-    data = await CategoryLevel.get_all(session)
-    return data
+    snapshot = await taxonomy_service.get(session)
+    return _taxonomy_response(request, snapshot.categories_payload())
 
 
 @router.get("/category", response_model=CategorySchema)
 async def get_category(
     category_id: int,
     session: CurrentSession,
-) -> CategorySchema:
+) -> dict[str, Any]:
     """
     Get a specific education level/category by ID.
 
@@ -91,28 +110,34 @@ async def get_category(
     Raises:
         HTTPException(404): If category not found
     """
-    data = await CategoryLevel.get(session, category_id)
+    snapshot = await taxonomy_service.get(session)
+    data = snapshot.categories.get(category_id)
+    if data is None:
+        raise AppError.RESOURCES_NOT_FOUND_ERROR
     return data
 
 
 @router.get("/all_document_type", response_model=list[DocumentTypeSchema])
 async def get_notes_type_list(
+    request: Request,
     session: CurrentSession,
-) -> list[DocumentTypeSchema]:
+) -> Response:
     """
     Get list of all document types.
 
     Returns all available document types for educational resources
-    (e.g., Summary Notes, Practice Papers, Past Year Papers).
+    (e.g., Summary Notes, Practice Papers, Past Year Papers), from the
+    taxonomy snapshot with a strong ETag.
 
     Args:
-        session: Active database session
+        request: Incoming request, for If-None-Match
+        session: Active database session, used only to load the snapshot
 
     Returns:
         List[DocumentTypeSchema]: List of all document types
     """
-    data = await DocumentTypes.get_all(session)
-    return data
+    snapshot = await taxonomy_service.get(session)
+    return _taxonomy_response(request, snapshot.document_types_payload())
 
 
 @router.post("/subject", response_model=SubjectSchema)
@@ -140,6 +165,9 @@ async def add_subject(
         HTTPException(400): If subject already exists or invalid data
     """
     data = await Subjects.create(session, dict(data))
+    await cache_service.delete(FACET_TREE_CACHE_KEY)
+    await taxonomy_service.rebuild(session)
+    suggest_service.invalidate()
     return data
 
 
@@ -168,6 +196,8 @@ async def add_category(
         HTTPException(400): If category already exists
     """
     data = await CategoryLevel.create(session, dict(data))
+    await cache_service.delete(FACET_TREE_CACHE_KEY)
+    await taxonomy_service.rebuild(session)
     return data
 
 
@@ -195,6 +225,8 @@ async def add_notes_type(
         HTTPException(400): If document type already exists
     """
     data = await DocumentTypes.create(session, dict(data))
+    await cache_service.delete(FACET_TREE_CACHE_KEY)
+    await taxonomy_service.rebuild(session)
     return data
 
 
@@ -224,6 +256,9 @@ async def update_subject(
         HTTPException(403): If user is not a developer
     """
     data = await Subjects.update(session, id, dict(data))
+    await cache_service.delete(FACET_TREE_CACHE_KEY)
+    await taxonomy_service.rebuild(session)
+    suggest_service.invalidate()
     return data
 
 
@@ -252,8 +287,11 @@ async def update_category(
         HTTPException(404): If category not found
         HTTPException(403): If user is not a developer
     """
-    data = await CategoryLevel.update(session, id, dict(data))
-    return data
+    category = await CategoryLevel.update(session, id, dict(data))
+    await cache_service.delete(FACET_TREE_CACHE_KEY)
+    await taxonomy_service.rebuild(session)
+    suggest_service.invalidate()
+    return category
 
 
 @router.put("/document_type", response_model=DocumentTypeSchema)
@@ -282,4 +320,6 @@ async def update_notes_type(
         HTTPException(403): If user is not a developer
     """
     data = await DocumentTypes.update(session, id, dict(data))
+    await cache_service.delete(FACET_TREE_CACHE_KEY)
+    await taxonomy_service.rebuild(session)
     return data
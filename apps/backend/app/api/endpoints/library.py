@@ -5,10 +5,10 @@ This module provides endpoints for creating, reading, updating, and deleting
 educational notes and practice papers. Includes functionality for file uploads,
 downloads, approval workflows, and search/filtering capabilities.
 """
-from typing import Optional
+import json
+from typing import Any, Optional
 
-from fastapi import APIRouter, Query, Request
-from fastapi_pagination import Page
+from fastapi import APIRouter, Query, Request, Response
 
 from app.api.deps import (
     CurrentSession,
@@ -16,14 +16,40 @@ from app.api.deps import (
     SessionBucket,
     SessionVerifiedUser,
 )
+from app.core.config import settings
 from app.models.library import Library
-from app.schemas.library import NoteSchema, NoteUpdateSchema, SearchNoteSchema
-from app.services import cache_service, search_service, task_client
+from app.schemas.library import (
+    NotePageSchema,
+    NoteSchema,
+    NoteUpdateSchema,
+    SearchHighlightSchema,
+    SearchPageSchema,
+    SuggestResponseSchema,
+)
+from app.services import (
+    cache_service,
+    leaderboard_service,
+    local_search_index,
+    popularity_service,
+    search_cache_warmer,
+    search_service,
+    suggest_service,
+    task_client,
+)
 from app.services.cache import (
+    FACET_TREE_CACHE_KEY,
+    canonical_search_query,
+    canonicalize_keyword,
     deserialize_search_results,
-    generate_search_cache_key,
+    dump_json,
+    generate_highlight_cache_key,
+    pack_cache_value,
     serialize_search_results,
+    unpack_cache_value,
 )
+from app.services.search import decode_search_cursor
+from app.services.search_cache import render_search_page, search_page_cache_key
+from app.utils.exceptions import AppError
 from app.utils.limiter import conditional_rate_limit
 
 router = APIRouter()
@@ -122,10 +148,14 @@ async def download_note_by_id(
         HTTPException(429): If rate limit exceeded
     """
     note = await Library.download(session, id)
+
+    await Library.increment_view_count(session, id)
+    await popularity_service.record_download(id)
+
     return note
 
 
-@notes_router.get("/approved", response_model=Page[NoteSchema], deprecated=True)
+@notes_router.get("/approved", response_model=NotePageSchema, deprecated=True)
 async def get_all_approved_notes(
     session: CurrentSession,
     page: int = Query(1, title="Page number", gt=0),
@@ -136,7 +166,8 @@ async def get_all_approved_notes(
     keyword: str | None = None,
     year: int | None = None,
     sorted_by_upload_date: str | None = "desc",
-) -> Page[NoteSchema]:
+    cursor: str | None = Query(None, title="Opaque cursor from a previous next_cursor"),
+) -> dict[str, Any]:
     """
     [DEPRECATED] Get paginated list of approved educational notes using PostgreSQL.
 
@@ -156,9 +187,13 @@ async def get_all_approved_notes(
         keyword: Search keyword (uses PostgreSQL ILIKE)
         year: Filter by year of examination
         sorted_by_upload_date: Sort order ('asc' or 'desc')
+        cursor: Continuation cursor returned as next_cursor; page is ignored when given
 
     Returns:
-        Page[NoteSchema]: Paginated list of approved notes
+        NotePageSchema: Paginated list of approved notes with next_cursor
+
+    Raises:
+        HTTPException(400): If the cursor is malformed
 
     Example:
         GET /notes/approved?category=O-LEVEL&subject=Mathematics&page=1&size=20
@@ -174,11 +209,12 @@ async def get_all_approved_notes(
         keyword=keyword,
         year=year,
         sorted_by_upload_date=sorted_by_upload_date,
+        cursor=cursor,
     )
     return notes
 
 
-@notes_router.get("/search", response_model=Page[SearchNoteSchema])
+@notes_router.get("/search", response_model=SearchPageSchema)
 async def search_notes_opensearch(
     page: int = Query(1, title="Page number", gt=0),
     size: int = Query(50, title="Page size", gt=0, le=50),
@@ -187,7 +223,10 @@ async def search_notes_opensearch(
     doc_type: str | None = None,
     keyword: str | None = None,
     year: int | None = None,
-) -> Page[SearchNoteSchema]:
+    cursor: str | None = Query(None, title="Opaque cursor from a previous next_cursor"),
+    snapshot: bool = Query(False, title="Pin cursor pages to a point-in-time"),
+    facets: bool = Query(False, title="Include facet counts and the facet tree"),
+) -> Response | dict[str, Any]:
     """
     Search documents using OpenSearch full-text search with Redis caching.
 
@@ -195,6 +234,20 @@ async def search_notes_opensearch(
     and caches results in Redis for improved performance. Returns data directly
     from OpenSearch without querying PostgreSQL.
 
+    Every response carries a next_cursor when more results exist. Passing it
+    back as cursor fetches the next page with search_after, so deep pages cost
+    the same as the first one; page is ignored when a cursor is given.
+
+    With facets=true the first page also carries facet counts for the current
+    filters, fetched in the same OpenSearch round trip as the hits, and the
+    unfiltered facet tree, which is cached until the taxonomy or the set of
+    approved notes changes. This replaces separate calls to /all_subjects,
+    /all_category_level and /all_document_type on library page views.
+
+    Cached pages are served stale for a while after they expire, or when
+    OpenSearch fails, while one request refreshes them. Concurrent misses for
+    the same page wait for a single OpenSearch query across all workers.
+
     Args:
         page: Page number (1-indexed)
         size: Number of items per page (max 50)
@@ -203,55 +256,219 @@ async def search_notes_opensearch(
         doc_type: Filter by document type (e.g., Summary Notes, Practice Papers)
         keyword: Search keyword for full-text search
         year: Filter by year of examination
+        cursor: Continuation cursor returned as next_cursor by a previous call
+        snapshot: Open a point-in-time so following cursor pages see a stable view
+        facets: Include facet counts and the facet tree in the response
 
     Returns:
-        Page[SearchNoteSchema]: Paginated list of matching notes
+        SearchPageSchema: Paginated list of matching notes with next_cursor
+
+    Raises:
+        HTTPException(400): If the cursor is malformed
     """
-    empty_response = {
+    if cursor:
+        try:
+            page = decode_search_cursor(cursor)["page"]
+        except ValueError as exc:
+            raise AppError.BAD_REQUEST_ERROR from exc
+
+    empty_response: dict[str, Any] = {
         "items": [],
         "page": page,
         "pages": 0,
         "size": size,
         "total": 0,
+        "next_cursor": None,
     }
 
-    if not await search_service.is_available():
-        return empty_response
+    # The facet tree is kept as rendered JSON so cached pages never parse it.
+    facet_tree: bytes | None = None
+    if facets:
+        cached_tree = await cache_service.get(FACET_TREE_CACHE_KEY)
+        if cached_tree:
+            facet_tree = unpack_cache_value(cached_tree)
+
+    async def cache_facet_tree(tree: dict[str, Any]) -> None:
+        nonlocal facet_tree
+        facet_tree = dump_json(tree)
+        await cache_service.set(
+            FACET_TREE_CACHE_KEY, pack_cache_value(facet_tree), ttl=settings.redis_facet_tree_ttl
+        )
 
-    cache_key = generate_search_cache_key(
-        keyword=keyword,
-        category=category,
-        subject=subject,
-        doc_type=doc_type,
-        year=year,
-        page=page,
-        size=size,
-    )
+    # Pages are cached per canonical keyword, so that is what every phrasing is searched with.
+    search_keyword = canonicalize_keyword(keyword) or None
+    search_result = None
+    loaded = False
+
+    async def load_page() -> tuple[bytes, int] | None:
+        nonlocal search_result, loaded
+        loaded = True
+        if not await search_service.is_searchable():
+            return None
+
+        search_result = await search_service.search_full(
+            keyword=search_keyword,
+            category=category,
+            subject=subject,
+            doc_type=doc_type,
+            year=year,
+            page=page,
+            size=size,
+            fuzzy=True,
+            cursor=cursor,
+            snapshot=snapshot,
+            include_facets=facets and not cursor,
+            include_facet_tree=facets and facet_tree is None,
+        )
+        if not search_result:
+            return None
+
+        if facets and search_result.get("facet_tree"):
+            await cache_facet_tree(search_result.pop("facet_tree"))
+
+        # Validated once here; cache hits are sent as-is.
+        return render_search_page(search_result)
+
+    if snapshot and not cursor:
+        # A snapshot request opens a fresh point-in-time, so it must not be served from cache.
+        await load_page()
+        cached_page = None
+    else:
+        cache_key = await search_page_cache_key(
+            keyword=keyword,
+            category=category,
+            subject=subject,
+            doc_type=doc_type,
+            year=year,
+            page=page,
+            size=size,
+            cursor=cursor,
+            facets=facets,
+        )
+        cached_page = await cache_service.get_or_load(cache_key, load_page)
+        if not cursor:
+            query = canonical_search_query(
+                keyword, category, subject, doc_type, year, page, size, facets
+            )
+            await cache_service.record_lookup(query, hit=not loaded, keyword=keyword)
+
+    if facets and facet_tree is None and await search_service.is_available():
+        tree = await search_service.get_facet_tree()
+        if tree:
+            await cache_facet_tree(tree)
+
+    if cached_page:
+        return Response(
+            content=_render_search_page(unpack_cache_value(cached_page), facet_tree),
+            media_type="application/json",
+        )
 
-    cached_result = await cache_service.get(cache_key)
-    if cached_result:
-        return deserialize_search_results(cached_result)
+    result = search_result
+    if not result or not result.get("items"):
+        if result and result.get("facets"):
+            empty_response["facets"] = result["facets"]
+        result = empty_response
+    if facets and facet_tree is not None:
+        result["facet_tree"] = json.loads(facet_tree)
 
-    search_result = await search_service.search_full(
-        keyword=keyword,
-        category=category,
-        subject=subject,
-        doc_type=doc_type,
-        year=year,
-        page=page,
-        size=size,
-        fuzzy=True,
-    )
+    return result
 
-    if not search_result or not search_result.get("items"):
-        return empty_response
 
-    await cache_service.set(cache_key, serialize_search_results(search_result))
+def _render_search_page(page: bytes, facet_tree: bytes | None) -> bytes:
+    """Splice the separately cached facet tree into a rendered SearchPageSchema."""
+    return page[:-1] + b',"facet_tree":' + (facet_tree or b"null") + b"}"
 
-    return search_result
 
+@notes_router.get("/search/highlights", response_model=list[SearchHighlightSchema])
+async def get_search_highlights(
+    ids: str = Query(..., title="Comma-separated ids of the notes on screen"),
+    keyword: str = Query(..., title="Search keyword", min_length=1, max_length=200),
+) -> list[dict[str, Any]]:
+    """
+    Content snippets for the notes currently shown in the library table.
 
-@notes_router.get("/pending", response_model=Page[NoteSchema])
+    /notes/search only highlights document names, since highlighting content
+    for every hit is a large share of query time. The client asks for content
+    snippets here for just the visible rows. Snippets are cached per note and
+    normalised keyword.
+
+    Args:
+        ids: Comma-separated note ids (max 50)
+        keyword: Keyword the results were searched with
+
+    Returns:
+        list[SearchHighlightSchema]: Snippets per note, in the order requested
+
+    Raises:
+        HTTPException(400): If ids is malformed or lists more than 50 notes
+    """
+    try:
+        doc_ids = list(dict.fromkeys(int(value) for value in ids.split(",") if value.strip()))
+    except ValueError as exc:
+        raise AppError.BAD_REQUEST_ERROR from exc
+    if not doc_ids or len(doc_ids) > 50:
+        raise AppError.BAD_REQUEST_ERROR
+
+    keys = {doc_id: generate_highlight_cache_key(doc_id, keyword) for doc_id in doc_ids}
+    cached = await cache_service.get_many(list(keys.values()))
+    highlights = {
+        doc_id: deserialize_search_results(value)
+        for doc_id, value in zip(doc_ids, cached, strict=True)
+        if value is not None
+    }
+
+    missing = [doc_id for doc_id in doc_ids if doc_id not in highlights]
+    if missing:
+        fetched = await search_service.highlight(missing, keyword) or {}
+        highlights.update(fetched)
+        await cache_service.set_many(
+            {
+                keys[doc_id]: serialize_search_results(content)
+                for doc_id, content in fetched.items()
+            },
+            ttl=settings.redis_highlight_ttl,
+        )
+
+    return [{"id": doc_id, "content": highlights.get(doc_id, [])} for doc_id in doc_ids]
+
+
+@notes_router.get("/suggest", response_model=SuggestResponseSchema)
+async def suggest_notes(
+    session: CurrentSession,
+    q: str = Query(..., title="Prefix typed so far", min_length=1, max_length=100),
+    limit: int = Query(5, title="Maximum completions per group", gt=0, le=10),
+) -> dict[str, list[dict[str, Any]]]:
+    """
+    Typeahead completions for document names and subjects.
+
+    Answers from an in-process prefix index of approved document names and
+    subjects, so common prefixes never reach OpenSearch. Only when the index
+    has fewer than `limit` document matches does it fall back to the
+    edge-ngram `document_name.suggest` field, which also matches words out
+    of order.
+
+    Args:
+        session: Active database session (used to build the index on first use)
+        q: Prefix typed so far
+        limit: Maximum completions per group (max 10)
+
+    Returns:
+        SuggestResponseSchema: Matching document names and subjects
+    """
+    await suggest_service.ensure_loaded(session)
+
+    documents = suggest_service.suggest_documents(q, limit)
+    subjects = suggest_service.suggest_subjects(q, limit)
+
+    if len(documents) < limit and await search_service.is_available():
+        remote = await search_service.suggest(q, limit=limit) or []
+        seen = {doc["id"] for doc in documents}
+        documents += [doc for doc in remote if doc["id"] not in seen][: limit - len(documents)]
+
+    return {"documents": documents, "subjects": subjects}
+
+
+@notes_router.get("/pending", response_model=NotePageSchema)
 async def get_all_pending_approval_notes(
     session: CurrentSession,
     authenticated: SessionAdmin,
@@ -263,7 +480,8 @@ async def get_all_pending_approval_notes(
     keyword: str | None = None,
     year: int | None = None,
     sorted_by_upload_date: str | None = "desc",
-) -> Page[NoteSchema]:
+    cursor: str | None = Query(None, title="Opaque cursor from a previous next_cursor"),
+) -> dict[str, Any]:
     """
     Get paginated list of notes pending admin approval.
 
@@ -281,11 +499,13 @@ async def get_all_pending_approval_notes(
         keyword: Search keyword
         year: Filter by examination year
         sorted_by_upload_date: Sort order ('asc' or 'desc')
+        cursor: Continuation cursor returned as next_cursor; page is ignored when given
 
     Returns:
-        Page[NoteSchema]: Paginated list of pending notes
+        NotePageSchema: Paginated list of pending notes with next_cursor
 
     Raises:
+        HTTPException(400): If the cursor is malformed
         HTTPException(403): If user is not an admin
     """
     notes = await Library.get_all_notes_paginated(
@@ -299,6 +519,7 @@ async def get_all_pending_approval_notes(
         keyword=keyword,
         year=year,
         sorted_by_upload_date=sorted_by_upload_date,
+        cursor=cursor,
     )
     return notes
 
@@ -330,7 +551,26 @@ async def update_note_by_id(
         HTTPException(403): If user is not an admin
         HTTPException(400): If update data is invalid
     """
+    previous_uploader = None
+    if note.uploaded_by is not None:
+        previous_uploader = (await Library.get(session, id)).uploaded_by
+
     updated_note = await Library.update_note(session, id, authenticated, data=note)
+
+    if updated_note.approved:
+        suggest_service.add_document(
+            updated_note.id, updated_note.document_name, updated_note.view_count
+        )
+        if (
+            previous_uploader is not None
+            and note.uploaded_by is not None
+            and previous_uploader != note.uploaded_by
+        ):
+            await leaderboard_service.refresh_users(session, previous_uploader, note.uploaded_by)
+    else:
+        # Notes that are no longer approved stop completing.
+        suggest_service.remove_document(updated_note.id)
+
     return updated_note
 
 
@@ -360,8 +600,18 @@ async def delete_note_by_id(
     """
     deleted_note = await Library.delete_note(session, authenticated, id)
 
-    await task_client.trigger_delete_document(id)
+    task_id = None
+    if search_service.queue_writes:
+        task_id = await task_client.trigger_delete_document(id)
 
-    await cache_service.delete_pattern("search:*")
+    suggest_service.remove_document(id)
+    local_search_index.remove_document(id)
+
+    if deleted_note.approved:
+        await leaderboard_service.refresh_users(session, deleted_note.uploaded_by)
+        await cache_service.invalidate_search(
+            deleted_note.doc_category.name, deleted_note.doc_subject.name
+        )
+        search_cache_warmer.schedule(task_id)
 
     return deleted_note
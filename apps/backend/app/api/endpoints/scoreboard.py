@@ -8,11 +8,14 @@ participation through gamification.
 from fastapi import APIRouter
 
 from app.api.deps import CurrentSession, SessionUser
-from app.models.scoreboard import Scoreboard
 from app.schemas.scoreboard import AuthenticatedScoreboardUser, ScoreboardUser
+from app.services import leaderboard_service
 
 router = APIRouter()
 
+# System accounts and test users, left out of the rankings.
+EXCLUDED_USER_IDS = {1, 4, 9}
+
 
 @router.get("")
 async def top_approved_note_users(session: CurrentSession) -> list[ScoreboardUser]:
@@ -20,8 +23,8 @@ async def top_approved_note_users(session: CurrentSession) -> list[ScoreboardUse
     Get the top contributors leaderboard.
 
     Returns a ranked list of users with the most approved educational
-    content contributions. System accounts and test users are excluded
-    from the rankings.
+    content contributions, read from the Redis leaderboard. System accounts
+    and test users are excluded from the rankings.
 
     Args:
         session: Active database session
@@ -32,7 +35,7 @@ async def top_approved_note_users(session: CurrentSession) -> list[ScoreboardUse
     Note:
         Excludes system accounts (IDs: 1, 4, 9) from rankings
     """
-    resp = await Scoreboard.get_top_n_approved_users(session, top_n=20, exclude_ids=[1, 4, 9])
+    resp = await leaderboard_service.get_top_users(session, top_n=20, exclude_ids=EXCLUDED_USER_IDS)
     return resp
 
 
@@ -54,5 +57,5 @@ async def get_user_approved_note_count(
     Returns:
         AuthenticatedScoreboardUser: User's contribution stats and ranking
     """
-    resp = await Scoreboard.get_authenticated_approved_user(session, authenticated.user_id)
+    resp = await leaderboard_service.get_user(session, authenticated, exclude_ids=EXCLUDED_USER_IDS)
     return resp
@@ -6,7 +6,7 @@ loading from environment variables and providing sensible defaults
 for different deployment environments.
 """
 import secrets
-from typing import Optional
+from typing import Literal, Optional
 
 from pydantic import Field, field_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -70,6 +70,10 @@ class Settings(BaseSettings):
     # Optional Services
     logfire_token: str | None = Field(default=None)
 
+    # Search Backend Configuration
+    # "opensearch" or "postgres" (tsvector full-text search on the library table).
+    search_backend: Literal["opensearch", "postgres"] = Field(default="opensearch")
+
     # OpenSearch Configuration
     opensearch_host: str = Field(default="localhost")
     opensearch_port: int = Field(default=9200)
@@ -78,11 +82,81 @@ class Settings(BaseSettings):
     opensearch_user: str | None = Field(default=None)
     opensearch_password: str | None = Field(default=None)
     opensearch_use_ssl: bool | None = Field(default=None)
+    opensearch_pit_keep_alive: str = Field(default="2m")
+    opensearch_search_timeout: float = Field(default=2.0)
+    opensearch_write_timeout: float = Field(default=10.0)
+    opensearch_bulk_timeout: float = Field(default=120.0)
+    opensearch_ping_timeout: float = Field(default=2.0)
+    opensearch_health_interval: float = Field(default=10.0)
+    opensearch_breaker_threshold: int = Field(default=5)
+    opensearch_breaker_reset_seconds: float = Field(default=30.0)
+    opensearch_index_retain_versions: int = Field(default=2)
+    # "coalesce" skips the per-write refresh and issues at most one explicit refresh
+    # per opensearch_refresh_interval_ms across all writes in the process.
+    opensearch_refresh_policy: Literal["true", "false", "wait_for", "coalesce"] = Field(
+        default="coalesce"
+    )
+    opensearch_refresh_interval_ms: int = Field(default=1000)
+    # Keyword searches first try an exact match on names and the fuzzy full-text query
+    # only runs when that returns fewer hits than this. 0 always runs the fuzzy query.
+    search_exact_min_hits: int = Field(default=10)
+
+    # Local Search Fallback Configuration
+    local_search_enabled: bool = Field(default=True)
+    local_search_path: str = Field(default="./search_index/library.idx")
+    local_search_text_dir: str = Field(default="./search_index/text")
+    local_search_reload_interval: float = Field(default=30.0)
+
+    # Popularity Ranking Configuration
+    search_popularity_boost: float = Field(default=1.0)
+    search_recent_downloads_boost: float = Field(default=1.0)
+    popularity_half_life_days: float = Field(default=7.0)
+    popularity_sync_threshold: float = Field(default=0.1)
+
+    # Typeahead Configuration
+    suggest_max_results: int = Field(default=10)
+    suggest_rebuild_interval: float = Field(default=300.0)
+
+    # Listing Pagination Configuration
+    # Totals of the Postgres note and user listings are cached per filter set this long.
+    listing_count_ttl: int = Field(default=60)
+    # Unfiltered listings report the pg_class.reltuples estimate instead of a count.
+    listing_estimate_totals: bool = Field(default=False)
+
+    # Taxonomy Configuration
+    # Clients reuse taxonomy lists this long, then revalidate them with If-None-Match.
+    taxonomy_cache_control: str = Field(default="public, max-age=60")
 
     # Redis Configuration
     redis_url: str = Field(default="redis://localhost:6379/0")
     redis_cache_enabled: bool = Field(default=True)
     redis_cache_ttl: int = Field(default=300)
+    redis_facet_tree_ttl: int = Field(default=86400)
+    redis_highlight_ttl: int = Field(default=86400)
+    # Searches with no results are cached too, but only briefly.
+    redis_empty_cache_ttl: int = Field(default=30)
+    cache_query_stats_max: int = Field(default=5000)
+    cache_query_stats_trim_every: int = Field(default=1000)
+    # The most looked-up queries are re-cached at startup and after note changes, once the
+    # indexing tasks have finished (polled together every cache_warm_poll_interval seconds, for
+    # at most cache_warm_task_timeout) and a refresh has made the change searchable.
+    cache_warm_top_n: int = Field(default=50)
+    cache_warm_concurrency: int = Field(default=4)
+    cache_warm_poll_interval: float = Field(default=0.5)
+    cache_warm_task_timeout: float = Field(default=60.0)
+    # Per-worker LRU in front of Redis; entries live at most cache_l1_ttl seconds.
+    cache_l1_enabled: bool = Field(default=True)
+    cache_l1_ttl: float = Field(default=10.0)
+    cache_l1_max_entries: int = Field(default=1024)
+    cache_l1_max_bytes: int = Field(default=32 * 1024 * 1024)
+    # Search pages are served stale for cache_stale_ttl seconds past redis_cache_ttl while one
+    # worker refreshes them under a lock held for at most cache_lock_ttl_ms.
+    cache_stale_ttl: int = Field(default=300)
+    cache_lock_ttl_ms: int = Field(default=5000)
+    cache_lock_poll_ms: int = Field(default=50)
+    # Cached payloads at least this large are zlib-compressed before going to Redis.
+    cache_compress_min_bytes: int = Field(default=1024)
+    cache_compress_level: int = Field(default=1)
 
     @property
     def database_url(self) -> str:
@@ -18,6 +18,11 @@ from app.utils.exceptions import AppError
 ModelType = TypeVar("ModelType", bound=Base)
 
 
+def escape_like(value: str) -> str:
+    """Escape LIKE wildcards in user input; pair with ``escape="\\"``."""
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
 class CRUD(Generic[ModelType]):
     """
     Generic CRUD mixin for SQLAlchemy models.
@@ -4,8 +4,9 @@ SQLAlchemy declarative base class.
 This module defines the base class for all SQLAlchemy models
 in the application.
 """
-from typing import Any
+from typing import Any, ClassVar
 
+from sqlalchemy import Table
 from sqlalchemy.orm import as_declarative
 
 
@@ -21,6 +22,7 @@ class Base:
 
     id: Any
     __name__: str
+    __table__: ClassVar[Table]
 
     # Generate __tablename__ automatically
     # @declared_attr
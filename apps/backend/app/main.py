@@ -5,6 +5,9 @@ This module configures the FastAPI application with middleware, routes,
 CORS settings, rate limiting, and production monitoring. It serves as
 the central configuration point for the backend API.
 """
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager, suppress
+
 from fastapi import FastAPI
 from fastapi.middleware import cors
 from slowapi import _rate_limit_exceeded_handler
@@ -12,10 +15,42 @@ from slowapi.errors import RateLimitExceeded
 
 from app.api.api import api_router
 from app.core.config import settings
+from app.db.database import async_session
+from app.services import (
+    cache_service,
+    leaderboard_service,
+    local_search_index,
+    search_cache_warmer,
+    search_service,
+    suggest_service,
+    taxonomy_service,
+)
 from app.utils.limiter import limiter
 from app.utils.starlette_validation_uploadfile import ValidateUploadFileMiddleware
 
+
+@asynccontextmanager
+async def lifespan(_: FastAPI) -> AsyncIterator[None]:
+    if settings.local_search_enabled:
+        local_search_index.load()
+    cache_service.start_invalidation_listener()
+    # Without a database yet, the snapshot is loaded by the first taxonomy request instead.
+    with suppress(Exception):
+        async with async_session() as session:
+            await taxonomy_service.load(session)
+    search_cache_warmer.schedule()
+    suggest_service.schedule_load()
+    yield
+    await search_cache_warmer.close()
+    await suggest_service.close()
+    await search_service.close()
+    await cache_service.close()
+    await leaderboard_service.close()
+    local_search_index.close()
+
+
 app = FastAPI(
+    lifespan=lifespan,
     docs_url=None if settings.environment.is_prod() else "/docs",
     redoc_url=None if settings.environment.is_prod() else "/redoc",
 )
@@ -11,13 +11,24 @@ from uuid import uuid4
 
 import jwt
 from pydantic import EmailStr
-from sqlalchemy import Index, asc, desc, exc as SQLAlchemyExceptions, func, select, update
+from sqlalchemy import (
+    ColumnElement,
+    Index,
+    and_,
+    asc,
+    desc,
+    exc as SQLAlchemyExceptions,
+    func,
+    or_,
+    select,
+    update,
+)
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Mapped, mapped_column, relationship, synonym
 from sqlalchemy.sql.expression import text
 
 from app.core import settings
-from app.crud.base import CRUD
+from app.crud.base import CRUD, escape_like
 from app.db.base_class import Base
 from app.schemas.admin import UpdateRoleSchema
 from app.schemas.auth import (
@@ -32,6 +43,14 @@ from app.schemas.auth import (
 from app.services.email import email_service
 from app.utils.auth import Authenticator, generate_password
 from app.utils.exceptions import AppError
+from app.utils.pagination import (
+    cached_count,
+    decode_keyset_cursor,
+    encode_keyset_cursor,
+    estimated_count,
+    listing_count_key,
+    page_count,
+)
 
 if TYPE_CHECKING:
     from app.models.library import Library
@@ -68,7 +87,20 @@ class Account(Base, CRUD["Account"]):
     """
 
     __tablename__ = "account"
-    __table_args__ = (Index("username_case_sensitive_index", text("upper(username)"), unique=True),)
+    __table_args__ = (
+        Index("username_case_sensitive_index", text("upper(username)"), unique=True),
+        # Tokens are looked up by value and are NULL for most accounts.
+        Index(
+            "ix_account_email_verification_token",
+            "email_verification_token",
+            postgresql_where=text("email_verification_token IS NOT NULL"),
+        ),
+        Index(
+            "ix_account_reset_password_token",
+            "reset_password_token",
+            postgresql_where=text("reset_password_token IS NOT NULL"),
+        ),
+    )
 
     user_id: Mapped[int] = mapped_column(primary_key=True, index=True, autoincrement=True)
     username: Mapped[str] = mapped_column(nullable=False, index=True, unique=True)
@@ -315,6 +347,16 @@ class Account(Base, CRUD["Account"]):
         await session.execute(stmt)
         await session.commit()
 
+    @classmethod
+    def username_matches(cls, username: str) -> ColumnElement[bool]:
+        """
+        Case-insensitive equality on username.
+
+        Compares upper() of both sides so the lookup uses the unique
+        upper(username) index, where ILIKE would scan the table.
+        """
+        return func.upper(cls.username) == func.upper(username)
+
     @classmethod
     async def select_from_username(cls, session: AsyncSession, username: str) -> "Account | None":
         """
@@ -328,7 +370,7 @@ class Account(Base, CRUD["Account"]):
             Account | None: User account if found, None otherwise
         """
         try:
-            stmt = select(Account).where(Account.username.ilike(username))
+            stmt = select(Account).where(cls.username_matches(username))
             result = await session.execute(stmt)
             return result.scalars().one()
 
@@ -527,35 +569,68 @@ class Account(Base, CRUD["Account"]):
         page: int,
         size: int,
         search: str | None = None,
+        cursor: str | None = None,
     ) -> dict:
         """
         Get paginated list of users sorted by role (descending) then ID.
 
+        A cursor from next_cursor seeks past the last user on (role, id)
+        instead of using OFFSET. Totals come from cached counts, or the
+        table's planner estimate for unfiltered listings when
+        listing_estimate_totals is set.
+
         Args:
             session: Active database session
-            page: Page number (1-indexed)
+            page: Page number (1-indexed), ignored when a cursor is given
             size: Number of items per page
             search: Optional username search (case-insensitive partial match)
+            cursor: Continuation cursor returned as next_cursor
 
         Returns:
-            dict: Paginated response with items, page, pages, size, total
+            dict: Paginated response with items, page, pages, size, total, next_cursor
+
+        Raises:
+            AppError.BAD_REQUEST_ERROR: If the cursor is malformed
         """
+        after = None
+        if cursor:
+            try:
+                payload = decode_keyset_cursor(cursor, 2)
+                after = (int(payload["after"][0]), int(payload["after"][1]))
+            except (TypeError, ValueError) as exc:
+                raise AppError.BAD_REQUEST_ERROR from exc
+            page = payload["page"]
+
         stmt = select(cls).order_by(desc(cls.role), asc(cls.id))
 
         if search:
-            stmt = stmt.where(cls.username.ilike(f"%{search}%"))
+            stmt = stmt.where(cls.username.ilike(f"%{escape_like(search)}%", escape="\\"))
 
-        count_stmt = select(func.count()).select_from(stmt.subquery())
-        total = await session.scalar(count_stmt)
+        total = None
+        if not search and settings.listing_estimate_totals:
+            total = await estimated_count(session, cls.__tablename__)
+        if total is None:
+            total = await cached_count(session, listing_count_key("users", search=search), stmt)
 
-        stmt = stmt.limit(size).offset((page - 1) * size)
-        result = await session.execute(stmt)
+        if after:
+            role, user_id = after
+            stmt = stmt.where(or_(cls.role < role, and_(cls.role == role, cls.id > user_id)))
+        else:
+            stmt = stmt.offset((page - 1) * size)
+        # One extra row tells whether there is a next page.
+        result = await session.execute(stmt.limit(size + 1))
+        items = list(result.scalars().all())
+
+        next_cursor = None
+        if len(items) > size:
+            items = items[:size]
+            next_cursor = encode_keyset_cursor([items[-1].role, items[-1].user_id], page + 1)
 
-        pages = total // size if total % size == 0 else (total // size) + 1
         return {
-            "items": result.scalars().all(),
+            "items": items,
             "page": page,
-            "pages": pages,
+            "pages": page_count(total, size),
             "size": size,
             "total": total,
+            "next_cursor": next_cursor,
         }
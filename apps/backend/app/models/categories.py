@@ -5,7 +5,7 @@ This module defines models for categorizing educational resources by
 education level (O-Level, A-Level, IB), subjects (Math, Physics, etc.),
 and document types (Summary Notes, Practice Papers, etc.).
 """
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any
 
 from sqlalchemy import ForeignKey, Integer, UniqueConstraint, exc as SQLAlchemyExceptions, select
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -70,6 +70,21 @@ class CategoryLevel(Base, CRUD["category_level"]):
             raise AppError.RESOURCES_ALREADY_EXISTS_ERROR
         return await super().create(session, data)
 
+    @classmethod
+    async def update(
+        cls,
+        session: AsyncSession,
+        id: int,
+        data: dict[str, Any],  # pylint: disable=W0622, C0103
+    ) -> "CategoryLevel":
+        """Rename a category; its notes' search text is rewritten in the same commit."""
+        from app.models.library import Library
+
+        if data.get("name"):
+            await Library.refresh_search_taxonomy(session, category=(id, data["name"]))
+        category: CategoryLevel = await super().update(session, id, data)
+        return category
+
 
 class Subjects(Base, CRUD["subjects"]):
     """
@@ -146,7 +161,12 @@ class Subjects(Base, CRUD["subjects"]):
         id: int,
         data: dict,  # pylint: disable=W0622, C0103
     ) -> "Subjects":
+        from app.models.library import Library
+
         try:
+            # Rewritten before the update commits, so the rename and search text land together.
+            if data.get("name"):
+                await Library.refresh_search_taxonomy(session, subject=(id, data["name"]))
             res = await super().update(session, id, data)
             await session.refresh(res, ["category"])
             return res
@@ -7,28 +7,40 @@ It handles file uploads, categorization, approval workflows, and download tracki
 """
 import datetime
 import uuid
-from typing import TYPE_CHECKING, Optional, Union
+from typing import TYPE_CHECKING, Any, Optional, Union
 
 import boto3
 import httpx
 from fastapi import HTTPException, Response, UploadFile
 from pydantic import ValidationError
 from sqlalchemy import (
+    DDL,
+    ColumnElement,
+    Computed,
     DateTime,
     ForeignKey,
     ForeignKeyConstraint,
+    Index,
+    Select,
+    Text,
     delete,
+    event,
     exc as SQLAlchemyExceptions,
+    false,
     func,
+    literal,
     select,
+    true,
+    tuple_,
     update,
 )
+from sqlalchemy.dialects.postgresql import TSVECTOR
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Mapped, mapped_column, relationship, selectinload
 from sqlalchemy.sql.expression import text
 from starlette.datastructures import FormData
 
-from app.crud.base import CRUD
+from app.crud.base import CRUD, escape_like
 from app.db.base_class import Base
 from app.models.auth import Account
 from app.schemas.auth import RoleEnum
@@ -39,6 +51,7 @@ from app.schemas.library import (
     NoteUpdateSchema,
     UserUploadCount,
 )
+from app.services.taxonomy import taxonomy_service
 from app.utils.exceptions import AppError
 from app.utils.file_handler import (
     AWS_CLOUDFRONT_URL,
@@ -46,11 +59,29 @@ from app.utils.file_handler import (
     developer_accepted_doc_type_extensions,
     save_file,
 )
+from app.utils.pagination import (
+    cached_count,
+    decode_keyset_cursor,
+    encode_keyset_cursor,
+    listing_count_key,
+    page_count,
+)
 from app.utils.upload_errors import UploadError
 
 if TYPE_CHECKING:
     from app.models.categories import CategoryLevel, DocumentTypes, Subjects
 
+# Text search configuration shared by the stored vector and the queries run against it.
+SEARCH_TEXT_CONFIG = "english"
+
+# Weighted vector for the Postgres search backend: names rank above taxonomy,
+# which ranks above extracted text. Kept current by Postgres on every write.
+SEARCH_VECTOR_SQL = (
+    f"setweight(to_tsvector('{SEARCH_TEXT_CONFIG}', document_name), 'A') || "
+    f"setweight(to_tsvector('{SEARCH_TEXT_CONFIG}', coalesce(search_taxonomy, '')), 'B') || "
+    f"setweight(to_tsvector('{SEARCH_TEXT_CONFIG}', coalesce(search_content, '')), 'C')"
+)
+
 
 def form_data_note_parser(form_data: FormData, idx: int) -> bool | tuple[NoteCreateSchema, int]:
     """
@@ -107,6 +138,9 @@ class Library(Base, CRUD["Library"]):
         approved: Admin approval status
         year: Year of examination (optional)
         extension: File extension
+        search_taxonomy: Category and subject names for full-text search
+        search_content: Extracted document text for full-text search
+        search_vector: Generated weighted tsvector over the name, taxonomy and content
         account: Relationship to uploader account
         doc_category: Relationship to category level
         doc_subject: Relationship to subject
@@ -116,6 +150,36 @@ class Library(Base, CRUD["Library"]):
     __tablename__ = "library"
     __table_args__ = (
         ForeignKeyConstraint(["subject", "category"], ["subjects.id", "subjects.category_id"]),
+        # Serves ILIKE '%keyword%', which the B-tree on document_name cannot.
+        Index(
+            "ix_library_document_name_trgm",
+            "document_name",
+            postgresql_using="gin",
+            postgresql_ops={"document_name": "gin_trgm_ops"},
+        ),
+        Index("ix_library_search_vector", "search_vector", postgresql_using="gin"),
+        # Listings filter on approved plus taxonomy or year and page on (uploaded_on, id);
+        # B-tree scans run either way, so these serve oldest-first pages too.
+        Index("ix_library_approved_uploaded_on", "approved", "uploaded_on", "id"),
+        Index(
+            "ix_library_approved_category_subject_uploaded_on",
+            "approved",
+            "category",
+            "subject",
+            "uploaded_on",
+            "id",
+        ),
+        Index("ix_library_approved_type_uploaded_on", "approved", "type", "uploaded_on", "id"),
+        Index("ix_library_approved_year_uploaded_on", "approved", "year", "uploaded_on", "id"),
+        # The moderation queue is a small slice of the table.
+        Index(
+            "ix_library_pending_uploaded_on",
+            "uploaded_on",
+            "id",
+            postgresql_where=text("approved = false"),
+        ),
+        # Scoreboard counts group approved uploads by uploader.
+        Index("ix_library_uploaded_by_approved", "uploaded_by", "approved"),
     )
 
     id: Mapped[int] = mapped_column(
@@ -157,6 +221,14 @@ class Library(Base, CRUD["Library"]):
     doc_type: Mapped["DocumentTypes"] = relationship("DocumentTypes", back_populates="documents")
     extension: Mapped[str] = mapped_column(server_default=".pdf", nullable=False)
 
+    # Written by the Postgres search backend, which cannot join the taxonomy from a
+    # generated column. Deferred so ordinary loads never read the extracted text.
+    search_taxonomy: Mapped[str | None] = mapped_column(Text, nullable=True, deferred=True)
+    search_content: Mapped[str | None] = mapped_column(Text, nullable=True, deferred=True)
+    search_vector: Mapped[str | None] = mapped_column(
+        TSVECTOR, Computed(SEARCH_VECTOR_SQL, persisted=True), deferred=True
+    )
+
     @classmethod
     async def create_many(
         cls,
@@ -260,6 +332,16 @@ class Library(Base, CRUD["Library"]):
             raise AppError.RESOURCES_NOT_FOUND_ERROR from exc
         return objs
 
+    @classmethod
+    def document_name_contains(cls, keyword: str) -> ColumnElement[bool]:
+        """
+        Case-insensitive substring match served by the trigram index.
+
+        Wildcards in the keyword are escaped so they match literally instead
+        of widening the pattern.
+        """
+        return cls.document_name.ilike(f"%{escape_like(keyword)}%", escape="\\")
+
     @classmethod
     async def get_all_notes_paginated(
         cls,
@@ -273,48 +355,120 @@ class Library(Base, CRUD["Library"]):
         keyword: str | None = None,
         year: int | None = None,
         sorted_by_upload_date: str | None = "desc",
-    ):
-        stmt = select(cls).where(cls.approved == approved)
+        cursor: str | None = None,
+    ) -> dict[str, Any]:
+        """
+        Page through notes newest (or oldest) first.
 
+        Without a cursor the page is read with OFFSET. A cursor from
+        next_cursor instead seeks past the last row on (uploaded_on, id), so
+        deep pages cost the same as the first. Totals come from cached counts.
+
+        Raises:
+            AppError.BAD_REQUEST_ERROR: If the cursor is malformed
+        """
+        after = None
+        if cursor:
+            try:
+                payload = decode_keyset_cursor(cursor, 2)
+                uploaded_on, note_id = payload["after"]
+                after = (datetime.datetime.fromisoformat(uploaded_on), int(note_id))
+            except (TypeError, ValueError) as exc:
+                raise AppError.BAD_REQUEST_ERROR from exc
+            page = payload["page"]
+
+        snapshot = await taxonomy_service.get(session)
+        # Rendered as a literal so the pending queue matches its partial index in generic plans.
+        filters = [cls.approved == (true() if approved else false())]
+        empty = {
+            "items": [],
+            "page": page,
+            "pages": 0,
+            "size": size,
+            "total": 0,
+            "next_cursor": None,
+        }
+
+        # Names resolve to ids in memory so the filters hit the indexed FK columns.
+        category_id = subject_ids = doc_type_id = None
         if category:
-            stmt = stmt.where(cls.doc_category.has(name=category))
+            category_id = snapshot.category_id(category)
+            if category_id is None:
+                return empty
+            filters.append(cls.category == category_id)
 
         if subject:
-            stmt = stmt.where(cls.doc_subject.has(name=subject))
+            subject_ids = snapshot.subject_ids(subject)
+            if not subject_ids:
+                return empty
+            filters.append(cls.subject.in_(subject_ids))
 
         if doc_type:
-            stmt = stmt.where(cls.doc_type.has(name=doc_type))
+            doc_type_id = snapshot.document_type_id(doc_type)
+            if doc_type_id is None:
+                return empty
+            filters.append(cls.type == doc_type_id)
 
         if year:
-            stmt = stmt.where(cls.year == year)
+            filters.append(cls.year == year)
 
         if keyword:
-            stmt = stmt.where(cls.document_name.ilike(f"%{keyword}%"))
+            filters.append(cls.document_name_contains(keyword))
+
+        count_key = listing_count_key(
+            "notes",
+            approved=approved,
+            category=category_id,
+            subject=subject_ids,
+            type=doc_type_id,
+            year=year,
+            keyword=keyword,
+        )
+        total = await cached_count(session, count_key, select(cls.id).where(*filters))
 
+        stmt = (
+            select(
+                *(column for column in cls.__table__.columns if column.key not in SEARCH_COLUMNS),
+                Account.username,
+            )
+            .join(Account, Account.user_id == cls.uploaded_by)
+            .where(*filters)
+        )
         if sorted_by_upload_date == "asc":
-            stmt = stmt.order_by(cls.uploaded_on.asc())
+            if after:
+                stmt = stmt.where(tuple_(cls.uploaded_on, cls.id) > tuple_(*after))
+            stmt = stmt.order_by(cls.uploaded_on.asc(), cls.id.asc())
         else:
-            stmt = stmt.order_by(cls.uploaded_on.desc())
-
-        count_stmt = select(func.count()).select_from(stmt)  # pylint: disable=E1102
-        total = await session.scalar(count_stmt)
-
-        stmt = stmt.limit(size).offset((page - 1) * size)
-        stmt = stmt.options(
-            selectinload(cls.account).load_only(Account.user_id, Account.username),
-            selectinload(cls.doc_category),
-            selectinload(cls.doc_subject),
-            selectinload(cls.doc_type),
-        )
+            if after:
+                stmt = stmt.where(tuple_(cls.uploaded_on, cls.id) < tuple_(*after))
+            stmt = stmt.order_by(cls.uploaded_on.desc(), cls.id.desc())
+        if after is None:
+            stmt = stmt.offset((page - 1) * size)
+        # One extra row tells whether there is a next page.
+        stmt = stmt.limit(size + 1)
 
         res = await session.execute(stmt)
-        pages = total // size if total % size == 0 else (total // size) + 1
+        notes = []
+        for row in res.mappings():
+            note = dict(row)
+            note["account"] = {"user_id": note["uploaded_by"], "username": note.pop("username")}
+            notes.append(note)
+
+        next_cursor = None
+        if len(notes) > size:
+            notes = notes[:size]
+            last = notes[-1]
+            next_cursor = encode_keyset_cursor(
+                [last["uploaded_on"].isoformat(), last["id"]], page + 1
+            )
+
         return {
-            "items": res.scalars().all(),
+            "items": await taxonomy_service.hydrate(session, notes),
             "page": page,
-            "pages": pages,
+            "pages": page_count(total, size),
             "size": size,
             "total": total,
+            "next_cursor": next_cursor,
         }
 
     @classmethod
@@ -372,6 +526,16 @@ class Library(Base, CRUD["Library"]):
             else:
                 raise HTTPException(status_code=response.status_code, detail="File not found")
 
+    @classmethod
+    async def increment_view_count(
+        cls,
+        session: AsyncSession,
+        id: int,  # pylint: disable=W0622, C0103
+    ) -> None:
+        stmt = update(cls).where(cls.id == id).values(view_count=cls.view_count + 1)
+        await session.execute(stmt)
+        await session.commit()
+
     @classmethod
     async def update_note(
         cls,
@@ -401,8 +565,17 @@ class Library(Base, CRUD["Library"]):
         if authenticated.role < 2 and existing_note.uploaded_by != authenticated.user_id:
             raise HTTPException(status_code=403, detail="Not authorized to update this note")
 
+        # Read before the update, which synchronises the loaded note.
+        previous_uploader, was_approved = existing_note.uploaded_by, existing_note.approved
+
         stmt = stmt.values(**data.dict(exclude_none=True))
         await session.execute(stmt)
+        if was_approved and data.uploaded_by not in (None, previous_uploader):
+            from app.models.scoreboard import Scoreboard
+
+            # The approved upload moves to the new uploader's count.
+            await Scoreboard.adjust_upload_count(session, previous_uploader, -1)
+            await Scoreboard.adjust_upload_count(session, data.uploaded_by, 1)
         await session.commit()
         # import pdb
         # pdb.set_trace()
@@ -416,13 +589,18 @@ class Library(Base, CRUD["Library"]):
         session: AsyncSession,
         id: int,  # pylint: disable=W0622, C0103
     ):
+        from app.models.scoreboard import Scoreboard
+
         stmt = update(cls)
         fetch_stmt = select(cls)
         fetch_stmt = fetch_stmt.where(cls.id == id)
-        stmt = stmt.where(cls.id == id)
+        # Only a pending note changes state, so approving twice counts once.
+        stmt = stmt.where(cls.id == id, cls.approved == false()).returning(cls.uploaded_by)
 
         stmt = stmt.values({"approved": True})
-        await session.execute(stmt)
+        uploaded_by = (await session.execute(stmt)).scalar()
+        if uploaded_by is not None:
+            await Scoreboard.adjust_upload_count(session, uploaded_by, 1)
         await session.commit()
 
         fetch_stmt = fetch_stmt.options(
@@ -443,7 +621,9 @@ class Library(Base, CRUD["Library"]):
         authenticated: Account,
         id: int,  # pylint: disable=W0622, C0103
     ):
-        stmt = delete(cls).where(cls.id == id)
+        from app.models.scoreboard import Scoreboard
+
+        stmt = delete(cls).where(cls.id == id).returning(cls.uploaded_by, cls.approved)
         fetch_stmt = (
             select(cls)
             .where(cls.id == id)
@@ -461,19 +641,70 @@ class Library(Base, CRUD["Library"]):
         if not deleted_note:
             raise HTTPException(status_code=404, detail="Notes not found")
 
-        await session.execute(stmt)
+        deleted = (await session.execute(stmt)).one_or_none()
+        if deleted is not None and deleted.approved:
+            await Scoreboard.adjust_upload_count(session, deleted.uploaded_by, -1)
         await session.commit()
         return deleted_note
 
     @classmethod
-    async def get_latest_scoreboard_users_stats(
-        cls, session: AsyncSession
-    ) -> list[UserUploadCount]:
+    async def refresh_search_taxonomy(
+        cls,
+        session: AsyncSession,
+        category: tuple[int, str] | None = None,
+        subject: tuple[int, str] | None = None,
+    ) -> None:
+        """
+        Rewrite the taxonomy names indexed notes are searched by after a rename.
+
+        ``category`` or ``subject`` is the renamed (id, new name). Nothing is
+        committed, so the rename and its search text commit together. Notes
+        without indexed taxonomy are left for the next index write.
+        """
+        from app.models.categories import CategoryLevel, Subjects
+
+        category_name = literal(category[1]) if category else CategoryLevel.name
+        subject_name = literal(subject[1]) if subject else Subjects.name
         stmt = (
-            select(cls.uploaded_by, func.count(cls.id).label("upload_count"))
-            .where(cls.approved is True)
+            update(cls)
+            .where(
+                cls.category == CategoryLevel.id,
+                cls.subject == Subjects.id,
+                cls.search_taxonomy.is_not(None),
+            )
+            .values(search_taxonomy=category_name + " " + subject_name)
+            .execution_options(synchronize_session=False)
+        )
+        if category:
+            stmt = stmt.where(cls.category == category[0])
+        if subject:
+            stmt = stmt.where(cls.subject == subject[0])
+        await session.execute(stmt)
+
+    @classmethod
+    def scoreboard_counts(cls) -> Select[int, int]:
+        """Approved uploads per uploader, as a SELECT of (uploaded_by, upload_count)."""
+        return (
+            select(cls.uploaded_by, func.count().label("upload_count"))  # pylint: disable=E1102
+            .where(cls.approved == true())
             .group_by(cls.uploaded_by)
         )
 
-        res = await session.execute(stmt)
+    @classmethod
+    async def get_latest_scoreboard_users_stats(
+        cls, session: AsyncSession
+    ) -> list[UserUploadCount]:
+        res = await session.execute(cls.scoreboard_counts())
         return [UserUploadCount(**row._asdict()) for row in res]
+
+
+SEARCH_COLUMNS = frozenset(
+    {Library.search_taxonomy.key, Library.search_content.key, Library.search_vector.key}
+)
+
+# gin_trgm_ops needs the extension; the migration creates it too.
+event.listen(
+    Library.__table__,
+    "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm"),  # type: ignore[no-untyped-call]
+)
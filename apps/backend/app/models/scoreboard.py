@@ -5,15 +5,30 @@ This module manages the leaderboard system that tracks and ranks users
 based on their approved educational content contributions, encouraging
 community participation through gamification.
 """
-from sqlalchemy import ForeignKey, func, not_, select
+import typing
+from typing import Any
+
+from sqlalchemy import (
+    CursorResult,
+    ForeignKey,
+    String,
+    cast,
+    func,
+    not_,
+    or_,
+    select,
+    update,
+)
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import Mapped, mapped_column, relationship, selectinload, synonym
+from sqlalchemy.orm import Mapped, mapped_column, relationship, synonym
 from sqlalchemy.sql.expression import text
 
 from app.crud.base import CRUD
 from app.db.base_class import Base
 from app.models.auth import Account
 from app.models.library import Library
+from app.schemas.auth import CurrentUserSchema
 from app.schemas.scoreboard import AuthenticatedScoreboardUser, ScoreboardUser, User
 
 
@@ -42,22 +57,61 @@ class Scoreboard(Base, CRUD["Scoreboard"]):
     id: Mapped[int] = synonym("user_id")
 
     @classmethod
-    async def update_scoreboard_users(cls, session: AsyncSession) -> None:
+    async def adjust_upload_count(cls, session: AsyncSession, user_id: int, delta: int) -> None:
         """
-        Update all user upload counts from library statistics.
+        Add ``delta`` to a user's upload count without committing.
 
-        Synchronizes scoreboard data with actual approved document counts.
-        Typically run as a scheduled task.
+        Called inside the transactions that approve, delete or reassign notes,
+        so the count changes atomically with the note. Counts never go below zero.
 
         Args:
             session: Active database session
+            user_id: ID of the uploader
+            delta: Change in the user's number of approved uploads
         """
-        res = await Library.get_latest_scoreboard_users_stats(session)
+        stmt = insert(cls).values(user_id=user_id, upload_count=max(delta, 0))
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[cls.user_id],
+            set_={"upload_count": func.greatest(cls.upload_count + delta, 0)},
+        )
+        await session.execute(stmt)
 
-        for data in res:
-            await super().upsert(
-                session, id=data.uploaded_by, data={"upload_count": data.upload_count}
-            )
+    @classmethod
+    async def update_scoreboard_users(cls, session: AsyncSession) -> int:
+        """
+        Reconcile all user upload counts with library statistics.
+
+        Counts are kept current by ``adjust_upload_count``, so this scheduled
+        task is a consistency check. One INSERT ... SELECT ... ON CONFLICT
+        recomputes every uploader's count and only writes rows that drifted;
+        users left without approved uploads are reset to zero.
+
+        Args:
+            session: Active database session
+
+        Returns:
+            int: Number of scoreboard rows that were corrected
+        """
+        counts = Library.scoreboard_counts().subquery()
+        stmt = insert(cls).from_select(
+            ["user_id", "upload_count"], select(counts.c.uploaded_by, counts.c.upload_count)
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[cls.user_id],
+            set_={"upload_count": stmt.excluded.upload_count},
+            where=cls.upload_count != stmt.excluded.upload_count,
+        )
+        corrected = typing.cast(CursorResult[Any], await session.execute(stmt)).rowcount
+
+        stale = (
+            update(cls)
+            .where(cls.upload_count != 0)
+            .where(not_(cls.user_id.in_(select(counts.c.uploaded_by))))
+            .values(upload_count=0)
+        )
+        corrected += typing.cast(CursorResult[Any], await session.execute(stale)).rowcount
+        await session.commit()
+        return corrected
 
     @classmethod
     async def get_top_n_approved_users(
@@ -79,7 +133,7 @@ class Scoreboard(Base, CRUD["Scoreboard"]):
             .join(Account, cls.user_id == Account.user_id)
             .where(not_(cls.user_id.in_(exclude_ids)))
             .group_by(cls.user_id, Account.username)
-            .order_by(cls.upload_count.desc())
+            .order_by(cls.upload_count.desc(), cast(cls.user_id, String).collate("C").desc())
             .limit(top_n)
         )
 
@@ -92,33 +146,88 @@ class Scoreboard(Base, CRUD["Scoreboard"]):
             for row in results.fetchall()
         ]
 
+    @classmethod
+    async def get_leaderboard_entries(
+        cls, session: AsyncSession, user_ids: list[int] | None = None
+    ) -> list[ScoreboardUser]:
+        """
+        Get upload counts with usernames, unordered.
+
+        Used to mirror the scoreboard into the Redis leaderboard.
+
+        Args:
+            session: Active database session
+            user_ids: Users to fetch, or None for every user on the scoreboard
+
+        Returns:
+            List[ScoreboardUser]: Users with their upload counts
+        """
+        stmt = select(cls.user_id, cls.upload_count, Account.username).join(
+            Account, cls.user_id == Account.user_id
+        )
+        if user_ids is not None:
+            stmt = stmt.where(cls.user_id.in_(user_ids))
+
+        results = await session.execute(stmt)
+        return [
+            ScoreboardUser(
+                user=User(user_id=row.user_id, username=row.username),
+                upload_count=row.upload_count,
+            )
+            for row in results
+        ]
+
     @classmethod
     async def get_authenticated_approved_user(
-        cls, session: AsyncSession, user_id: int
+        cls, session: AsyncSession, authenticated: CurrentUserSchema, exclude_ids: set[int]
     ) -> AuthenticatedScoreboardUser:
         """
         Get authenticated user's contribution stats and rank.
 
+        Ranks are positions among users that are not excluded, ordered like the
+        Redis leaderboard: by upload count, ties broken by descending user ID text.
+        Users without a scoreboard row rank after everyone with one.
+
         Args:
             session: Active database session
-            user_id: ID of the authenticated user
+            authenticated: The authenticated user
+            exclude_ids: User IDs to leave out of the ranking (system accounts)
 
         Returns:
             AuthenticatedScoreboardUser: User's stats including rank
         """
-        stmt = (
-            select(cls, func.rank().over(order_by=cls.upload_count.desc()).label("rank"))
-            .where(cls.id == user_id)
-            .options(
-                selectinload(cls.account).load_only(Account.user_id, Account.username),
+        user_id = authenticated.user_id
+        ranked = (
+            select(
+                cls.user_id,
+                cls.upload_count,
+                func.row_number()
+                .over(
+                    order_by=(
+                        cls.upload_count.desc(),
+                        cast(cls.user_id, String).collate("C").desc(),
+                    )
+                )
+                .label("rank"),
             )
+            .where(or_(not_(cls.user_id.in_(exclude_ids)), cls.user_id == user_id))
+            .subquery()
         )
+        res = await session.execute(
+            select(ranked.c.upload_count, ranked.c.rank).where(ranked.c.user_id == user_id)
+        )
+        row = res.one_or_none()
 
-        res = await session.execute(stmt)
-        user, rank = res.one()
+        if row is None:
+            ranked_users = await session.scalar(
+                select(func.count()).where(not_(cls.user_id.in_(exclude_ids)))  # pylint: disable=E1102
+            )
+            upload_count, rank = 0, (ranked_users or 0) + 1
+        else:
+            upload_count, rank = row
 
         return AuthenticatedScoreboardUser(
-            user=User(user_id=user.user_id, username=user.account.username),
-            upload_count=user.upload_count,
+            user=User(user_id=user_id, username=authenticated.username),
+            upload_count=upload_count,
             rank=rank,
         )
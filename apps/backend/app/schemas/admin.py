@@ -17,3 +17,32 @@ class UpdateRoleSchema(BaseModel):
 
     user_id: int
     role: RoleEnum
+
+
+class QueryCacheStatsSchema(BaseModel):
+    """
+    Schema for cache lookups and hits of one canonical search query.
+    """
+
+    query: str
+    lookups: int
+    hits: int
+    hit_rate: float
+
+
+class CacheStatsSchema(BaseModel):
+    """
+    Schema for hit and miss counters of the in-process (L1) and Redis (L2) caches.
+
+    Counters are per worker and reset on restart.
+    """
+
+    enabled: bool
+    l1_enabled: bool
+    l1_hits: int = 0
+    l1_misses: int = 0
+    l2_hits: int = 0
+    l2_misses: int = 0
+    l1_entries: int = 0
+    l1_bytes: int = 0
+    top_queries: list[QueryCacheStatsSchema] = []
@@ -170,7 +170,8 @@ class PaginatedUsersSchema(BaseModel):
     """
     Schema for paginated user list responses.
 
-    Used by admin endpoints to return paginated user data.
+    Used by admin endpoints to return paginated user data. next_cursor
+    fetches the following page by keyset instead of offset.
     """
 
     items: list[CurrentUserSchema]
@@ -178,3 +179,4 @@ class PaginatedUsersSchema(BaseModel):
     pages: int
     size: int
     total: int
+    next_cursor: str | None = None
@@ -8,6 +8,7 @@ file upload handling.
 from datetime import datetime
 from typing import Any, Optional
 
+from fastapi_pagination import Page
 from pydantic import constr
 
 from app.schemas.auth import UploaderSchema
@@ -91,6 +92,17 @@ class NoteSchema(BaseModel):
     extension: str
 
 
+class NotePageSchema(Page[NoteSchema]):
+    """
+    Paginated Postgres note listing with a keyset continuation cursor.
+
+    Passing next_cursor back as cursor fetches the following page by seeking
+    past the last note instead of skipping rows with an offset.
+    """
+
+    next_cursor: str | None = None
+
+
 class UserUploadCount(BaseModel):
     """
     Schema for user upload statistics.
@@ -136,6 +148,26 @@ class SearchResponseSchema(BaseModel):
     facets: dict[str, list[dict[str, Any]]] | None = None
 
 
+class SearchIndexVersionSchema(BaseModel):
+    """
+    Schema for one versioned physical index behind the search alias.
+    """
+
+    index: str
+    version: int
+    live: bool = False
+    building: bool = False
+
+
+class SearchTierStatsSchema(BaseModel):
+    """
+    Schema for how often one query tier answered and its mean OpenSearch time.
+    """
+
+    count: int = 0
+    avg_took_ms: float = 0.0
+
+
 class SearchIndexStatsSchema(BaseModel):
     """
     Schema for search index statistics.
@@ -143,8 +175,12 @@ class SearchIndexStatsSchema(BaseModel):
 
     available: bool
     exists: bool = False
+    index: str | None = None
     doc_count: int = 0
     size_mb: float = 0.0
+    breaker_state: str | None = None
+    versions: list[SearchIndexVersionSchema] = []
+    tiers: dict[str, SearchTierStatsSchema] = {}
 
 
 class SearchNoteSchema(BaseModel):
@@ -172,3 +208,99 @@ class SearchNoteSchema(BaseModel):
     extension: str
     score: float | None = None
     highlights: dict[str, list[str]] | None = None
+
+
+class FacetBucketSchema(BaseModel):
+    """
+    Schema for one facet value and its document count.
+    """
+
+    key: str | int
+    count: int
+
+
+class SearchFacetsSchema(BaseModel):
+    """
+    Schema for facet counts of the current search.
+
+    Each facet ignores its own filter, so the counts show what picking
+    another value of that facet would return.
+    """
+
+    categories: list[FacetBucketSchema] = []
+    subjects: list[FacetBucketSchema] = []
+    doc_types: list[FacetBucketSchema] = []
+    years: list[FacetBucketSchema] = []
+
+
+class FacetTreeCategorySchema(FacetBucketSchema):
+    """
+    Schema for a category in the facet tree with its subjects.
+    """
+
+    subjects: list[FacetBucketSchema] = []
+
+
+class FacetTreeSchema(BaseModel):
+    """
+    Schema for the unfiltered facet tree of all approved documents.
+    """
+
+    categories: list[FacetTreeCategorySchema] = []
+    doc_types: list[FacetBucketSchema] = []
+    years: list[FacetBucketSchema] = []
+
+
+class SearchPageSchema(Page[SearchNoteSchema]):
+    """
+    Paginated OpenSearch results with a continuation cursor.
+
+    Keeps the Page[SearchNoteSchema] shape and adds next_cursor, which
+    fetches the following page via search_after instead of from + size.
+    Requests with facets=true also get facet counts and the facet tree, and
+    keyword searches report the query tier (exact, fuzzy or phrase) that answered.
+    """
+
+    next_cursor: str | None = None
+    tier: str | None = None
+    facets: SearchFacetsSchema | None = None
+    facet_tree: FacetTreeSchema | None = None
+
+
+class SearchHighlightSchema(BaseModel):
+    """
+    Content snippets for one note, fetched after the search page is shown.
+    """
+
+    id: int
+    content: list[str] = []
+
+
+class SearchContentSchema(BaseModel):
+    """
+    Text the task service extracted from an approved note.
+    """
+
+    doc_id: int
+    content: str
+
+
+class SuggestionSchema(BaseModel):
+    """
+    Single typeahead completion.
+
+    category is only set for subject completions.
+    """
+
+    id: int
+    name: str
+    category: str | None = None
+
+
+class SuggestResponseSchema(BaseModel):
+    """
+    Schema for typeahead completions of document names and subjects.
+    """
+
+    documents: list[SuggestionSchema]
+    subjects: list[SuggestionSchema]
@@ -1,7 +1,25 @@
 from .cache import cache_service
 from .email import email_service
+from .leaderboard import leaderboard_service
+from .local_search import local_search_index
+from .popularity import popularity_service
 from .search import search_service
+from .search_cache import search_cache_warmer
 from .storage import storage_service
+from .suggest import suggest_service
+from .taxonomy import taxonomy_service
 from .task_client import task_client
 
-__all__ = ["cache_service", "email_service", "search_service", "storage_service", "task_client"]
+__all__ = [
+    "cache_service",
+    "email_service",
+    "leaderboard_service",
+    "local_search_index",
+    "popularity_service",
+    "search_cache_warmer",
+    "search_service",
+    "storage_service",
+    "suggest_service",
+    "task_client",
+    "taxonomy_service",
+]
@@ -1,44 +1,186 @@
+import asyncio
+import contextlib
+import fnmatch
 import hashlib
 import json
+import sys
+import time
+import unicodedata
+import uuid
+import zlib
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
 from typing import Any, Optional
 
 import redis.asyncio as redis
 
 from app.core.config import settings
 
+try:
+    import orjson
+except ImportError:
+    # Falls back to the standard library encoder, which is slower but byte-compatible.
+    orjson = None  # type: ignore[assignment]
+
+
+# Unfiltered facet tree for /notes/search. Lives outside "search:*" so it is only
+# dropped when the taxonomy or the set of approved documents changes.
+FACET_TREE_CACHE_KEY = "facets:tree"
+
+# Search pages are keyed by generation counters instead of being deleted. The global
+# generation covers every page; scoped ones cover pages filtered to one category or
+# subject, or neither, so an approval leaves pages for other subjects warm.
+SEARCH_GENERATION_KEY = "cache:gen:search"
+
+# Lookups per canonical query (sorted set), how many were served from cache (hash) and
+# the keyword as last typed for it (hash), which is what warming searches with.
+QUERY_LOOKUPS_KEY = "cache:stats:lookups"
+QUERY_HITS_KEY = "cache:stats:hits"
+QUERY_KEYWORDS_KEY = "cache:stats:keywords"
+
+# Every worker drops matching keys from its in-process cache when a pattern is published here.
+INVALIDATION_CHANNEL = "cache:invalidate"
+
+# Releases a loader lock only if this worker still holds it.
+RELEASE_LOCK_SCRIPT = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("del", KEYS[1])
+end
+return 0
+"""
+
+
+class LocalCache:
+    """
+    Bounded in-process LRU with per-entry expiry.
+
+    Evicts least recently used entries once either ``max_entries`` or
+    ``max_bytes`` is exceeded. Expired entries are dropped when read.
+    """
+
+    def __init__(self, max_entries: int, max_bytes: int) -> None:
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: OrderedDict[str, tuple[float, int, bytes]] = OrderedDict()
+        self._bytes = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def size_bytes(self) -> int:
+        return self._bytes
+
+    def get(self, key: str) -> bytes | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        expires_at, _, value = entry
+        if expires_at <= time.monotonic():
+            self.delete(key)
+            return None
+
+        self._entries.move_to_end(key)
+        return value
+
+    def set(self, key: str, value: bytes, ttl: float) -> None:
+        self.delete(key)
+        size = sys.getsizeof(value)
+        if ttl <= 0 or size > self.max_bytes or self.max_entries <= 0:
+            return
+
+        self._entries[key] = (time.monotonic() + ttl, size, value)
+        self._bytes += size
+        while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+            _, (_, evicted_size, _) = self._entries.popitem(last=False)
+            self._bytes -= evicted_size
+
+    def delete(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry[1]
+
+    def delete_pattern(self, pattern: str) -> int:
+        keys = [key for key in self._entries if fnmatch.fnmatchcase(key, pattern)]
+        for key in keys:
+            self.delete(key)
+        return len(keys)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._bytes = 0
+
 
 class CacheService:
+    """
+    Redis cache with an in-process L1 in front of it.
+
+    Reads check the per-worker LRU before Redis, and writes go to both. The
+    L1 keeps entries for at most ``cache_l1_ttl`` seconds, and deletes are
+    broadcast over Redis pub/sub so every worker drops its copy.
+    """
+
     def __init__(self) -> None:
         self._client: redis.Redis | None = None
+        self._local = LocalCache(settings.cache_l1_max_entries, settings.cache_l1_max_bytes)
+        self._listener_task: asyncio.Task[None] | None = None
+        self._stats = {"l1_hits": 0, "l1_misses": 0, "l2_hits": 0, "l2_misses": 0}
+        self._loads: dict[str, asyncio.Task[bytes | None]] = {}
+        self._lookups_since_trim = 0
 
     @property
     def is_enabled(self) -> bool:
         return settings.redis_cache_enabled
 
+    @property
+    def use_local(self) -> bool:
+        return self.is_enabled and settings.cache_l1_enabled
+
+    @property
+    def stats(self) -> dict[str, int]:
+        return {
+            **self._stats,
+            "l1_entries": len(self._local),
+            "l1_bytes": self._local.size_bytes,
+        }
+
     async def _get_client(self) -> redis.Redis | None:
         if not self.is_enabled:
             return None
 
         if self._client is None:
-            self._client = redis.from_url(
-                settings.redis_url,
-                encoding="utf-8",
-                decode_responses=True,
-            )
+            # Values are raw bytes; see pack_cache_value.
+            self._client = redis.Redis.from_url(settings.redis_url)
 
         return self._client
 
-    async def get(self, key: str) -> str | None:
+    async def get(self, key: str) -> bytes | None:
         client = await self._get_client()
         if not client:
             return None
 
+        if self.use_local:
+            value: bytes | None = self._local.get(key)
+            if value is not None:
+                self._stats["l1_hits"] += 1
+                return value
+            self._stats["l1_misses"] += 1
+
         try:
-            return await client.get(key)
+            value = await client.get(key)
         except Exception:
             return None
 
-    async def set(self, key: str, value: str, ttl: int | None = None) -> bool:
+        if value is None:
+            self._stats["l2_misses"] += 1
+        else:
+            self._stats["l2_hits"] += 1
+            if self.use_local:
+                self._local.set(key, value, settings.cache_l1_ttl)
+        return value
+
+    async def set(self, key: str, value: bytes, ttl: int | None = None) -> bool:
         client = await self._get_client()
         if not client:
             return False
@@ -46,17 +188,153 @@ class CacheService:
         if ttl is None:
             ttl = settings.redis_cache_ttl
 
+        if self.use_local:
+            self._local.set(key, value, min(ttl, settings.cache_l1_ttl))
+
         try:
             await client.set(key, value, ex=ttl)
             return True
         except Exception:
             return False
 
+    async def get_many(self, keys: list[str]) -> list[bytes | None]:
+        client = await self._get_client()
+        if not client or not keys:
+            return [None] * len(keys)
+
+        values: list[bytes | None] = [None] * len(keys)
+        missing = list(range(len(keys)))
+        if self.use_local:
+            values = [self._local.get(key) for key in keys]
+            missing = [i for i, value in enumerate(values) if value is None]
+            self._stats["l1_hits"] += len(keys) - len(missing)
+            self._stats["l1_misses"] += len(missing)
+            if not missing:
+                return values
+
+        try:
+            fetched = await client.mget([keys[i] for i in missing])
+        except Exception:
+            return values
+
+        for i, value in zip(missing, fetched, strict=True):
+            if value is None:
+                self._stats["l2_misses"] += 1
+                continue
+            self._stats["l2_hits"] += 1
+            values[i] = value
+            if self.use_local:
+                self._local.set(keys[i], value, settings.cache_l1_ttl)
+        return values
+
+    async def set_many(self, values: dict[str, bytes], ttl: int | None = None) -> bool:
+        client = await self._get_client()
+        if not client or not values:
+            return False
+
+        if ttl is None:
+            ttl = settings.redis_cache_ttl
+
+        if self.use_local:
+            for key, value in values.items():
+                self._local.set(key, value, min(ttl, settings.cache_l1_ttl))
+
+        try:
+            async with client.pipeline(transaction=False) as pipe:
+                for key, value in values.items():
+                    pipe.set(key, value, ex=ttl)
+                await pipe.execute()
+            return True
+        except Exception:
+            return False
+
+    async def get_or_load(
+        self, key: str, load: Callable[[], Awaitable[tuple[bytes, int] | None]]
+    ) -> bytes | None:
+        """
+        Cache-aside read that sends at most one load per key upstream.
+
+        ``load`` returns the value with its TTL, or None when there is nothing
+        worth caching. Entries are fresh for that TTL and then served stale for up to
+        ``cache_stale_ttl`` more while a single background load refreshes
+        them, so a failing upstream keeps serving the stale copy. Concurrent
+        misses in this worker share one load, and a short Redis lock makes
+        other workers wait for its result instead of loading as well.
+        """
+        client = await self._get_client()
+        if not client:
+            loaded = await load()
+            return loaded[0] if loaded else None
+
+        cached = await self.get(key)
+        if cached is not None:
+            fresh_until, _, value = cached.partition(b"|")
+            if float(fresh_until) < time.time() and key not in self._loads:
+                self._start_load(client, key, load, wait=False)
+            return value
+
+        if key not in self._loads:
+            self._start_load(client, key, load, wait=True)
+        return await asyncio.shield(self._loads[key])
+
+    def _start_load(
+        self,
+        client: redis.Redis,
+        key: str,
+        load: Callable[[], Awaitable[tuple[bytes, int] | None]],
+        wait: bool,
+    ) -> None:
+        task = asyncio.get_running_loop().create_task(self._load(client, key, load, wait))
+        self._loads[key] = task
+        task.add_done_callback(lambda _: self._loads.pop(key, None))
+
+    async def _load(
+        self,
+        client: redis.Redis,
+        key: str,
+        load: Callable[[], Awaitable[tuple[bytes, int] | None]],
+        wait: bool,
+    ) -> bytes | None:
+        lock_key = f"lock:{key}"
+        token = uuid.uuid4().hex
+        try:
+            locked = await client.set(lock_key, token, nx=True, px=settings.cache_lock_ttl_ms)
+        except Exception:
+            locked = True
+
+        if not locked:
+            if not wait:
+                return None
+            # Another worker is loading this key; wait for its result rather than duplicating it.
+            deadline = time.monotonic() + settings.cache_lock_ttl_ms / 1000
+            while time.monotonic() < deadline:
+                await asyncio.sleep(settings.cache_lock_poll_ms / 1000)
+                with contextlib.suppress(Exception):
+                    cached: bytes | None = await client.get(key)
+                    if cached is not None:
+                        return cached.partition(b"|")[2]
+
+        try:
+            loaded = await load()
+            if loaded is None:
+                return None
+            value, ttl = loaded
+            fresh_until = f"{time.time() + ttl:.3f}|".encode()
+            await self.set(key, fresh_until + value, ttl + settings.cache_stale_ttl)
+            return value
+        except Exception:
+            return None
+        finally:
+            if locked:
+                with contextlib.suppress(Exception):
+                    await client.eval(RELEASE_LOCK_SCRIPT, 1, lock_key, token)  # type: ignore[misc]
+
     async def delete(self, key: str) -> bool:
         client = await self._get_client()
         if not client:
             return False
 
+        await self._invalidate_local(client, key)
         try:
             await client.delete(key)
             return True
@@ -68,6 +346,7 @@ class CacheService:
         if not client:
             return 0
 
+        await self._invalidate_local(client, pattern)
         try:
             cursor = 0
             deleted_count = 0
@@ -81,12 +360,232 @@ class CacheService:
         except Exception:
             return 0
 
+    async def get_generation(self, key: str) -> str:
+        """Current value of a generation counter, read through L1; "0" if never bumped."""
+        value = await self.get(key)
+        if value is None:
+            if self.use_local:
+                self._local.set(key, b"0", settings.cache_l1_ttl)
+            return "0"
+        return value.decode()
+
+    async def bump_generation(self, key: str) -> str | None:
+        """Increment a generation counter and drop it from every worker's L1."""
+        client = await self._get_client()
+        if not client:
+            return None
+
+        try:
+            value = await client.incr(key)
+        except Exception:
+            return None
+        await self._invalidate_local(client, key)
+        return str(value)
+
+    @staticmethod
+    def _search_generation_keys(
+        category: str | None, subject: str | None, facets: bool
+    ) -> list[str]:
+        # Facet counts ignore the page's own category and subject filters.
+        if subject and not facets:
+            scope = f"subject:{subject}"
+        elif category and not facets:
+            scope = f"category:{category}"
+        else:
+            scope = "all"
+        return [SEARCH_GENERATION_KEY, f"{SEARCH_GENERATION_KEY}:{scope}"]
+
+    async def get_search_generation(
+        self, category: str | None = None, subject: str | None = None, facets: bool = False
+    ) -> str:
+        """Generation token for a search page, read through L1 like any other key."""
+        keys = self._search_generation_keys(category, subject, facets)
+        values = await self.get_many(keys)
+        if self.use_local:
+            # Scopes that were never invalidated have no counter; remember that too.
+            for key, value in zip(keys, values, strict=True):
+                if value is None:
+                    self._local.set(key, b"0", settings.cache_l1_ttl)
+        return ".".join(value.decode() if value else "0" for value in values)
+
+    async def invalidate_search(
+        self, category: str | None = None, subject: str | None = None
+    ) -> None:
+        """
+        Retire cached search pages after the approved set changes.
+
+        Without a category or subject every page is retired. Otherwise only
+        unfiltered pages and pages filtered to that category or subject are.
+        Old pages are never deleted; they just expire. The facet tree is dropped.
+        """
+        client = await self._get_client()
+        if not client:
+            return
+
+        if category is None and subject is None:
+            keys = [SEARCH_GENERATION_KEY]
+        else:
+            keys = [f"{SEARCH_GENERATION_KEY}:all"]
+            if category:
+                keys.append(f"{SEARCH_GENERATION_KEY}:category:{category}")
+            if subject:
+                keys.append(f"{SEARCH_GENERATION_KEY}:subject:{subject}")
+
+        with contextlib.suppress(Exception):
+            async with client.pipeline(transaction=False) as pipe:
+                for key in keys:
+                    pipe.incr(key)
+                await pipe.execute()
+        for key in keys:
+            await self._invalidate_local(client, key)
+        await self.delete(FACET_TREE_CACHE_KEY)
+
+    async def record_lookup(self, query: str, hit: bool, keyword: str | None = None) -> None:
+        """
+        Count a search cache lookup for ``query``, a canonical_search_query string,
+        remembering ``keyword`` as the user typed it.
+        """
+        client = await self._get_client()
+        if not client:
+            return
+
+        self._lookups_since_trim += 1
+        trim = self._lookups_since_trim >= settings.cache_query_stats_trim_every
+        if trim:
+            self._lookups_since_trim = 0
+
+        with contextlib.suppress(Exception):
+            async with client.pipeline(transaction=False) as pipe:
+                pipe.zincrby(QUERY_LOOKUPS_KEY, 1, query)
+                if hit:
+                    pipe.hincrby(QUERY_HITS_KEY, query, 1)
+                if keyword:
+                    pipe.hset(QUERY_KEYWORDS_KEY, query, keyword)
+                await pipe.execute()
+
+            if trim:
+                # Keep only the most looked-up queries so the stats stay bounded.
+                stop = -settings.cache_query_stats_max - 1
+                evicted = await client.zrange(QUERY_LOOKUPS_KEY, 0, stop)
+                if evicted:
+                    async with client.pipeline(transaction=False) as pipe:
+                        pipe.zremrangebyrank(QUERY_LOOKUPS_KEY, 0, stop)
+                        pipe.hdel(QUERY_HITS_KEY, *evicted)
+                        pipe.hdel(QUERY_KEYWORDS_KEY, *evicted)
+                        await pipe.execute()
+
+    async def get_query_stats(self, limit: int = 20) -> list[dict[str, Any]]:
+        """Most looked-up canonical queries with their cache hit rate and typed keyword."""
+        client = await self._get_client()
+        if not client:
+            return []
+
+        try:
+            top = await client.zrevrange(QUERY_LOOKUPS_KEY, 0, limit - 1, withscores=True)
+            if not top:
+                return []
+            queries = [query for query, _ in top]
+            hits = await client.hmget(QUERY_HITS_KEY, queries)  # type: ignore[misc]
+            keywords = await client.hmget(QUERY_KEYWORDS_KEY, queries)  # type: ignore[misc]
+        except Exception:
+            return []
+
+        stats = []
+        for (query, lookups), hit_count, keyword in zip(top, hits, keywords, strict=True):
+            hit_count = int(hit_count or 0)
+            stats.append(
+                {
+                    "query": query.decode(),
+                    "keyword": keyword.decode() if keyword else None,
+                    "lookups": int(lookups),
+                    "hits": hit_count,
+                    "hit_rate": hit_count / lookups if lookups else 0.0,
+                }
+            )
+        return stats
+
+    async def _invalidate_local(self, client: redis.Redis, pattern: str) -> None:
+        if not self.use_local:
+            return
+
+        self._local.delete_pattern(pattern)
+        with contextlib.suppress(Exception):
+            await client.publish(INVALIDATION_CHANNEL, pattern)
+
+    def start_invalidation_listener(self) -> None:
+        """Subscribe this worker to L1 invalidations published by the others."""
+        if self.use_local and self._listener_task is None:
+            self._listener_task = asyncio.get_running_loop().create_task(self._listen())
+
+    async def _listen(self) -> None:
+        while True:
+            client = await self._get_client()
+            if not client:
+                return
+
+            try:
+                async with client.pubsub() as pubsub:
+                    await pubsub.subscribe(INVALIDATION_CHANNEL)
+                    # Invalidations published while disconnected were missed.
+                    self._local.clear()
+                    async for message in pubsub.listen():
+                        if message["type"] == "message":
+                            self._local.delete_pattern(message["data"].decode())
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                self._local.clear()
+                await asyncio.sleep(1)
+
     async def close(self) -> None:
+        for task in list(self._loads.values()):
+            task.cancel()
+        if self._listener_task:
+            self._listener_task.cancel()
+            self._listener_task = None
+        self._local.clear()
         if self._client:
             await self._client.close()
             self._client = None
 
 
+def canonicalize_keyword(keyword: str | None) -> str:
+    """
+    Cache identity of a search keyword, which is also the text searched for.
+
+    Case, Unicode form and whitespace are normalised, so "Physics  notes" and
+    "physics notes" share an entry. Word order, stop words and punctuation
+    are kept, since the phrase clauses and query syntax rank by them.
+    """
+    if not keyword:
+        return ""
+    return " ".join(unicodedata.normalize("NFKC", keyword).casefold().split())
+
+
+def canonical_search_query(
+    keyword: str | None = None,
+    category: str | None = None,
+    subject: str | None = None,
+    doc_type: str | None = None,
+    year: int | None = None,
+    page: int = 1,
+    size: int = 50,
+    facets: bool = False,
+) -> str:
+    """Readable, stable description of a search page, used for per-query cache stats."""
+    params = {
+        "keyword": canonicalize_keyword(keyword),
+        "category": category,
+        "subject": subject,
+        "doc_type": doc_type,
+        "year": year,
+        "page": page,
+        "size": size,
+        "facets": facets,
+    }
+    return json.dumps({key: value for key, value in params.items() if value}, sort_keys=True)
+
+
 def generate_search_cache_key(
     keyword: str | None = None,
     category: str | None = None,
@@ -95,34 +594,67 @@ def generate_search_cache_key(
     year: int | None = None,
     page: int = 1,
     size: int = 50,
+    cursor: str | None = None,
+    facets: bool = False,
+    generation: str = "",
 ) -> str:
     params = {
-        "keyword": keyword or "",
+        "keyword": canonicalize_keyword(keyword),
         "category": category or "",
         "subject": subject or "",
         "doc_type": doc_type or "",
         "year": year or 0,
         "page": page,
         "size": size,
+        "cursor": cursor or "",
+        "facets": facets,
+        "generation": generation,
     }
     params_str = json.dumps(params, sort_keys=True)
     hash_value = hashlib.md5(params_str.encode()).hexdigest()[:16]
     return f"search:{hash_value}"
 
 
-def serialize_search_results(results: dict[str, Any]) -> str:
-    def default_serializer(obj: Any) -> Any:
-        if hasattr(obj, "isoformat"):
-            return obj.isoformat()
-        if hasattr(obj, "model_dump"):
-            return obj.model_dump()
-        raise TypeError(f"Object of type {type(obj)} is not JSON serializable")
+def generate_highlight_cache_key(doc_id: int, keyword: str) -> str:
+    hash_value = hashlib.md5(canonicalize_keyword(keyword).encode()).hexdigest()[:16]
+    return f"highlight:{doc_id}:{hash_value}"
+
+
+def _default_serializer(obj: Any) -> Any:
+    if hasattr(obj, "isoformat"):
+        return obj.isoformat()
+    if hasattr(obj, "model_dump"):
+        return obj.model_dump()
+    raise TypeError(f"Object of type {type(obj)} is not JSON serializable")
+
+
+def dump_json(obj: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(obj, default=_default_serializer)
+    return json.dumps(
+        obj, default=_default_serializer, separators=(",", ":"), ensure_ascii=False
+    ).encode()
+
+
+def pack_cache_value(data: bytes) -> bytes:
+    """Prefix raw bytes with a codec tag, zlib-compressing them above the size threshold."""
+    if len(data) >= settings.cache_compress_min_bytes:
+        return b"z" + zlib.compress(data, settings.cache_compress_level)
+    return b"r" + data
+
+
+def unpack_cache_value(data: bytes) -> bytes:
+    if data[:1] == b"z":
+        return zlib.decompress(data[1:])
+    return data[1:]
+
 
-    return json.dumps(results, default=default_serializer)
+def serialize_search_results(results: Any) -> bytes:
+    return pack_cache_value(dump_json(results))
 
 
-def deserialize_search_results(data: str) -> dict[str, Any]:
-    return json.loads(data)
+def deserialize_search_results(data: bytes) -> Any:
+    return json.loads(unpack_cache_value(data))
 
 
 cache_service = CacheService()
@@ -0,0 +1,223 @@
+import uuid
+
+import redis.asyncio as redis
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.schemas.auth import CurrentUserSchema
+from app.schemas.scoreboard import AuthenticatedScoreboardUser, ScoreboardUser, User
+
+# Upload counts by user ID (sorted set) and usernames by user ID (hash).
+LEADERBOARD_KEY = "leaderboard:uploads"
+USERNAMES_KEY = "leaderboard:usernames"
+
+REBUILD_BATCH = 1000
+
+
+class LeaderboardService:
+    """
+    Mirrors ``Scoreboard.upload_count`` into a Redis sorted set.
+
+    The top contributors are one ZREVRANGE and a user's rank one ZREVRANK,
+    instead of sorting the scoreboard table on every request. Approvals and
+    deletions copy the committed counts of the users they touch with
+    ``refresh_users``. Postgres stays the source of truth: ``rebuild``
+    reloads both keys from it, and reads fall back to Postgres while Redis
+    is disabled, unreachable or holds no leaderboard yet.
+    """
+
+    def __init__(self) -> None:
+        self._client: redis.Redis | None = None
+
+    async def _get_client(self) -> redis.Redis | None:
+        if not settings.redis_cache_enabled:
+            return None
+
+        if self._client is None:
+            self._client = redis.Redis.from_url(
+                settings.redis_url,
+                encoding="utf-8",
+                decode_responses=True,
+            )
+
+        return self._client
+
+    async def _get_ready_client(self, session: AsyncSession) -> redis.Redis | None:
+        client = await self._get_client()
+        if not client:
+            return None
+
+        if not await client.exists(LEADERBOARD_KEY) and not await self.rebuild(session):
+            return None
+        return client
+
+    async def rebuild(self, session: AsyncSession) -> int:
+        """
+        Reload the leaderboard from the scoreboard table.
+
+        Both keys are written under temporary names and renamed over the live
+        ones together, so readers never see a partial leaderboard.
+
+        Returns:
+            int: Number of users on the leaderboard
+        """
+        from app.models.scoreboard import Scoreboard
+
+        client = await self._get_client()
+        if not client:
+            return 0
+
+        entries = await Scoreboard.get_leaderboard_entries(session)
+        if not entries:
+            await client.delete(LEADERBOARD_KEY, USERNAMES_KEY)
+            return 0
+
+        suffix = uuid.uuid4().hex
+        scores_key, usernames_key = f"{LEADERBOARD_KEY}:{suffix}", f"{USERNAMES_KEY}:{suffix}"
+        async with client.pipeline(transaction=False) as pipe:
+            for start in range(0, len(entries), REBUILD_BATCH):
+                batch = entries[start : start + REBUILD_BATCH]
+                pipe.zadd(
+                    scores_key, {str(entry.user.user_id): entry.upload_count for entry in batch}
+                )
+                pipe.hset(
+                    usernames_key,
+                    mapping={str(entry.user.user_id): entry.user.username for entry in batch},
+                )
+            await pipe.execute()
+
+        async with client.pipeline(transaction=True) as pipe:
+            pipe.rename(scores_key, LEADERBOARD_KEY)
+            pipe.rename(usernames_key, USERNAMES_KEY)
+            await pipe.execute()
+
+        return len(entries)
+
+    async def refresh_users(self, session: AsyncSession, *user_ids: int) -> None:
+        """
+        Copy the committed upload counts of ``user_ids`` into the leaderboard.
+
+        Counts are read back from Postgres rather than incremented in Redis,
+        so repeating a refresh is harmless.
+        """
+        from app.models.scoreboard import Scoreboard
+
+        client = await self._get_client()
+        if not client or not user_ids:
+            return
+
+        try:
+            # An unbuilt leaderboard is loaded whole by the next read instead.
+            if not await client.exists(LEADERBOARD_KEY):
+                return
+            entries = await Scoreboard.get_leaderboard_entries(session, list(user_ids))
+            async with client.pipeline(transaction=True) as pipe:
+                for entry in entries:
+                    pipe.zadd(LEADERBOARD_KEY, {str(entry.user.user_id): entry.upload_count})
+                    pipe.hset(USERNAMES_KEY, str(entry.user.user_id), entry.user.username)
+                await pipe.execute()
+        except redis.RedisError:
+            # A stale count is corrected by the next scheduled rebuild.
+            return
+
+    async def get_top_users(
+        self, session: AsyncSession, top_n: int, exclude_ids: set[int]
+    ) -> list[ScoreboardUser]:
+        """
+        Get the ``top_n`` contributors, leaving out ``exclude_ids``.
+
+        Returns:
+            List[ScoreboardUser]: Top contributors with upload counts
+        """
+        from app.models.scoreboard import Scoreboard
+
+        try:
+            client = await self._get_ready_client(session)
+            if client:
+                # Excluded users can only push entries past the end, so this many is enough.
+                members = await client.zrevrange(
+                    LEADERBOARD_KEY, 0, top_n + len(exclude_ids) - 1, withscores=True
+                )
+                top = [
+                    (int(member), int(score))
+                    for member, score in members
+                    if int(member) not in exclude_ids
+                ][:top_n]
+                if not top:
+                    return []
+                usernames = await client.hmget(  # type: ignore[misc]
+                    USERNAMES_KEY, [str(user_id) for user_id, _ in top]
+                )
+                return [
+                    ScoreboardUser(
+                        user=User(user_id=user_id, username=username), upload_count=upload_count
+                    )
+                    for (user_id, upload_count), username in zip(top, usernames, strict=True)
+                ]
+        except redis.RedisError:
+            pass
+
+        return await Scoreboard.get_top_n_approved_users(session, top_n, list(exclude_ids))
+
+    async def get_user(
+        self, session: AsyncSession, authenticated: CurrentUserSchema, exclude_ids: set[int]
+    ) -> AuthenticatedScoreboardUser:
+        """
+        Get the authenticated user's upload count and rank.
+
+        The rank is the user's ZREVRANK less the excluded users placed above
+        them. Users without a scoreboard row rank after everyone with one.
+
+        Args:
+            session: Active database session
+            authenticated: The authenticated account
+            exclude_ids: User IDs left out of the ranking (system accounts)
+
+        Returns:
+            AuthenticatedScoreboardUser: User's stats including rank
+        """
+        from app.models.scoreboard import Scoreboard
+
+        user_id = authenticated.user_id
+        others = [excluded for excluded in exclude_ids if excluded != user_id]
+        try:
+            client = await self._get_ready_client(session)
+            if client:
+                async with client.pipeline(transaction=True) as pipe:
+                    pipe.zscore(LEADERBOARD_KEY, user_id)
+                    pipe.zrevrank(LEADERBOARD_KEY, user_id)
+                    pipe.zcard(LEADERBOARD_KEY)
+                    for excluded in others:
+                        pipe.zscore(LEADERBOARD_KEY, excluded)
+                    score, rank, size, *excluded_scores = await pipe.execute()
+
+                if rank is None:
+                    upload_count = 0
+                    rank = size - sum(
+                        excluded_score is not None for excluded_score in excluded_scores
+                    )
+                else:
+                    # ZREVRANGE orders equal scores by descending member, as strings.
+                    upload_count = int(score)
+                    rank -= sum(
+                        excluded_score is not None
+                        and (excluded_score, str(excluded)) > (score, str(user_id))
+                        for excluded, excluded_score in zip(others, excluded_scores, strict=True)
+                    )
+                return AuthenticatedScoreboardUser(
+                    user=User(user_id=user_id, username=authenticated.username),
+                    upload_count=upload_count,
+                    rank=rank + 1,
+                )
+        except redis.RedisError:
+            pass
+
+        return await Scoreboard.get_authenticated_approved_user(session, authenticated, exclude_ids)
+
+    async def close(self) -> None:
+        if self._client:
+            await self._client.close()
+            self._client = None
+
+
+leaderboard_service = LeaderboardService()
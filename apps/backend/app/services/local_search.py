@@ -0,0 +1,439 @@
+import bisect
+import heapq
+import json
+import math
+import mmap
+import os
+import re
+import struct
+import time
+from array import array
+from collections import Counter
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+from app.core.config import settings
+
+MAGIC = b"HGSIDX01"
+HEADER_STRUCT = struct.Struct("<Q")
+FILTER_FIELDS = ("category", "subject", "doc_type", "year")
+FIELD_WEIGHTS = {"document_name": 3, "subject": 2, "category": 2, "content": 1}
+MAX_PREFIX_EXPANSIONS = 32
+PREFIX_PENALTY = 0.8
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+# Same list as the _english_ stopwords used by document_analyzer in OpenSearch.
+STOPWORDS = frozenset(
+    {
+        "a", "an", "and", "are", "as", "at", "be", "but", "by", "for", "if", "in", "into",
+        "is", "it", "no", "not", "of", "on", "or", "such", "that", "the", "their", "then",
+        "there", "these", "they", "this", "to", "was", "will", "with",
+    }
+)  # fmt: skip
+_TOKEN_RE = re.compile(r"\w+")
+
+
+def tokenize(text: str | None) -> list[str]:
+    if not text:
+        return []
+    return [token for token in _TOKEN_RE.findall(text.casefold()) if token not in STOPWORDS]
+
+
+def _uploaded_on_ms(value: Any) -> int:
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    return int(value.timestamp() * 1000) if value else 0
+
+
+def _weighted_terms(doc: dict[str, Any]) -> Counter[str]:
+    counts: Counter[str] = Counter()
+    for field, weight in FIELD_WEIGHTS.items():
+        for token in tokenize(doc.get(field)):
+            counts[token] += weight
+    return counts
+
+
+def _doc_record(doc: dict[str, Any]) -> dict[str, Any]:
+    uploaded_on = doc["uploaded_on"]
+    if isinstance(uploaded_on, datetime):
+        uploaded_on = uploaded_on.isoformat()
+
+    return {
+        "id": doc["id"],
+        "document_name": doc["document_name"],
+        "category": doc["category"],
+        "subject": doc["subject"],
+        "doc_type": doc["doc_type"],
+        "year": doc.get("year"),
+        "uploaded_by": doc["uploaded_by"],
+        "uploaded_on": uploaded_on,
+        "file_name": doc.get("file_name", ""),
+        "extension": doc.get("extension", ""),
+        "view_count": doc.get("view_count", 0),
+        "category_id": doc.get("category_id"),
+        "subject_id": doc.get("subject_id"),
+        "type_id": doc.get("type_id"),
+        "user_id": doc.get("user_id"),
+    }
+
+
+def text_cache_path(doc_id: int) -> Path:
+    return Path(settings.local_search_text_dir) / f"{doc_id}.txt"
+
+
+def read_cached_text(doc_id: int) -> str | None:
+    path = text_cache_path(doc_id)
+    if not path.exists():
+        return None
+    return path.read_text(encoding="utf-8")
+
+
+def write_cached_text(doc_id: int, text: str) -> None:
+    path = text_cache_path(doc_id)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text, encoding="utf-8")
+
+
+def write_local_index(documents: list[dict[str, Any]], path: str | None = None) -> int:
+    """
+    Build the on-disk index from document dicts and atomically replace ``path``.
+
+    Layout: magic, little-endian u64 header length, JSON header (documents,
+    lengths, term dictionary), padding to 4 bytes, then one uint32 postings
+    region. A term's postings are ``df`` document positions followed by
+    ``df`` weighted term frequencies.
+    """
+    path = path or settings.local_search_path
+    ordered = sorted(
+        documents, key=lambda doc: (_uploaded_on_ms(doc["uploaded_on"]), doc["id"]), reverse=True
+    )
+
+    postings: dict[str, list[tuple[int, int]]] = {}
+    lengths = []
+    for position, doc in enumerate(ordered):
+        counts = _weighted_terms(doc)
+        lengths.append(sum(counts.values()))
+        for term, tf in counts.items():
+            postings.setdefault(term, []).append((position, tf))
+
+    region = array("I")
+    terms: dict[str, list[int]] = {}
+    for term in sorted(postings):
+        entries = postings[term]
+        terms[term] = [len(region), len(entries)]
+        region.extend(position for position, _ in entries)
+        region.extend(min(tf, 0xFFFFFFFF) for _, tf in entries)
+
+    header = json.dumps(
+        {
+            "docs": [_doc_record(doc) for doc in ordered],
+            "lengths": lengths,
+            "terms": terms,
+        },
+        separators=(",", ":"),
+    ).encode()
+    padding = b" " * (-(len(MAGIC) + HEADER_STRUCT.size + len(header)) % 4)
+    header += padding
+
+    target = Path(path)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    tmp = target.with_suffix(target.suffix + ".tmp")
+    with open(tmp, "wb") as fh:
+        fh.write(MAGIC)
+        fh.write(HEADER_STRUCT.pack(len(header)))
+        fh.write(header)
+        region.tofile(fh)
+    os.replace(tmp, target)
+    return len(ordered)
+
+
+class LocalSearchIndex:
+    """
+    Pure-Python BM25 index used when OpenSearch is disabled or unhealthy.
+
+    The base segment is memory-mapped from ``settings.local_search_path``;
+    postings are read straight from the mapping. Filters are evaluated as
+    integer bitmaps over document positions. Documents approved or deleted
+    after the last build live in a small in-memory overlay until the next
+    rebuild.
+    """
+
+    def __init__(self) -> None:
+        self._mmap: mmap.mmap | None = None
+        self._postings: memoryview | None = None
+        self._docs: list[dict[str, Any]] = []
+        self._lengths: list[int] = []
+        self._uploaded_ms: list[int] = []
+        self._terms: dict[str, list[int]] = {}
+        self._sorted_terms: list[str] = []
+        self._avgdl = 1.0
+        self._bitmaps: dict[str, dict[Any, int]] = {}
+        self._positions: dict[int, int] = {}
+        self._overlay: dict[int, tuple[dict[str, Any], Counter[str], int]] = {}
+        self._deleted: set[int] = set()
+        self._mtime: float | None = None
+        self._checked_at = 0.0
+
+    @property
+    def is_ready(self) -> bool:
+        return settings.local_search_enabled and bool(self._docs or self._overlay)
+
+    @property
+    def doc_count(self) -> int:
+        return len(self._docs) - len(self._deleted & self._positions.keys()) + len(self._overlay)
+
+    def load(self, path: str | None = None) -> bool:
+        path = path or settings.local_search_path
+        try:
+            with open(path, "rb") as fh:
+                mapped = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            return False
+
+        if mapped[: len(MAGIC)] != MAGIC:
+            mapped.close()
+            return False
+
+        offset = len(MAGIC)
+        (header_length,) = HEADER_STRUCT.unpack_from(mapped, offset)
+        offset += HEADER_STRUCT.size
+        header = json.loads(mapped[offset : offset + header_length])
+        offset += header_length
+
+        self.close()
+        self._mmap = mapped
+        self._postings = memoryview(mapped)[offset:].cast("I")
+        self._docs = header["docs"]
+        self._lengths = header["lengths"]
+        self._uploaded_ms = [_uploaded_on_ms(doc["uploaded_on"]) for doc in self._docs]
+        self._terms = header["terms"]
+        self._sorted_terms = sorted(self._terms)
+        self._avgdl = (sum(self._lengths) / len(self._lengths)) if self._lengths else 1.0
+        self._positions = {doc["id"]: position for position, doc in enumerate(self._docs)}
+        self._bitmaps = {}
+        for field in FILTER_FIELDS:
+            bits: dict[Any, bytearray] = {}
+            for position, doc in enumerate(self._docs):
+                bitmap = bits.setdefault(doc[field], bytearray((len(self._docs) + 7) // 8))
+                bitmap[position >> 3] |= 1 << (position & 7)
+            self._bitmaps[field] = {
+                value: int.from_bytes(bitmap, "little") for value, bitmap in bits.items()
+            }
+        self._overlay.clear()
+        self._deleted.clear()
+        self._mtime = os.path.getmtime(path)
+        return True
+
+    def reload_if_changed(self) -> None:
+        now = time.monotonic()
+        if now - self._checked_at < settings.local_search_reload_interval:
+            return
+        self._checked_at = now
+
+        try:
+            mtime = os.path.getmtime(settings.local_search_path)
+        except OSError:
+            return
+        if mtime != self._mtime:
+            self.load()
+
+    def close(self) -> None:
+        if self._postings is not None:
+            self._postings.release()
+            self._postings = None
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+
+    def add_document(self, doc: dict[str, Any]) -> None:
+        counts = _weighted_terms(doc)
+        self._overlay[doc["id"]] = (_doc_record(doc), counts, sum(counts.values()))
+        self._deleted.discard(doc["id"])
+
+    def remove_document(self, doc_id: int) -> None:
+        self._overlay.pop(doc_id, None)
+        self._deleted.add(doc_id)
+
+    def _expand(self, token: str, allow_prefix: bool) -> list[tuple[str, float]]:
+        expansions = [(token, 1.0)] if token in self._terms else []
+        if allow_prefix or not expansions:
+            start = bisect.bisect_left(self._sorted_terms, token)
+            for term in self._sorted_terms[start : start + MAX_PREFIX_EXPANSIONS + 1]:
+                if not term.startswith(token):
+                    break
+                if term != token:
+                    expansions.append((term, PREFIX_PENALTY))
+        return expansions
+
+    def _bm25(self, tf: int, length: int, idf: float) -> float:
+        norm = BM25_K1 * (1 - BM25_B + BM25_B * length / self._avgdl)
+        return idf * tf * (BM25_K1 + 1) / (tf + norm)
+
+    def _filter_mask(self, filters: dict[str, Any]) -> int | None:
+        mask = None
+        for field, value in filters.items():
+            bitmap = self._bitmaps.get(field, {}).get(value, 0)
+            mask = bitmap if mask is None else mask & bitmap
+        return mask
+
+    def _score(self, tokens: list[str], mask: bytes | None) -> dict[int, float]:
+        scores: dict[int, float] = {}
+        if self._postings is None:
+            return scores
+        total_docs = len(self._docs) + len(self._overlay)
+        for index, token in enumerate(tokens):
+            for term, weight in self._expand(token, allow_prefix=index == len(tokens) - 1):
+                offset, df = self._terms[term]
+                idf = math.log(1 + (total_docs - df + 0.5) / (df + 0.5))
+                positions = self._postings[offset : offset + df]
+                tfs = self._postings[offset + df : offset + 2 * df]
+                for position, tf in zip(positions, tfs, strict=True):
+                    if mask is not None and not mask[position >> 3] >> (position & 7) & 1:
+                        continue
+                    score = weight * self._bm25(tf, self._lengths[position], idf)
+                    scores[position] = scores.get(position, 0.0) + score
+        return scores
+
+    def _score_overlay(
+        self, tokens: list[str], filters: dict[str, Any]
+    ) -> list[tuple[float, dict[str, Any]]]:
+        results = []
+        total_docs = len(self._docs) + len(self._overlay)
+        for record, counts, length in self._overlay.values():
+            if any(record[field] != value for field, value in filters.items()):
+                continue
+            score = 0.0
+            for index, token in enumerate(tokens):
+                is_last = index == len(tokens) - 1
+                for term, tf in counts.items():
+                    if term == token or (is_last and term.startswith(token)):
+                        df = self._terms.get(term, [0, 0])[1] + 1
+                        idf = math.log(1 + (total_docs - df + 0.5) / (df + 0.5))
+                        weight = 1.0 if term == token else PREFIX_PENALTY
+                        score += weight * self._bm25(tf, length, idf)
+            if score or not tokens:
+                results.append((score, record))
+        return results
+
+    def search(
+        self,
+        keyword: str | None = None,
+        category: str | None = None,
+        subject: str | None = None,
+        doc_type: str | None = None,
+        year: int | None = None,
+        page: int = 1,
+        size: int = 50,
+        cursor: str | None = None,
+    ) -> dict[str, Any] | None:
+        from app.services.search import (
+            SEARCH_ENGINE_LOCAL,
+            encode_search_cursor,
+            resume_search_cursor,
+        )
+
+        self.reload_if_changed()
+        if not self.is_ready:
+            return None
+
+        filters = {
+            field: value
+            for field, value in (
+                ("category", category),
+                ("subject", subject),
+                ("doc_type", doc_type),
+                ("year", year),
+            )
+            if value
+        }
+        mask = self._filter_mask(filters)
+        mask_bytes = None
+        if mask is not None:
+            mask_bytes = mask.to_bytes((len(self._docs) + 7) // 8 or 1, "little")
+        tokens = tokenize(keyword)
+
+        candidates: list[tuple[int, float]] = []
+        if tokens:
+            if self._postings is not None:
+                candidates = list(self._score(tokens, mask_bytes).items())
+        else:
+            candidates = [
+                (position, 0.0)
+                for position in range(len(self._docs))
+                if mask_bytes is None or mask_bytes[position >> 3] >> (position & 7) & 1
+            ]
+
+        hidden = self._deleted | self._overlay.keys()
+        ranked = [
+            ((score, self._uploaded_ms[position], self._docs[position]["id"]), self._docs[position])
+            for position, score in candidates
+            if not hidden or self._docs[position]["id"] not in hidden
+        ]
+        ranked += [
+            ((score, _uploaded_on_ms(doc["uploaded_on"]), doc["id"]), doc)
+            for score, doc in self._score_overlay(tokens, filters)
+        ]
+        total = len(ranked)
+
+        decoded = resume_search_cursor(cursor, SEARCH_ENGINE_LOCAL)
+        if cursor and decoded is None:
+            # OpenSearch scores cannot be compared with BM25 ones here.
+            page = 1
+        if decoded:
+            after = tuple(decoded["after"])
+            page = decoded["page"]
+            ranked = [entry for entry in ranked if entry[0] < after]
+            hits = heapq.nlargest(size, ranked, key=lambda entry: entry[0])
+            has_more = len(ranked) > size
+        else:
+            offset = (page - 1) * size
+            hits = heapq.nlargest(offset + size, ranked, key=lambda entry: entry[0])[offset:]
+            has_more = offset + size < total
+
+        next_cursor = None
+        if hits and has_more:
+            next_cursor = encode_search_cursor(
+                list(hits[-1][0]), page + 1, engine=SEARCH_ENGINE_LOCAL
+            )
+
+        return {
+            "items": [self._format(doc, sort_key[0]) for sort_key, doc in hits],
+            "total": total,
+            "page": page,
+            "pages": (total + size - 1) // size if size > 0 else 0,
+            "size": size,
+            "next_cursor": next_cursor,
+        }
+
+    @staticmethod
+    def _format(doc: dict[str, Any], score: float) -> dict[str, Any]:
+        category = {"id": doc.get("category_id") or 0, "name": doc["category"]}
+        return {
+            "id": doc["id"],
+            "category": doc.get("category_id") or 0,
+            "subject": doc.get("subject_id") or 0,
+            "type": doc.get("type_id") or 0,
+            "year": doc.get("year"),
+            "document_name": doc["document_name"],
+            "file_name": doc.get("file_name", ""),
+            "uploaded_by": doc.get("user_id") or 0,
+            "view_count": doc.get("view_count", 0),
+            "uploaded_on": doc["uploaded_on"],
+            "approved": True,
+            "doc_type": {"id": doc.get("type_id") or 0, "name": doc["doc_type"]},
+            "doc_category": category,
+            "doc_subject": {
+                "id": doc.get("subject_id") or 0,
+                "name": doc["subject"],
+                "category": category,
+            },
+            "account": {"user_id": doc.get("user_id") or 0, "username": doc["uploaded_by"]},
+            "extension": doc.get("extension", ""),
+            "score": score,
+            "highlights": None,
+        }
+
+
+local_search_index = LocalSearchIndex()
@@ -0,0 +1,664 @@
+"""
+Postgres full-text search backend.
+
+Serves /notes/search from the generated, weighted ``search_vector`` column of
+the library table instead of OpenSearch: websearch queries over a GIN index,
+ranked with ts_rank_cd and highlighted with ts_headline. Pages, cursors and
+facets have the same shape as the OpenSearch backend's.
+
+There are no index versions. The vector is kept current by Postgres, so the
+reindex lifecycle only refreshes the taxonomy names and extracted content it
+is built from.
+"""
+import logging
+import re
+import time
+from datetime import datetime
+from typing import Any
+
+from sqlalchemy import REAL, bindparam, func, literal, select, text, true, tuple_, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql.functions import Function
+
+from app.core.config import settings
+from app.db.database import async_session
+from app.services.cache import cache_service
+from app.services.search import (
+    SEARCH_ENGINE_POSTGRES,
+    SEARCH_TIER_FUZZY,
+    SEARCH_TIER_PHRASE,
+    SearchBackend,
+    SearchHealth,
+    encode_search_cursor,
+    resume_search_cursor,
+)
+from app.services.task_client import task_client
+from app.services.taxonomy import TaxonomySnapshot, taxonomy_service
+from app.utils.pagination import cached_count, listing_count_key, page_count
+
+logger = logging.getLogger(__name__)
+
+SEARCH_INDEX_NAME = "ix_library_search_vector"
+
+# ts_headline separates content fragments with this, so they can be returned as a list.
+FRAGMENT_DELIMITER = "\x1f"
+NAME_HEADLINE_OPTIONS = "StartSel=<mark>, StopSel=</mark>, HighlightAll=true"
+CONTENT_HEADLINE_OPTIONS = (
+    "StartSel=<mark>, StopSel=</mark>, MaxFragments=3, MaxWords=25, MinWords=10, "
+    f'FragmentDelimiter="{FRAGMENT_DELIMITER}"'
+)
+
+# Facet name -> bucket count, as for the OpenSearch facets.
+FACET_SIZES = {"categories": 20, "subjects": 50, "doc_types": 20, "years": 30}
+
+BULK_CHUNK_SIZE = 100
+
+
+def _buckets(counts: dict[Any, int], size: int) -> list[dict[str, Any]]:
+    """Largest counts first, ties by key, like an OpenSearch terms aggregation."""
+    ordered = sorted(counts.items(), key=lambda item: (-item[1], item[0]))
+    return [{"key": key, "count": count} for key, count in ordered[:size]]
+
+
+class PostgresSearchBackend(SearchBackend):
+    """
+    Search backend on the library table's tsvector column.
+
+    Approved rows are searchable by name as soon as they are committed, and
+    deleted rows drop out with them. Content extraction still runs in the
+    task service: an approval queues it, and the task posts the text back to
+    ``store_content``. The reindex tooling extracts content itself and writes
+    it with ``bulk_index_documents``.
+    """
+
+    queue_writes = False
+
+    def __init__(self) -> None:
+        self._health = SearchHealth(
+            failure_threshold=settings.opensearch_breaker_threshold,
+            reset_timeout=settings.opensearch_breaker_reset_seconds,
+        )
+        self._tier_stats: dict[str, dict[str, float]] = {}
+
+    @property
+    def index_name(self) -> str:
+        return SEARCH_INDEX_NAME
+
+    @property
+    def is_enabled(self) -> bool:
+        return settings.search_backend == "postgres"
+
+    @property
+    def health(self) -> SearchHealth:
+        return self._health
+
+    @property
+    def tier_stats(self) -> dict[str, dict[str, float]]:
+        """Searches answered and mean Postgres time per query tier, since startup."""
+        return {
+            tier: {"count": stats["count"], "avg_took_ms": stats["took_ms"] / stats["count"]}
+            for tier, stats in self._tier_stats.items()
+        }
+
+    def _record_tier(self, tier: str, took_ms: float) -> None:
+        stats = self._tier_stats.setdefault(tier, {"count": 0, "took_ms": 0.0})
+        stats["count"] += 1
+        stats["took_ms"] += took_ms
+
+    async def is_available(self, refresh: bool = False) -> bool:
+        """
+        Report whether Postgres can take search requests.
+
+        Serves the breaker state kept by recent searches; ``refresh`` checks
+        that the search index exists instead.
+        """
+        if not self.is_enabled:
+            return False
+
+        if refresh:
+            self._health.last_checked = time.time()
+            if await self.create_index():
+                self._health.record_success()
+                return True
+            self._health.record_failure()
+            return False
+
+        return self._health.can_attempt()
+
+    async def create_index(self) -> bool:
+        """The vector and its GIN index come from migrations; this only checks they exist."""
+        try:
+            async with async_session() as session:
+                exists = await session.scalar(
+                    text("SELECT to_regclass(:index) IS NOT NULL"), {"index": self.index_name}
+                )
+            return bool(exists)
+        except Exception:
+            return False
+
+    async def delete_index(self) -> bool:
+        """Clear the indexed taxonomy and content; document names stay searchable."""
+        from app.models.library import Library
+
+        try:
+            async with async_session() as session:
+                await session.execute(
+                    update(Library).values(search_taxonomy=None, search_content=None)
+                )
+                await session.commit()
+            return True
+        except Exception:
+            return False
+
+    async def list_index_versions(self) -> list[dict[str, Any]]:
+        return [{"index": self.index_name, "version": 1, "live": True, "building": False}]
+
+    async def begin_reindex(self) -> str | None:
+        """Rebuilds write straight into the live columns, so the target is the live index."""
+        return self.index_name if await self.create_index() else None
+
+    async def promote_index(self, index: str) -> bool:
+        return index == self.index_name
+
+    async def index_document(
+        self,
+        doc_id: int,
+        document_name: str,
+        category: str,
+        subject: str,
+        doc_type: str,
+        year: int | None,
+        uploaded_by: str,
+        uploaded_on: datetime,
+        content: str | None = None,
+        file_name: str | None = None,
+        extension: str | None = None,
+        view_count: int = 0,
+        approved: bool = True,
+        category_id: int | None = None,
+        subject_id: int | None = None,
+        type_id: int | None = None,
+        user_id: int | None = None,
+        index: str | None = None,
+        refresh: bool | str | None = None,
+    ) -> bool:
+        """
+        Write the taxonomy names, and content if given, the vector is built from.
+
+        Everything else is read from the row itself, so only these columns
+        are written. Empty content keeps what an earlier extraction stored.
+        Without content, extraction is queued in the task service, which
+        posts the text back to ``store_content``.
+        """
+        success, _ = await self.bulk_index_documents(
+            [{"id": doc_id, "category": category, "subject": subject, "content": content}]
+        )
+        if success and content is None and file_name and extension:
+            await task_client.trigger_extract_content(doc_id, file_name, extension)
+        return success == 1
+
+    async def store_content(self, doc_id: int, content: str) -> bool:
+        """
+        Store text the task service extracted for an approved note.
+
+        The pages filtered to the note's category or subject are retired, as
+        the note can now match keywords they were cached without.
+        """
+        from app.models.library import Library
+
+        async with async_session() as session:
+            stored = (
+                await session.execute(
+                    update(Library)
+                    .where(Library.id == doc_id, Library.approved == true())
+                    .values(search_content=content)
+                    .returning(Library.category, Library.subject)
+                )
+            ).one_or_none()
+            await session.commit()
+            if stored is None:
+                return False
+            snapshot = await taxonomy_service.get(session)
+
+        category = snapshot.categories.get(stored.category)
+        subject = snapshot.subjects.get(stored.subject)
+        await cache_service.invalidate_search(
+            category["name"] if category else None, subject["name"] if subject else None
+        )
+        return True
+
+    async def bulk_index_documents(
+        self, documents: list[dict[str, Any]], index: str | None = None
+    ) -> tuple[int, int]:
+        from app.models.library import Library
+
+        table = Library.__table__
+        stmt = (
+            table.update()
+            .where(table.c.id == bindparam("doc_id"))
+            .values(
+                search_taxonomy=bindparam("taxonomy"),
+                search_content=func.coalesce(
+                    func.nullif(bindparam("content"), ""), table.c.search_content
+                ),
+            )
+        )
+
+        success = 0
+        try:
+            async with async_session() as session:
+                for start in range(0, len(documents), BULK_CHUNK_SIZE):
+                    chunk = documents[start : start + BULK_CHUNK_SIZE]
+                    ids = [doc["id"] for doc in chunk]
+                    existing = set(
+                        await session.scalars(select(Library.id).where(Library.id.in_(ids)))
+                    )
+                    params = [
+                        {
+                            "doc_id": doc["id"],
+                            "taxonomy": f"{doc['category']} {doc['subject']}",
+                            "content": doc.get("content") or "",
+                        }
+                        for doc in chunk
+                        if doc["id"] in existing
+                    ]
+                    if params:
+                        await session.execute(stmt, params)
+                        await session.commit()
+                    success += len(params)
+        except Exception as e:
+            logger.error(f"Failed to write search columns after {success} documents: {e}")
+            return success, len(documents) - success
+        return success, len(documents) - success
+
+    async def update_popularity(self, updates: dict[int, dict[str, float]]) -> tuple[int, int]:
+        """
+        Ranking here reads nothing from the pushed signals, so there is nothing
+        to write. Every update is reported as applied so the sync does not retry.
+        """
+        return len(updates), 0
+
+    async def delete_document(self, doc_id: int, refresh: bool | str | None = None) -> bool:
+        """The vector lives on the row, so deleting the note already removed it."""
+        return True
+
+    @staticmethod
+    def _tsquery(keyword: str, fuzzy: bool) -> Function[Any]:
+        from app.models.library import SEARCH_TEXT_CONFIG
+
+        if fuzzy:
+            return func.websearch_to_tsquery(SEARCH_TEXT_CONFIG, keyword)
+        return func.phraseto_tsquery(SEARCH_TEXT_CONFIG, keyword)
+
+    @staticmethod
+    def _facet_filters(
+        snapshot: TaxonomySnapshot,
+        category: str | None,
+        subject: str | None,
+        doc_type: str | None,
+        year: int | None,
+    ) -> dict[str, Any] | None:
+        """
+        Filter clause per selected facet, with names resolved to ids so they
+        hit the indexed FK columns. None if a name matches nothing.
+        """
+        from app.models.library import Library
+
+        filters: dict[str, Any] = {}
+        if category:
+            category_id = snapshot.category_id(category)
+            if category_id is None:
+                return None
+            filters["categories"] = Library.category == category_id
+        if subject:
+            subject_ids = snapshot.subject_ids(subject)
+            if not subject_ids:
+                return None
+            filters["subjects"] = Library.subject.in_(subject_ids)
+        if doc_type:
+            doc_type_id = snapshot.document_type_id(doc_type)
+            if doc_type_id is None:
+                return None
+            filters["doc_types"] = Library.type == doc_type_id
+        if year:
+            filters["years"] = Library.year == year
+        return filters
+
+    @staticmethod
+    async def _facet_counts(
+        session: AsyncSession, snapshot: TaxonomySnapshot, where: dict[str, list[Any]]
+    ) -> dict[str, dict[Any, int]]:
+        """Counts per facet value under that facet's filters, keyed by name like the indexed facets."""
+        from app.models.library import Library
+
+        columns = {
+            "categories": (Library.category, snapshot.categories),
+            "subjects": (Library.subject, snapshot.subjects),
+            "doc_types": (Library.type, snapshot.document_types),
+            "years": (Library.year, None),
+        }
+        counts = {}
+        for name, (column, items) in columns.items():
+            rows = await session.execute(
+                select(column, func.count()).where(*where[name]).group_by(column)  # pylint: disable=E1102
+            )
+            named: dict[Any, int] = {}
+            for value, count in rows:
+                key: Any = value
+                if items is not None:
+                    # Subject names repeat across categories; the facet counts them together.
+                    key = items[value]["name"] if value in items else None
+                if key is not None:
+                    named[key] = named.get(key, 0) + count
+            counts[name] = named
+        return counts
+
+    async def search_full(
+        self,
+        keyword: str | None = None,
+        category: str | None = None,
+        subject: str | None = None,
+        doc_type: str | None = None,
+        year: int | None = None,
+        page: int = 1,
+        size: int = 50,
+        fuzzy: bool = True,
+        cursor: str | None = None,
+        snapshot: bool = False,
+        include_facets: bool = False,
+        include_facet_tree: bool = False,
+        highlight_content: bool = False,
+    ) -> dict[str, Any] | None:
+        """
+        Search for the public /notes/search endpoint.
+
+        Keywords run as a websearch query, or a phrase query when ``fuzzy``
+        is off, against the weighted vector and are ranked by ts_rank_cd.
+        Browsing without a keyword lists newest first. Cursor pages seek past
+        the last row on (rank, uploaded_on, id), so ``snapshot`` is not needed
+        for stable deep pages and has no effect.
+        """
+        from app.models.auth import Account
+        from app.models.library import SEARCH_COLUMNS, SEARCH_TEXT_CONFIG, Library
+
+        after: tuple[float, datetime, int] | None = None
+        decoded = resume_search_cursor(cursor, SEARCH_ENGINE_POSTGRES)
+        if cursor and decoded is None:
+            page = 1
+        if decoded:
+            score, uploaded_on, doc_id = decoded["after"]
+            after = (float(score or 0.0), datetime.fromisoformat(uploaded_on), int(doc_id))
+            page = decoded["page"]
+
+        tier = None
+        if keyword:
+            tier = SEARCH_TIER_FUZZY if fuzzy else SEARCH_TIER_PHRASE
+
+        started = time.perf_counter()
+        try:
+            async with async_session() as session:
+                taxonomy = await taxonomy_service.get(session)
+                facet_filters = self._facet_filters(taxonomy, category, subject, doc_type, year)
+                response: dict[str, Any] = {
+                    "items": [],
+                    "total": 0,
+                    "page": page,
+                    "pages": 0,
+                    "size": size,
+                    "next_cursor": None,
+                    "tier": tier,
+                }
+                if include_facet_tree:
+                    response["facet_tree"] = await self._facet_tree(session, taxonomy)
+                if facet_filters is None:
+                    if include_facets:
+                        response["facets"] = {name: [] for name in FACET_SIZES}
+                    return response
+
+                base = [Library.approved == True]  # noqa: E712
+                score = literal(0.0, REAL)
+                query = None
+                if keyword:
+                    query = self._tsquery(keyword, fuzzy)
+                    base.append(Library.search_vector.bool_op("@@")(query))
+                    score = func.ts_rank_cd(Library.search_vector, query, type_=REAL)
+                filters = base + list(facet_filters.values())
+
+                count_key = listing_count_key(
+                    "search",
+                    keyword=keyword,
+                    fuzzy=fuzzy,
+                    category=category,
+                    subject=subject,
+                    doc_type=doc_type,
+                    year=year,
+                )
+                total = await cached_count(session, count_key, select(Library.id).where(*filters))
+
+                columns = [
+                    column
+                    for column in Library.__table__.columns
+                    if column.key not in SEARCH_COLUMNS
+                ]
+                stmt = (
+                    select(*columns, Account.username, score.label("score"))
+                    .join(Account, Account.user_id == Library.uploaded_by)
+                    .where(*filters)
+                )
+                if query is not None:
+                    stmt = stmt.add_columns(
+                        func.ts_headline(
+                            SEARCH_TEXT_CONFIG, Library.document_name, query, NAME_HEADLINE_OPTIONS
+                        ).label("name_headline")
+                    )
+                    if highlight_content:
+                        stmt = stmt.add_columns(
+                            func.ts_headline(
+                                SEARCH_TEXT_CONFIG,
+                                func.coalesce(Library.search_content, ""),
+                                query,
+                                CONTENT_HEADLINE_OPTIONS,
+                            ).label("content_headline")
+                        )
+                    if after:
+                        stmt = stmt.where(
+                            tuple_(score, Library.uploaded_on, Library.id) < tuple_(*after)
+                        )
+                    stmt = stmt.order_by(
+                        score.desc(), Library.uploaded_on.desc(), Library.id.desc()
+                    )
+                else:
+                    if after:
+                        stmt = stmt.where(
+                            tuple_(Library.uploaded_on, Library.id) < tuple_(*after[1:])
+                        )
+                    stmt = stmt.order_by(Library.uploaded_on.desc(), Library.id.desc())
+                if after is None:
+                    stmt = stmt.offset((page - 1) * size)
+                # One extra row tells whether there is a next page.
+                stmt = stmt.limit(size + 1)
+
+                notes = []
+                for row in (await session.execute(stmt)).mappings():
+                    note = dict(row)
+                    note["account"] = {
+                        "user_id": note["uploaded_by"],
+                        "username": note.pop("username"),
+                    }
+                    highlights = {}
+                    name_headline = note.pop("name_headline", None)
+                    if name_headline and "<mark>" in name_headline:
+                        highlights["document_name"] = [name_headline]
+                    fragments = [
+                        fragment
+                        for fragment in note.pop("content_headline", "").split(FRAGMENT_DELIMITER)
+                        if "<mark>" in fragment
+                    ]
+                    if fragments:
+                        highlights["content"] = fragments
+                    note["highlights"] = highlights or None
+                    notes.append(note)
+
+                if len(notes) > size:
+                    notes = notes[:size]
+                    last = notes[-1]
+                    response["next_cursor"] = encode_search_cursor(
+                        [last["score"], last["uploaded_on"].isoformat(), last["id"]],
+                        page + 1,
+                        tier=tier,
+                        engine=SEARCH_ENGINE_POSTGRES,
+                    )
+
+                for note in await taxonomy_service.hydrate(session, notes):
+                    note["uploaded_on"] = note["uploaded_on"].isoformat()
+                    response["items"].append(note)
+                response["total"] = total
+                response["pages"] = page_count(total, size)
+
+                if include_facets:
+                    # Each facet applies every filter except its own.
+                    where = {
+                        name: base
+                        + [clause for other, clause in facet_filters.items() if other != name]
+                        for name in FACET_SIZES
+                    }
+                    counts = await self._facet_counts(session, taxonomy, where)
+                    response["facets"] = {
+                        name: _buckets(counts[name], FACET_SIZES[name]) for name in FACET_SIZES
+                    }
+        except Exception:
+            self._health.record_failure()
+            return None
+
+        self._health.record_success()
+        if tier:
+            self._record_tier(tier, (time.perf_counter() - started) * 1000)
+        return response
+
+    async def _facet_tree(
+        self, session: AsyncSession, taxonomy: TaxonomySnapshot
+    ) -> dict[str, Any]:
+        from app.models.library import Library
+
+        approved = Library.approved == True  # noqa: E712
+        counts = await self._facet_counts(
+            session, taxonomy, {name: [approved] for name in FACET_SIZES}
+        )
+
+        rows = await session.execute(
+            select(Library.category, Library.subject, func.count())  # pylint: disable=E1102
+            .where(approved)
+            .group_by(Library.category, Library.subject)
+        )
+        subjects: dict[str, dict[str, int]] = {}
+        for category_id, subject_id, count in rows:
+            if category_id not in taxonomy.categories or subject_id not in taxonomy.subjects:
+                continue
+            names = subjects.setdefault(taxonomy.categories[category_id]["name"], {})
+            name = taxonomy.subjects[subject_id]["name"]
+            names[name] = names.get(name, 0) + count
+
+        return {
+            "categories": [
+                {**bucket, "subjects": _buckets(subjects.get(bucket["key"], {}), 200)}
+                for bucket in _buckets(counts["categories"], 20)
+            ],
+            "doc_types": _buckets(counts["doc_types"], 50),
+            "years": _buckets(counts["years"], 50),
+        }
+
+    async def get_facet_tree(self) -> dict[str, Any] | None:
+        """Unfiltered facet tree on its own, for pages served from cache without it."""
+        try:
+            async with async_session() as session:
+                return await self._facet_tree(session, await taxonomy_service.get(session))
+        except Exception:
+            return None
+
+    async def highlight(self, doc_ids: list[int], keyword: str) -> dict[int, list[str]] | None:
+        """Content snippets for ``keyword`` in just the given documents, via ts_headline."""
+        from app.models.library import SEARCH_TEXT_CONFIG, Library
+
+        if not doc_ids:
+            return None
+
+        stmt = select(
+            Library.id,
+            func.ts_headline(
+                SEARCH_TEXT_CONFIG,
+                func.coalesce(Library.search_content, ""),
+                self._tsquery(keyword, True),
+                CONTENT_HEADLINE_OPTIONS,
+            ),
+        ).where(Library.id.in_(doc_ids))
+
+        try:
+            async with async_session() as session:
+                rows = await session.execute(stmt)
+        except Exception:
+            return None
+
+        highlights: dict[int, list[str]] = {doc_id: [] for doc_id in doc_ids}
+        for doc_id, headline in rows:
+            # Without a match ts_headline returns the opening words, which are not a snippet.
+            highlights[doc_id] = [
+                fragment for fragment in headline.split(FRAGMENT_DELIMITER) if "<mark>" in fragment
+            ]
+        return highlights
+
+    async def suggest(self, prefix: str, limit: int = 10) -> list[dict[str, Any]] | None:
+        """Names containing every typed word as a prefix, matched on the A-weighted lexemes."""
+        from app.models.library import SEARCH_TEXT_CONFIG, Library
+
+        words = re.findall(r"[^\W_]+", prefix.lower())
+        if not words:
+            return []
+
+        query = func.to_tsquery(SEARCH_TEXT_CONFIG, " & ".join(f"{word}:*A" for word in words))
+        stmt = (
+            select(Library.id, Library.document_name)
+            .where(Library.approved == True)  # noqa: E712
+            .where(Library.search_vector.bool_op("@@")(query))
+            .order_by(
+                func.ts_rank_cd(Library.search_vector, query).desc(), Library.view_count.desc()
+            )
+            .limit(limit)
+        )
+
+        try:
+            async with async_session() as session:
+                rows = await session.execute(stmt)
+        except Exception:
+            return None
+        return [{"id": doc_id, "name": name} for doc_id, name in rows]
+
+    async def get_index_stats(self) -> dict[str, Any] | None:
+        from app.models.library import Library
+
+        try:
+            async with async_session() as session:
+                size_bytes = await session.scalar(
+                    text("SELECT pg_relation_size(to_regclass(:index))"),
+                    {"index": self.index_name},
+                )
+                if size_bytes is None:
+                    return {"exists": False, "doc_count": 0}
+
+                doc_count = await session.scalar(
+                    select(func.count())  # pylint: disable=E1102
+                    .select_from(Library)
+                    .where(Library.approved == True)  # noqa: E712
+                )
+        except Exception:
+            return None
+
+        return {
+            "exists": True,
+            "index": self.index_name,
+            "doc_count": doc_count,
+            "size_bytes": size_bytes,
+            "size_mb": round(size_bytes / (1024 * 1024), 2),
+        }
+
+    async def close(self) -> None:
+        """Nothing to release; sessions come from the application's engine."""
@@ -0,0 +1,135 @@
+import contextlib
+import math
+import time
+from typing import Any
+
+import redis.asyncio as redis
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.services.search import search_service
+
+DIRTY_KEY = "popularity:dirty"
+PROCESSING_KEY = "popularity:dirty:processing"
+RECENT_KEY = "popularity:recent"
+PUSHED_KEY = "popularity:pushed"
+
+# Recent-download scores are stored as sum(exp(rate * (t - EPOCH))) so each download is a
+# single ZINCRBY; multiplying by exp(-rate * (now - EPOCH)) yields the decayed count. With a
+# 7 day half-life the exponent stays within float range for roughly 19 years past EPOCH.
+EPOCH = 1704067200  # 2024-01-01T00:00:00Z
+MIN_RECENT = 0.05
+
+
+def _decay_rate() -> float:
+    return math.log(2) / (settings.popularity_half_life_days * 86400)
+
+
+class PopularityService:
+    """
+    Tracks downloads and keeps the search ranking signals current.
+
+    Each download marks the document dirty and bumps its decayed
+    recent-downloads score in Redis. ``sync_search_index`` runs periodically
+    and partially updates only documents whose view count changed or whose
+    decayed score drifted by more than ``popularity_sync_threshold``.
+    """
+
+    def __init__(self) -> None:
+        self._client: redis.Redis | None = None
+
+    async def _get_client(self) -> redis.Redis | None:
+        if not settings.redis_cache_enabled:
+            return None
+
+        if self._client is None:
+            self._client = redis.Redis.from_url(
+                settings.redis_url,
+                encoding="utf-8",
+                decode_responses=True,
+            )
+
+        return self._client
+
+    async def record_download(self, doc_id: int) -> None:
+        client = await self._get_client()
+        if not client:
+            return
+
+        weight = math.exp(_decay_rate() * (time.time() - EPOCH))
+        # Losing a download signal is preferable to failing the download itself.
+        with contextlib.suppress(Exception):
+            async with client.pipeline(transaction=False) as pipe:
+                pipe.sadd(DIRTY_KEY, doc_id)
+                pipe.zincrby(RECENT_KEY, weight, doc_id)
+                await pipe.execute()
+
+    async def sync_search_index(self, session: AsyncSession) -> dict[str, Any]:
+        from app.models.library import Library
+
+        client = await self._get_client()
+        if not client:
+            return {"updated": 0, "failed": 0}
+
+        # Renaming fails when there were no downloads since the last run.
+        with contextlib.suppress(redis.ResponseError):
+            await client.rename(DIRTY_KEY, PROCESSING_KEY)
+        dirty = {int(member) for member in await client.smembers(PROCESSING_KEY)}  # type: ignore[misc]
+
+        decay = math.exp(-_decay_rate() * (time.time() - EPOCH))
+        pushed = await client.hgetall(PUSHED_KEY)  # type: ignore[misc]
+        updates: dict[int, dict[str, float]] = {}
+        new_pushed: dict[str, float] = {}
+        expired: list[str] = []
+
+        for member, score in await client.zrange(RECENT_KEY, 0, -1, withscores=True):
+            value = score * decay
+            previous = float(pushed.get(member, 0.0))
+            if value < MIN_RECENT:
+                expired.append(member)
+                if previous:
+                    updates.setdefault(int(member), {})["recent_downloads"] = 1.0
+                continue
+
+            drift = abs(value - previous) > settings.popularity_sync_threshold * max(previous, 1.0)
+            if int(member) in dirty or drift:
+                # rank_feature values must be positive, so every signal is offset by one.
+                updates.setdefault(int(member), {})["recent_downloads"] = value + 1
+                new_pushed[member] = value
+
+        if dirty:
+            rows = await session.execute(
+                select(Library.id, Library.view_count).where(
+                    Library.id.in_(dirty),
+                    Library.approved == True,  # noqa: E712
+                )
+            )
+            for doc_id, view_count in rows:
+                updates.setdefault(doc_id, {})["popularity"] = view_count + 1
+
+        success, failed = await search_service.update_popularity(updates)
+
+        if updates and not success:
+            # Nothing reached the index; retry these documents on the next run.
+            if dirty:
+                await client.sunionstore(DIRTY_KEY, [DIRTY_KEY, PROCESSING_KEY])  # type: ignore[misc]
+        else:
+            async with client.pipeline(transaction=False) as pipe:
+                if new_pushed:
+                    pipe.hset(PUSHED_KEY, mapping=new_pushed)
+                if expired:
+                    pipe.zrem(RECENT_KEY, *expired)
+                    pipe.hdel(PUSHED_KEY, *expired)
+                await pipe.execute()
+        await client.delete(PROCESSING_KEY)
+
+        return {"updated": success, "failed": failed}
+
+    async def close(self) -> None:
+        if self._client:
+            await self._client.close()
+            self._client = None
+
+
+popularity_service = PopularityService()
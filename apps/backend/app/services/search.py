@@ -1,10 +1,23 @@
+import asyncio
+import base64
+import contextlib
+import json
+import time
+from abc import ABC, abstractmethod
+from collections.abc import Awaitable, Callable
 from datetime import datetime
 from typing import Any, Optional
 
 from opensearchpy import AsyncOpenSearch
+from opensearchpy.exceptions import (
+    ConnectionError as OpenSearchConnectionError,
+    NotFoundError,
+    TransportError,
+)
 from pydantic import BaseModel
 
 from app.core.config import settings
+from app.services.local_search import local_search_index
 
 
 class SearchResult(BaseModel):
@@ -29,18 +42,388 @@ class SearchResponse(BaseModel):
     facets: dict[str, list[dict[str, Any]]] | None = None
 
 
-class SearchService:
-    INDEX_SETTINGS = {
+SEARCH_SORT: list[dict[str, Any]] = [
+    {"_score": {"order": "desc"}},
+    {"uploaded_on": {"order": "desc"}},
+    {"id": {"order": "desc"}},
+]
+
+
+# Query tiers for keyword searches, cheapest first. The tier that answered is
+# returned with the page and carried in its cursor so later pages match.
+SEARCH_TIER_EXACT = "exact"
+SEARCH_TIER_FUZZY = "fuzzy"
+SEARCH_TIER_PHRASE = "phrase"
+SEARCH_TIERS = (SEARCH_TIER_EXACT, SEARCH_TIER_FUZZY, SEARCH_TIER_PHRASE)
+
+# Engines that hand out search cursors; their scores are not comparable.
+SEARCH_ENGINE_OPENSEARCH = "opensearch"
+SEARCH_ENGINE_LOCAL = "local"
+SEARCH_ENGINE_POSTGRES = "postgres"
+SEARCH_ENGINES = (SEARCH_ENGINE_OPENSEARCH, SEARCH_ENGINE_LOCAL, SEARCH_ENGINE_POSTGRES)
+
+
+def encode_search_cursor(
+    sort_values: list[Any],
+    page: int,
+    pit_id: str | None = None,
+    tier: str | None = None,
+    engine: str = SEARCH_ENGINE_OPENSEARCH,
+) -> str:
+    payload: dict[str, Any] = {"after": sort_values, "page": page, "engine": engine}
+    if pit_id:
+        payload["pit"] = pit_id
+    if tier:
+        payload["tier"] = tier
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_search_cursor(cursor: str) -> dict[str, Any]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (ValueError, TypeError) as exc:
+        raise ValueError("Malformed search cursor") from exc
+
+    if (
+        not isinstance(payload, dict)
+        or not isinstance(payload.get("after"), list)
+        or len(payload["after"]) != len(SEARCH_SORT)
+        or not isinstance(payload.get("page"), int)
+        or payload["page"] < 1
+        or payload.get("tier", SEARCH_TIER_FUZZY) not in SEARCH_TIERS
+        or payload.setdefault("engine", SEARCH_ENGINE_OPENSEARCH) not in SEARCH_ENGINES
+    ):
+        raise ValueError("Malformed search cursor")
+    return payload
+
+
+def resume_search_cursor(cursor: str | None, engine: str) -> dict[str, Any] | None:
+    """
+    Decode ``cursor`` for a search on ``engine``.
+
+    Returns None when there is no cursor or another engine handed it out,
+    e.g. OpenSearch before a failover to the local index. Seeking past a
+    score from another engine would skip or repeat hits, so the caller
+    restarts from the first page instead.
+    """
+    if not cursor:
+        return None
+    decoded = decode_search_cursor(cursor)
+    return decoded if decoded["engine"] == engine else None
+
+
+class SearchUnavailableError(Exception):
+    """Raised when the circuit breaker rejects a call to OpenSearch."""
+
+
+class SearchHealth:
+    """
+    Cached availability flag and circuit breaker for the OpenSearch cluster.
+
+    The breaker opens after ``failure_threshold`` consecutive outages and
+    rejects calls until ``reset_timeout`` seconds have passed. It then lets a
+    single half-open probe through; success closes it, failure re-opens it.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int, reset_timeout: float) -> None:
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self.available = True
+        self.consecutive_failures = 0
+        self.opened_at = 0.0
+        self.last_checked = 0.0
+        self._probe_in_flight = False
+
+    def can_attempt(self) -> bool:
+        if self.state == self.CLOSED:
+            return True
+        if self.state == self.OPEN:
+            return time.monotonic() - self.opened_at >= self.reset_timeout
+        return not self._probe_in_flight
+
+    def allow_request(self) -> bool:
+        if self.state == self.CLOSED:
+            return True
+
+        if self.state == self.OPEN:
+            if time.monotonic() - self.opened_at < self.reset_timeout:
+                return False
+            self.state = self.HALF_OPEN
+            self._probe_in_flight = False
+
+        if self._probe_in_flight:
+            return False
+        self._probe_in_flight = True
+        return True
+
+    def record_success(self) -> None:
+        self.state = self.CLOSED
+        self.available = True
+        self.consecutive_failures = 0
+        self._probe_in_flight = False
+
+    def record_failure(self) -> None:
+        self.consecutive_failures += 1
+        self._probe_in_flight = False
+        if self.state == self.HALF_OPEN or self.consecutive_failures >= self.failure_threshold:
+            self.state = self.OPEN
+            self.available = False
+            self.opened_at = time.monotonic()
+
+    def snapshot(self) -> dict[str, Any]:
+        return {
+            "state": self.state,
+            "available": self.available,
+            "consecutive_failures": self.consecutive_failures,
+            "last_checked": self.last_checked,
+        }
+
+
+def is_outage(exc: BaseException) -> bool:
+    if isinstance(exc, (OpenSearchConnectionError, asyncio.TimeoutError)):
+        return True
+    if isinstance(exc, TransportError) and isinstance(exc.status_code, int):
+        return exc.status_code >= 500
+    return False
+
+
+class RefreshCoalescer:
+    """
+    Collapses refresh requests from many writes into at most one explicit
+    ``indices.refresh`` per ``interval`` seconds, covering every index that
+    was written to in the meantime.
+    """
+
+    def __init__(self, interval: float) -> None:
+        self.interval = interval
+        self._pending: set[str] = set()
+        self._last_refresh = 0.0
+        self._task: asyncio.Task[None] | None = None
+
+    def request(self, client: AsyncOpenSearch, index: str) -> None:
+        self._pending.add(index)
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._flush(client))
+
+    async def refresh(self, client: AsyncOpenSearch, index: str) -> None:
+        """Request a refresh of ``index`` and wait until it has been sent."""
+        self.request(client, index)
+        if self._task is not None:
+            await asyncio.shield(self._task)
+
+    async def _flush(self, client: AsyncOpenSearch) -> None:
+        while self._pending:
+            delay = self._last_refresh + self.interval - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+
+            indices, self._pending = sorted(self._pending), set()
+            self._last_refresh = time.monotonic()
+            # A missed refresh only delays visibility until the index's own refresh_interval.
+            with contextlib.suppress(Exception):
+                await client.indices.refresh(
+                    index=",".join(indices), request_timeout=settings.opensearch_write_timeout
+                )
+
+    def cancel(self) -> None:
+        if self._task:
+            self._task.cancel()
+            self._task = None
+
+
+class SearchBackend(ABC):
+    """
+    Abstract base class for search backends.
+
+    Defines what /notes/search, the admin search endpoints and the reindex
+    scripts need from a backend. Results use the same item, cursor and facet
+    shapes whichever backend answers.
+    """
+
+    # Whether approvals and deletions are indexed through the task service, which
+    # also extracts content, rather than written to this backend directly.
+    queue_writes: bool = True
+
+    @property
+    @abstractmethod
+    def index_name(self) -> str:
+        """Name of the index searches are served from."""
+
+    @property
+    @abstractmethod
+    def is_enabled(self) -> bool:
+        """Whether the backend is configured at all."""
+
+    @property
+    @abstractmethod
+    def health(self) -> "SearchHealth":
+        """Availability flag and circuit breaker for the backend."""
+
+    @property
+    def tier_stats(self) -> dict[str, dict[str, float]]:
+        """Searches answered and mean query time per query tier, since startup."""
+        return {}
+
+    @abstractmethod
+    async def is_available(self, refresh: bool = False) -> bool:
+        """Whether the backend can take requests; ``refresh`` forces a fresh check."""
+
+    async def is_searchable(self) -> bool:
+        """Whether ``search_full`` can answer."""
+        return await self.is_available()
+
+    @abstractmethod
+    async def create_index(self) -> bool:
+        """Make sure the index exists."""
+
+    @abstractmethod
+    async def delete_index(self) -> bool:
+        """Drop everything indexed."""
+
+    async def list_index_versions(self) -> list[dict[str, Any]]:
+        """Index versions, newest first, flagged as live and/or building."""
+        return []
+
+    @abstractmethod
+    async def begin_reindex(self) -> str | None:
+        """Prepare a full rebuild and return the index to write it to."""
+
+    @abstractmethod
+    async def promote_index(self, index: str) -> bool:
+        """Serve searches from a rebuilt index."""
+
+    async def rollback_index(self) -> str | None:
+        """Serve searches from the previous index version, if there is one."""
+        return None
+
+    async def cleanup_indices(self) -> list[str]:
+        """Delete index versions beyond the retention limit and return their names."""
+        return []
+
+    @abstractmethod
+    async def index_document(
+        self,
+        doc_id: int,
+        document_name: str,
+        category: str,
+        subject: str,
+        doc_type: str,
+        year: int | None,
+        uploaded_by: str,
+        uploaded_on: datetime,
+        content: str | None = None,
+        file_name: str | None = None,
+        extension: str | None = None,
+        view_count: int = 0,
+        approved: bool = True,
+        category_id: int | None = None,
+        subject_id: int | None = None,
+        type_id: int | None = None,
+        user_id: int | None = None,
+        index: str | None = None,
+        refresh: bool | str | None = None,
+    ) -> bool:
+        """Index or replace one document."""
+
+    @abstractmethod
+    async def bulk_index_documents(
+        self, documents: list[dict[str, Any]], index: str | None = None
+    ) -> tuple[int, int]:
+        """Index many documents and return (succeeded, failed)."""
+
+    async def store_content(self, doc_id: int, content: str) -> bool:
+        """Store text the task service extracted for a note; False if nothing was stored."""
+        return False
+
+    @abstractmethod
+    async def update_popularity(self, updates: dict[int, dict[str, float]]) -> tuple[int, int]:
+        """Apply ranking signal updates and return (succeeded, failed)."""
+
+    @abstractmethod
+    async def delete_document(self, doc_id: int, refresh: bool | str | None = None) -> bool:
+        """Remove one document from the index."""
+
+    async def refresh(self) -> None:
+        """Make every write that has completed so far visible to searches."""
+        return None
+
+    @abstractmethod
+    async def search_full(
+        self,
+        keyword: str | None = None,
+        category: str | None = None,
+        subject: str | None = None,
+        doc_type: str | None = None,
+        year: int | None = None,
+        page: int = 1,
+        size: int = 50,
+        fuzzy: bool = True,
+        cursor: str | None = None,
+        snapshot: bool = False,
+        include_facets: bool = False,
+        include_facet_tree: bool = False,
+        highlight_content: bool = False,
+    ) -> dict[str, Any] | None:
+        """One page of results for /notes/search, or None if the backend cannot answer."""
+
+    @abstractmethod
+    async def get_facet_tree(self) -> dict[str, Any] | None:
+        """Unfiltered category/subject tree with doc type and year counts."""
+
+    @abstractmethod
+    async def highlight(self, doc_ids: list[int], keyword: str) -> dict[int, list[str]] | None:
+        """Content snippets for ``keyword`` in just the given documents."""
+
+    @abstractmethod
+    async def suggest(self, prefix: str, limit: int = 10) -> list[dict[str, Any]] | None:
+        """Document names matching a typed prefix."""
+
+    @abstractmethod
+    async def get_index_stats(self) -> dict[str, Any] | None:
+        """Existence, document count and size of the index."""
+
+    @abstractmethod
+    async def close(self) -> None:
+        """Release connections and background tasks."""
+
+
+class SearchService(SearchBackend):
+    INDEX_SETTINGS: dict[str, Any] = {
         "settings": {
             "number_of_shards": 1,
             "number_of_replicas": 0,
+            "codec": "best_compression",
             "analysis": {
                 "analyzer": {
                     "document_analyzer": {
                         "type": "standard",
                         "stopwords": "_english_",
+                    },
+                    "autocomplete_analyzer": {
+                        "type": "custom",
+                        "tokenizer": "standard",
+                        "filter": ["lowercase", "autocomplete_filter"],
+                    },
+                    "autocomplete_search_analyzer": {
+                        "type": "custom",
+                        "tokenizer": "standard",
+                        "filter": ["lowercase"],
+                    },
+                },
+                "filter": {
+                    "autocomplete_filter": {
+                        "type": "edge_ngram",
+                        "min_gram": 1,
+                        "max_gram": 20,
                     }
-                }
+                },
             },
         },
         "mappings": {
@@ -49,19 +432,34 @@ class SearchService:
                 "document_name": {
                     "type": "text",
                     "analyzer": "document_analyzer",
-                    "fields": {"keyword": {"type": "keyword"}},
+                    "fields": {
+                        "keyword": {"type": "keyword"},
+                        "suggest": {
+                            "type": "text",
+                            "analyzer": "autocomplete_analyzer",
+                            "search_analyzer": "autocomplete_search_analyzer",
+                        },
+                    },
+                    "copy_to": "search_text",
                 },
-                "category": {"type": "keyword"},
-                "subject": {"type": "keyword"},
+                "category": {"type": "keyword", "copy_to": "search_text"},
+                "subject": {"type": "keyword", "copy_to": "search_text"},
                 "doc_type": {"type": "keyword"},
                 "year": {"type": "integer"},
                 "uploaded_by": {"type": "keyword"},
                 "uploaded_on": {"type": "date"},
-                "content": {"type": "text", "analyzer": "document_analyzer"},
+                "content": {
+                    "type": "text",
+                    "analyzer": "document_analyzer",
+                    # Offsets let the fast-vector highlighter skip re-analysing stored text.
+                    "term_vector": "with_positions_offsets",
+                },
                 "search_text": {"type": "text", "analyzer": "document_analyzer"},
                 "file_name": {"type": "keyword"},
                 "extension": {"type": "keyword"},
                 "view_count": {"type": "integer"},
+                "popularity": {"type": "rank_feature"},
+                "recent_downloads": {"type": "rank_feature"},
                 "approved": {"type": "boolean"},
                 "category_id": {"type": "integer"},
                 "subject_id": {"type": "integer"},
@@ -74,14 +472,83 @@ class SearchService:
         },
     }
 
+    # Fields returned in hits; content is never shipped back to the API.
+    SEARCH_SOURCE_FIELDS = [
+        "id",
+        "document_name",
+        "category",
+        "subject",
+        "doc_type",
+        "year",
+        "uploaded_by",
+        "uploaded_on",
+    ]
+    SEARCH_FULL_SOURCE_FIELDS = SEARCH_SOURCE_FIELDS + [
+        "file_name",
+        "extension",
+        "view_count",
+        "approved",
+        "category_id",
+        "subject_id",
+        "type_id",
+        "user_id",
+        "category_name",
+        "subject_name",
+        "doc_type_name",
+    ]
+
+    # Facet name -> (field, bucket count) for the per-query facet counts.
+    FACET_FIELDS = {
+        "categories": ("category", 20),
+        "subjects": ("subject", 50),
+        "doc_types": ("doc_type", 20),
+        "years": ("year", 30),
+    }
+
+    # Unfiltered category -> subject tree plus doc types and years, cached by the API.
+    FACET_TREE_BODY = {
+        "size": 0,
+        "aggs": {
+            "categories": {
+                "terms": {"field": "category", "size": 20},
+                "aggs": {"subjects": {"terms": {"field": "subject", "size": 200}}},
+            },
+            "doc_types": {"terms": {"field": "doc_type", "size": 50}},
+            "years": {"terms": {"field": "year", "size": 50}},
+        },
+    }
+
+    # Applied while a new version is bulk loaded, then replaced by LIVE_INDEX_SETTINGS on promotion.
+    BULK_INDEX_SETTINGS = {"refresh_interval": "-1", "number_of_replicas": 0}
+    LIVE_INDEX_SETTINGS = {
+        "refresh_interval": "1s",
+        "number_of_replicas": INDEX_SETTINGS["settings"]["number_of_replicas"],
+    }
+
     def __init__(self) -> None:
         self._client: AsyncOpenSearch | None = None
         self._connected = False
+        self._health = SearchHealth(
+            failure_threshold=settings.opensearch_breaker_threshold,
+            reset_timeout=settings.opensearch_breaker_reset_seconds,
+        )
+        self._monitor_task: asyncio.Task[None] | None = None
+        self._refresher = RefreshCoalescer(settings.opensearch_refresh_interval_ms / 1000)
+        self._tier_stats: dict[str, dict[str, float]] = {}
 
     @property
     def index_name(self) -> str:
+        """Read alias in front of the versioned physical indices."""
         return settings.opensearch_index
 
+    @property
+    def building_alias(self) -> str:
+        """Alias on a version that is still being built, so live writes reach it too."""
+        return f"{settings.opensearch_index}_building"
+
+    def version_index_name(self, version: int) -> str:
+        return f"{settings.opensearch_index}_v{version}"
+
     @property
     def is_enabled(self) -> bool:
         return settings.opensearch_enabled
@@ -115,30 +582,115 @@ class SearchService:
 
         return self._client
 
-    async def is_available(self) -> bool:
-        if not self.is_enabled:
+    @property
+    def health(self) -> SearchHealth:
+        return self._health
+
+    @property
+    def tier_stats(self) -> dict[str, dict[str, float]]:
+        """Searches answered and mean OpenSearch time per query tier, since startup."""
+        return {
+            tier: {"count": stats["count"], "avg_took_ms": stats["took_ms"] / stats["count"]}
+            for tier, stats in self._tier_stats.items()
+        }
+
+    def _record_tier(self, tier: str, took_ms: int) -> None:
+        stats = self._tier_stats.setdefault(tier, {"count": 0, "took_ms": 0.0})
+        stats["count"] += 1
+        stats["took_ms"] += took_ms
+
+    async def _probe(self) -> bool:
+        client = await self._get_client()
+        if not client:
             return False
+
         try:
-            client = await self._get_client()
-            if client:
-                return await client.ping()
-            return False
+            alive: bool = await client.ping(request_timeout=settings.opensearch_ping_timeout)
         except Exception:
+            alive = False
+
+        self._health.last_checked = time.time()
+        if alive:
+            self._health.record_success()
+        else:
+            self._health.record_failure()
+        return alive
+
+    async def _monitor(self) -> None:
+        while True:
+            await self._probe()
+            await asyncio.sleep(settings.opensearch_health_interval)
+
+    def _ensure_monitor(self) -> None:
+        loop = asyncio.get_running_loop()
+        task = self._monitor_task
+        if task is None or task.done() or task.get_loop() is not loop:
+            self._monitor_task = loop.create_task(self._monitor())
+
+    async def is_available(self, refresh: bool = False) -> bool:
+        """
+        Report whether OpenSearch can take requests.
+
+        Serves the cached health state maintained by a background probe, so
+        the request path never pays for a ping. ``refresh`` forces a
+        synchronous probe for scripts and status pages.
+        """
+        if not self.is_enabled:
             return False
 
-    async def create_index(self, delete_existing: bool = False) -> bool:
+        if refresh:
+            return await self._probe()
+
+        self._ensure_monitor()
+        return self._health.can_attempt()
+
+    async def is_searchable(self) -> bool:
+        """Whether ``search_full`` can answer, from OpenSearch or the local fallback index."""
+        return await self.is_available() or self._use_local()
+
+    def _use_local(self) -> bool:
+        if not local_search_index.is_ready:
+            local_search_index.reload_if_changed()
+        return local_search_index.is_ready
+
+    async def _execute(
+        self, func: Callable[..., Awaitable[Any]], *args: Any, timeout: float, **kwargs: Any
+    ) -> Any:
+        if not self._health.allow_request():
+            raise SearchUnavailableError
+
+        try:
+            result = await func(*args, request_timeout=timeout, **kwargs)
+        except Exception as exc:
+            if is_outage(exc):
+                self._health.record_failure()
+            else:
+                self._health.record_success()
+            raise
+
+        self._health.record_success()
+        return result
+
+    async def create_index(self) -> bool:
+        """
+        Make sure the read alias exists.
+
+        Creates version 1 behind the alias on a fresh cluster. Existing
+        indices are never touched; use ``begin_reindex`` and ``promote_index``
+        to replace them.
+        """
         client = await self._get_client()
         if not client:
             return False
 
         try:
             if await client.indices.exists(index=self.index_name):
-                if delete_existing:
-                    await client.indices.delete(index=self.index_name)
-                else:
-                    return True
+                return True
 
-            await client.indices.create(index=self.index_name, body=self.INDEX_SETTINGS)
+            await client.indices.create(
+                index=self.version_index_name(1),
+                body={**self.INDEX_SETTINGS, "aliases": {self.index_name: {}}},
+            )
             return True
         except Exception:
             return False
@@ -149,12 +701,183 @@ class SearchService:
             return False
 
         try:
-            if await client.indices.exists(index=self.index_name):
+            versions = await self.list_index_versions()
+            for version in versions:
+                await client.indices.delete(index=version["index"])
+            if not versions and await client.indices.exists(index=self.index_name):
                 await client.indices.delete(index=self.index_name)
             return True
         except Exception:
             return False
 
+    async def list_index_versions(self) -> list[dict[str, Any]]:
+        """Versioned physical indices, newest first, flagged as live and/or building."""
+        client = await self._get_client()
+        if not client:
+            return []
+
+        prefix = f"{self.index_name}_v"
+        try:
+            indices = await client.indices.get_alias(index=f"{prefix}*")
+        except NotFoundError:
+            return []
+
+        versions = []
+        for name, info in indices.items():
+            suffix = name[len(prefix) :]
+            if not suffix.isdigit():
+                continue
+            aliases = info.get("aliases", {})
+            versions.append(
+                {
+                    "index": name,
+                    "version": int(suffix),
+                    "live": self.index_name in aliases,
+                    "building": self.building_alias in aliases,
+                }
+            )
+        return sorted(versions, key=lambda version: version["version"], reverse=True)
+
+    async def begin_reindex(self) -> str | None:
+        """
+        Create the next index version for a full rebuild and return its name.
+
+        The new index starts with refresh disabled and no replicas so bulk
+        loading is cheap. It carries the building alias, so approvals and
+        deletions made while it fills are written to it as well as to the
+        live index. Searches keep hitting the live version until
+        ``promote_index`` is called.
+        """
+        client = await self._get_client()
+        if not client:
+            return None
+
+        try:
+            versions = await self.list_index_versions()
+            next_version = versions[0]["version"] + 1 if versions else 1
+            index = self.version_index_name(next_version)
+            await client.indices.create(
+                index=index,
+                body={
+                    "settings": {**self.INDEX_SETTINGS["settings"], **self.BULK_INDEX_SETTINGS},
+                    "mappings": self.INDEX_SETTINGS["mappings"],
+                    "aliases": {self.building_alias: {}},
+                },
+            )
+            return index
+        except Exception:
+            return None
+
+    async def _swap_alias(self, client: AsyncOpenSearch, index: str) -> None:
+        actions: list[dict[str, Any]] = []
+        try:
+            live = await client.indices.get_alias(name=self.index_name)
+        except NotFoundError:
+            live = {}
+            # An index created before aliasing squats on the alias name; replace it in the same call.
+            if await client.indices.exists(index=self.index_name):
+                actions.append({"remove_index": {"index": self.index_name}})
+
+        actions.extend(
+            {"remove": {"index": name, "alias": self.index_name}} for name in live if name != index
+        )
+        actions.append({"add": {"index": index, "alias": self.index_name}})
+        await client.indices.update_aliases(body={"actions": actions})
+
+    async def promote_index(self, index: str) -> bool:
+        """
+        Restore live settings on a rebuilt version and atomically point the
+        read alias at it, then garbage-collect old versions.
+        """
+        client = await self._get_client()
+        if not client:
+            return False
+
+        try:
+            await client.indices.put_settings(index=index, body={"index": self.LIVE_INDEX_SETTINGS})
+            await client.indices.refresh(index=index)
+            await self._swap_alias(client, index)
+            await client.indices.delete_alias(index=index, name=self.building_alias, ignore=404)
+            await self.cleanup_indices()
+            return True
+        except Exception:
+            return False
+
+    async def rollback_index(self) -> str | None:
+        """Point the read alias back at the newest version older than the live one."""
+        client = await self._get_client()
+        if not client:
+            return None
+
+        try:
+            versions = await self.list_index_versions()
+            live = next((version for version in versions if version["live"]), None)
+            if live is None:
+                return None
+
+            previous = next(
+                (
+                    version
+                    for version in versions
+                    if version["version"] < live["version"] and not version["building"]
+                ),
+                None,
+            )
+            if previous is None:
+                return None
+
+            index: str = previous["index"]
+            await self._swap_alias(client, index)
+            return index
+        except Exception:
+            return None
+
+    async def cleanup_indices(self) -> list[str]:
+        """
+        Delete versions older than the live one beyond
+        ``opensearch_index_retain_versions``. Versions still building or newer
+        than the live one are kept.
+        """
+        client = await self._get_client()
+        if not client:
+            return []
+
+        versions = await self.list_index_versions()
+        live = next((version for version in versions if version["live"]), None)
+        if live is None:
+            return []
+
+        older = [
+            version
+            for version in versions
+            if version["version"] < live["version"] and not version["building"]
+        ]
+        stale = older[max(settings.opensearch_index_retain_versions - 1, 0) :]
+        for version in stale:
+            await client.indices.delete(index=version["index"], ignore=404)
+        return [version["index"] for version in stale]
+
+    def _resolve_refresh(self, refresh: bool | str | None) -> tuple[bool | str, bool]:
+        """
+        Map a per-call ``refresh`` (or the configured policy when None) to the
+        value sent with the write, plus whether to queue a coalesced refresh.
+        """
+        if refresh is None:
+            refresh = settings.opensearch_refresh_policy
+        if refresh == "coalesce":
+            return "false", True
+        return refresh, False
+
+    async def _write_targets(self, client: AsyncOpenSearch, index: str | None) -> list[str]:
+        """The explicit ``index`` if given, else the read alias plus any version being built."""
+        if index:
+            return [index]
+
+        targets = [self.index_name]
+        with contextlib.suppress(NotFoundError):
+            targets.extend(await client.indices.get_alias(name=self.building_alias))
+        return targets
+
     async def index_document(
         self,
         doc_id: int,
@@ -174,15 +897,13 @@ class SearchService:
         subject_id: int | None = None,
         type_id: int | None = None,
         user_id: int | None = None,
+        index: str | None = None,
+        refresh: bool | str | None = None,
     ) -> bool:
         client = await self._get_client()
         if not client:
             return False
 
-        search_text = f"{document_name} {subject} {category}"
-        if content:
-            search_text += f" {content[:1000]}"
-
         doc_body = {
             "id": doc_id,
             "document_name": document_name,
@@ -193,10 +914,10 @@ class SearchService:
             "uploaded_by": uploaded_by,
             "uploaded_on": uploaded_on.isoformat(),
             "content": content or "",
-            "search_text": search_text,
             "file_name": file_name or "",
             "extension": extension or "",
             "view_count": view_count,
+            "popularity": view_count + 1,
             "approved": approved,
             "category_id": category_id,
             "subject_id": subject_id,
@@ -207,18 +928,27 @@ class SearchService:
             "doc_type_name": doc_type,
         }
 
+        refresh, coalesce = self._resolve_refresh(refresh)
         try:
-            await client.index(
-                index=self.index_name,
-                id=str(doc_id),
-                body=doc_body,
-                refresh=True,
-            )
+            for target in await self._write_targets(client, index):
+                await self._execute(
+                    client.index,
+                    timeout=settings.opensearch_write_timeout,
+                    index=target,
+                    id=str(doc_id),
+                    body=doc_body,
+                    refresh=refresh,
+                )
+                # Versions being built keep refresh disabled until they are promoted.
+                if coalesce and target == self.index_name:
+                    self._refresher.request(client, target)
             return True
         except Exception:
             return False
 
-    async def bulk_index_documents(self, documents: list[dict[str, Any]]) -> tuple[int, int]:
+    async def bulk_index_documents(
+        self, documents: list[dict[str, Any]], index: str | None = None
+    ) -> tuple[int, int]:
         from opensearchpy.helpers import async_bulk
 
         client = await self._get_client()
@@ -227,10 +957,7 @@ class SearchService:
 
         actions = []
         for doc in documents:
-            search_text = f"{doc['document_name']} {doc['subject']} {doc['category']}"
             content = doc.get("content", "")
-            if content:
-                search_text += f" {content[:1000]}"
 
             uploaded_on = doc["uploaded_on"]
             if isinstance(uploaded_on, datetime):
@@ -238,7 +965,7 @@ class SearchService:
 
             actions.append(
                 {
-                    "_index": self.index_name,
+                    "_index": index or self.index_name,
                     "_id": str(doc["id"]),
                     "_source": {
                         "id": doc["id"],
@@ -250,10 +977,10 @@ class SearchService:
                         "uploaded_by": doc["uploaded_by"],
                         "uploaded_on": uploaded_on,
                         "content": content,
-                        "search_text": search_text,
                         "file_name": doc.get("file_name", ""),
                         "extension": doc.get("extension", ""),
                         "view_count": doc.get("view_count", 0),
+                        "popularity": doc.get("view_count", 0) + 1,
                         "approved": doc.get("approved", True),
                         "category_id": doc.get("category_id"),
                         "subject_id": doc.get("subject_id"),
@@ -267,51 +994,146 @@ class SearchService:
             )
 
         try:
-            success, failed = await async_bulk(
+            success, failed = await self._execute(
+                async_bulk,
                 client,
                 actions,
+                timeout=settings.opensearch_bulk_timeout,
                 chunk_size=100,
-                request_timeout=60,
             )
             return success, len(failed) if isinstance(failed, list) else 0
         except Exception:
             return 0, len(documents)
 
-    async def delete_document(self, doc_id: int) -> bool:
+    async def update_popularity(self, updates: dict[int, dict[str, float]]) -> tuple[int, int]:
+        """
+        Partially update the ranking signals of the given documents.
+
+        Sends bulk ``update`` actions carrying only the changed fields, so no
+        content is re-extracted. The rank_feature mapping is added first for
+        indices created before those fields existed. Documents missing from
+        the index count as failures.
+        """
+        from opensearchpy.helpers import async_bulk
+
+        client = await self._get_client()
+        if not client or not updates:
+            return 0, len(updates)
+
+        mapping = {
+            "properties": {
+                "popularity": {"type": "rank_feature"},
+                "recent_downloads": {"type": "rank_feature"},
+            }
+        }
+
+        try:
+            targets = await self._write_targets(client, None)
+            success = failed = 0
+            for target in targets:
+                await self._execute(
+                    client.indices.put_mapping,
+                    timeout=settings.opensearch_write_timeout,
+                    index=target,
+                    body=mapping,
+                )
+                actions = [
+                    {"_op_type": "update", "_index": target, "_id": str(doc_id), "doc": fields}
+                    for doc_id, fields in updates.items()
+                ]
+                ok, errors = await self._execute(
+                    async_bulk,
+                    client,
+                    actions,
+                    timeout=settings.opensearch_bulk_timeout,
+                    chunk_size=500,
+                    raise_on_error=False,
+                )
+                if target == self.index_name:
+                    success = ok
+                    failed = len(errors) if isinstance(errors, list) else errors
+            return success, failed
+        except Exception:
+            return 0, len(updates)
+
+    async def delete_document(self, doc_id: int, refresh: bool | str | None = None) -> bool:
         client = await self._get_client()
         if not client:
             return False
 
+        refresh, coalesce = self._resolve_refresh(refresh)
         try:
-            await client.delete(
-                index=self.index_name,
+            live, *building = await self._write_targets(client, None)
+            await self._execute(
+                client.delete,
+                timeout=settings.opensearch_write_timeout,
+                index=live,
                 id=str(doc_id),
-                refresh=True,
+                refresh=refresh,
             )
+            for target in building:
+                await self._execute(
+                    client.delete,
+                    timeout=settings.opensearch_write_timeout,
+                    index=target,
+                    id=str(doc_id),
+                    refresh=refresh,
+                    ignore=404,
+                )
+            if coalesce:
+                self._refresher.request(client, live)
             return True
         except Exception:
             return False
 
-    async def search(
-        self,
-        keyword: str | None = None,
-        category: str | None = None,
-        subject: str | None = None,
-        doc_type: str | None = None,
-        year: int | None = None,
-        page: int = 1,
-        size: int = 50,
-        fuzzy: bool = True,
-        include_facets: bool = False,
-    ) -> SearchResponse | None:
+    async def refresh(self) -> None:
         client = await self._get_client()
         if not client:
-            return None
+            return
+        # Shares the coalesced refresh, so warming after many writes costs one refresh.
+        await self._refresher.refresh(client, self.index_name)
 
+    def _build_query(
+        self,
+        keyword: str | None,
+        category: str | None,
+        subject: str | None,
+        doc_type: str | None,
+        year: int | None,
+        fuzzy: bool,
+        exact: bool = False,
+    ) -> dict[str, Any]:
         must_clauses: list[dict[str, Any]] = []
         filter_clauses: list[dict[str, Any]] = []
 
-        if keyword:
+        if keyword and exact:
+            # Cheap first tier: names and taxonomy only, no fuzziness and no content field.
+            must_clauses.append(
+                {
+                    "bool": {
+                        "should": [
+                            {
+                                "multi_match": {
+                                    "query": keyword,
+                                    "fields": ["document_name^3", "search_text^2"],
+                                    "type": "best_fields",
+                                    "operator": "and",
+                                }
+                            },
+                            {
+                                "multi_match": {
+                                    "query": keyword,
+                                    "fields": ["document_name^3", "search_text^2"],
+                                    "type": "phrase",
+                                    "boost": 2,
+                                }
+                            },
+                        ],
+                        "minimum_should_match": 1,
+                    }
+                }
+            )
+        elif keyword:
             if fuzzy:
                 must_clauses.append(
                     {
@@ -351,23 +1173,137 @@ class SearchService:
         if year:
             filter_clauses.append({"term": {"year": year}})
 
-        query: dict[str, Any] = {"bool": {}}
+        query: dict[str, Any] = {"bool": {"filter": filter_clauses}}
         if must_clauses:
             query["bool"]["must"] = must_clauses
-        if filter_clauses:
-            query["bool"]["filter"] = filter_clauses
+            # Popularity only reorders keyword matches; browsing stays newest first.
+            query["bool"]["should"] = [
+                {
+                    "rank_feature": {
+                        "field": "popularity",
+                        "saturation": {},
+                        "boost": settings.search_popularity_boost,
+                    }
+                },
+                {
+                    "rank_feature": {
+                        "field": "recent_downloads",
+                        "saturation": {},
+                        "boost": settings.search_recent_downloads_boost,
+                    }
+                },
+            ]
+            query["bool"]["minimum_should_match"] = 0
+        return query
+
+    def _build_facet_body(
+        self,
+        keyword: str | None,
+        category: str | None,
+        subject: str | None,
+        doc_type: str | None,
+        year: int | None,
+        fuzzy: bool,
+        exact: bool = False,
+    ) -> dict[str, Any]:
+        """
+        Facet counts for the current search. Each facet applies every filter
+        except its own, so the counts show what selecting another value of
+        that facet would return.
+        """
+        selected = {"category": category, "subject": subject, "doc_type": doc_type, "year": year}
+        aggs = {}
+        for name, (field, size) in self.FACET_FIELDS.items():
+            others = [
+                {"term": {other: value}}
+                for other, value in selected.items()
+                if value and other != field
+            ]
+            aggs[name] = {
+                "filter": {"bool": {"filter": others}},
+                "aggs": {"values": {"terms": {"field": field, "size": size}}},
+            }
+
+        return {
+            "size": 0,
+            "query": self._build_query(keyword, None, None, None, None, fuzzy, exact),
+            "aggs": aggs,
+        }
+
+    @staticmethod
+    def _parse_facets(result: dict[str, Any] | None) -> dict[str, Any] | None:
+        if not result or "aggregations" not in result:
+            return None
+        return {
+            name: [
+                {"key": bucket["key"], "count": bucket["doc_count"]}
+                for bucket in agg["values"]["buckets"]
+            ]
+            for name, agg in result["aggregations"].items()
+        }
+
+    @staticmethod
+    def _parse_facet_tree(result: dict[str, Any] | None) -> dict[str, Any] | None:
+        if not result or "aggregations" not in result:
+            return None
+        aggs = result["aggregations"]
+        return {
+            "categories": [
+                {
+                    "key": bucket["key"],
+                    "count": bucket["doc_count"],
+                    "subjects": [
+                        {"key": subject["key"], "count": subject["doc_count"]}
+                        for subject in bucket["subjects"]["buckets"]
+                    ],
+                }
+                for bucket in aggs["categories"]["buckets"]
+            ],
+            "doc_types": [
+                {"key": bucket["key"], "count": bucket["doc_count"]}
+                for bucket in aggs["doc_types"]["buckets"]
+            ],
+            "years": [
+                {"key": bucket["key"], "count": bucket["doc_count"]}
+                for bucket in aggs["years"]["buckets"]
+            ],
+        }
 
-        if not must_clauses and not filter_clauses:
-            query = {"match_all": {}}
+    async def _open_pit(self, client: AsyncOpenSearch) -> str | None:
+        try:
+            result = await client.create_pit(
+                index=self.index_name,
+                params={"keep_alive": settings.opensearch_pit_keep_alive},
+            )
+            pit_id: str | None = result.get("pit_id")
+            return pit_id
+        except Exception:
+            return None
+
+    async def search(
+        self,
+        keyword: str | None = None,
+        category: str | None = None,
+        subject: str | None = None,
+        doc_type: str | None = None,
+        year: int | None = None,
+        page: int = 1,
+        size: int = 50,
+        fuzzy: bool = True,
+        include_facets: bool = False,
+    ) -> SearchResponse | None:
+        client = await self._get_client()
+        if not client:
+            return None
+
+        query = self._build_query(keyword, category, subject, doc_type, year, fuzzy)
 
         body: dict[str, Any] = {
             "query": query,
+            "_source": self.SEARCH_SOURCE_FIELDS,
             "from": (page - 1) * size,
             "size": size,
-            "sort": [
-                {"_score": {"order": "desc"}},
-                {"uploaded_on": {"order": "desc"}},
-            ],
+            "sort": SEARCH_SORT,
             "highlight": {
                 "fields": {
                     "document_name": {"number_of_fragments": 0},
@@ -380,14 +1316,17 @@ class SearchService:
 
         if include_facets:
             body["aggs"] = {
-                "categories": {"terms": {"field": "category", "size": 20}},
-                "subjects": {"terms": {"field": "subject", "size": 50}},
-                "doc_types": {"terms": {"field": "doc_type", "size": 20}},
-                "years": {"terms": {"field": "year", "size": 30}},
+                name: {"terms": {"field": field, "size": size}}
+                for name, (field, size) in self.FACET_FIELDS.items()
             }
 
         try:
-            result = await client.search(index=self.index_name, body=body)
+            result = await self._execute(
+                client.search,
+                timeout=settings.opensearch_search_timeout,
+                index=self.index_name,
+                body=body,
+            )
 
             total = result["hits"]["total"]["value"]
             pages = (total + size - 1) // size if size > 0 else 0
@@ -448,84 +1387,183 @@ class SearchService:
         page: int = 1,
         size: int = 50,
         fuzzy: bool = True,
+        cursor: str | None = None,
+        snapshot: bool = False,
+        include_facets: bool = False,
+        include_facet_tree: bool = False,
+        highlight_content: bool = False,
     ) -> dict[str, Any] | None:
-        client = await self._get_client()
-        if not client:
-            return None
-
-        must_clauses: list[dict[str, Any]] = []
-        filter_clauses: list[dict[str, Any]] = []
+        """
+        Search for the public /notes/search endpoint.
+
+        Only document names are highlighted unless ``highlight_content`` is
+        set; content snippets for the rows on screen come from ``highlight``.
+
+        ``include_facets`` adds per-facet counts for the current filters and
+        ``include_facet_tree`` the unfiltered category/subject tree. Both are
+        fetched in the same _msearch round trip as the hits.
+
+        Fuzzy keyword searches first run an exact query on names and taxonomy
+        and fall back to the fuzzy full-text query only when that returns fewer
+        than ``search_exact_min_hits`` results. ``tier`` reports which one answered.
+        """
+
+        def search_local() -> dict[str, Any] | None:
+            if not self._use_local():
+                return None
+            return local_search_index.search(
+                keyword, category, subject, doc_type, year, page, size, cursor
+            )
 
-        if keyword:
-            if fuzzy:
-                must_clauses.append(
-                    {
-                        "multi_match": {
-                            "query": keyword,
-                            "fields": [
-                                "document_name^3",
-                                "search_text^2",
-                                "content",
-                            ],
-                            "fuzziness": "AUTO",
-                            "prefix_length": 2,
-                        }
-                    }
-                )
+        client = await self._get_client()
+        if not client or not self._health.can_attempt():
+            return search_local()
+
+        pit_id: str | None = None
+        search_after: list[Any] | None = None
+        tier: str | None = None
+        decoded = resume_search_cursor(cursor, SEARCH_ENGINE_OPENSEARCH)
+        if cursor and decoded is None:
+            # Handed out by the local index while OpenSearch was down.
+            cursor, page = None, 1
+        if decoded:
+            search_after = decoded["after"]
+            page = decoded["page"]
+            pit_id = decoded.get("pit")
+            tier = decoded.get("tier", SEARCH_TIER_FUZZY)
+        elif snapshot:
+            pit_id = await self._open_pit(client)
+
+        # Later pages stay on the tier that answered the first one.
+        tiers: list[str | None]
+        if not keyword:
+            tiers = [None]
+        elif not fuzzy:
+            tiers = [SEARCH_TIER_PHRASE]
+        elif cursor:
+            tiers = [tier]
+        elif settings.search_exact_min_hits > 0:
+            tiers = [SEARCH_TIER_EXACT, SEARCH_TIER_FUZZY]
+        else:
+            tiers = [SEARCH_TIER_FUZZY]
+
+        highlight_fields: dict[str, Any] = {"document_name": {"number_of_fragments": 0}}
+        if highlight_content:
+            highlight_fields["content"] = {"fragment_size": 150, "number_of_fragments": 3}
+
+        def build_body(tier: str | None) -> dict[str, Any]:
+            body: dict[str, Any] = {
+                "query": self._build_query(
+                    keyword, category, subject, doc_type, year, fuzzy, tier == SEARCH_TIER_EXACT
+                ),
+                "_source": self.SEARCH_FULL_SOURCE_FIELDS,
+                "size": size,
+                "sort": SEARCH_SORT,
+                "highlight": {
+                    "fields": highlight_fields,
+                    "pre_tags": ["<mark>"],
+                    "post_tags": ["</mark>"],
+                },
+            }
+            if search_after is not None:
+                body["search_after"] = search_after
             else:
-                must_clauses.append(
-                    {
-                        "multi_match": {
-                            "query": keyword,
-                            "fields": [
-                                "document_name^3",
-                                "search_text^2",
-                                "content",
-                            ],
-                            "type": "phrase",
-                        }
-                    }
+                body["from"] = (page - 1) * size
+            if pit_id:
+                body["pit"] = {"id": pit_id, "keep_alive": settings.opensearch_pit_keep_alive}
+            return body
+
+        async def run_search(
+            body: dict[str, Any], extra_bodies: list[tuple[str, dict[str, Any]]]
+        ) -> tuple[dict[str, Any], dict[str, Any]]:
+            nonlocal pit_id
+            extras: dict[str, Any] = {}
+            if extra_bodies and not pit_id:
+                searches: list[dict[str, Any]] = [{"index": self.index_name}, body]
+                for _, extra_body in extra_bodies:
+                    searches += [{"index": self.index_name}, extra_body]
+                response = await self._execute(
+                    client.msearch, timeout=settings.opensearch_search_timeout, body=searches
+                )
+                result, *extra_results = response["responses"]
+                if "error" in result:
+                    raise TransportError(result.get("status", 500), "msearch", result["error"])
+                extras = {
+                    name: extra_result
+                    for (name, _), extra_result in zip(extra_bodies, extra_results, strict=True)
+                    if "error" not in extra_result
+                }
+                return result, extras
+
+            search_kwargs: dict[str, Any] = {} if pit_id else {"index": self.index_name}
+            try:
+                result = await self._execute(
+                    client.search,
+                    timeout=settings.opensearch_search_timeout,
+                    body=body,
+                    **search_kwargs,
+                )
+            except Exception as exc:
+                if not pit_id or is_outage(exc) or isinstance(exc, SearchUnavailableError):
+                    raise
+                # The point-in-time has expired; continue over the live index instead.
+                body.pop("pit")
+                pit_id = None
+                result = await self._execute(
+                    client.search,
+                    timeout=settings.opensearch_search_timeout,
+                    index=self.index_name,
+                    body=body,
                 )
 
-        if category:
-            filter_clauses.append({"term": {"category": category}})
-        if subject:
-            filter_clauses.append({"term": {"subject": subject}})
-        if doc_type:
-            filter_clauses.append({"term": {"doc_type": doc_type}})
-        if year:
-            filter_clauses.append({"term": {"year": year}})
-
-        query: dict[str, Any] = {"bool": {"filter": filter_clauses}}
-        if must_clauses:
-            query["bool"]["must"] = must_clauses
-
-        body: dict[str, Any] = {
-            "query": query,
-            "from": (page - 1) * size,
-            "size": size,
-            "sort": [
-                {"_score": {"order": "desc"}},
-                {"uploaded_on": {"order": "desc"}},
-            ],
-            "highlight": {
-                "fields": {
-                    "document_name": {"number_of_fragments": 0},
-                    "content": {"fragment_size": 150, "number_of_fragments": 3},
-                },
-                "pre_tags": ["<mark>"],
-                "post_tags": ["</mark>"],
-            },
-        }
+            # Point-in-time searches cannot share an _msearch with the index-wide facets.
+            for name, extra_body in extra_bodies:
+                with contextlib.suppress(Exception):
+                    extras[name] = await self._execute(
+                        client.search,
+                        timeout=settings.opensearch_search_timeout,
+                        index=self.index_name,
+                        body=extra_body,
+                    )
+            return result, extras
 
         try:
-            result = await client.search(index=self.index_name, body=body)
+            extras: dict[str, Any] = {}
+            took = 0
+            for tier in tiers:
+                extra_bodies: list[tuple[str, dict[str, Any]]] = []
+                if include_facets:
+                    facet_body = self._build_facet_body(
+                        keyword, category, subject, doc_type, year, fuzzy, tier == SEARCH_TIER_EXACT
+                    )
+                    extra_bodies.append(("facets", facet_body))
+                if include_facet_tree and "facet_tree" not in extras:
+                    extra_bodies.append(("facet_tree", self.FACET_TREE_BODY))
+
+                result, tier_extras = await run_search(build_body(tier), extra_bodies)
+                extras.update(tier_extras)
+                took += result.get("took", 0)
+                if (
+                    tier != tiers[-1]
+                    and result["hits"]["total"]["value"] < settings.search_exact_min_hits
+                ):
+                    continue
+                break
+            if tier:
+                self._record_tier(tier, took)
 
             total = result["hits"]["total"]["value"]
             pages = (total + size - 1) // size if size > 0 else 0
+            hits = result["hits"]["hits"]
+
+            next_cursor = None
+            if hits and len(hits) == size and page * size < total:
+                next_cursor = encode_search_cursor(
+                    hits[-1]["sort"], page + 1, result.get("pit_id") or pit_id, tier
+                )
 
             items = []
-            for hit in result["hits"]["hits"]:
+            for hit in hits:
                 source = hit["_source"]
                 uploaded_on = source.get("uploaded_on")
                 if isinstance(uploaded_on, str):
@@ -580,13 +1618,126 @@ class SearchService:
                     }
                 )
 
-            return {
+            response = {
                 "items": items,
                 "total": total,
                 "page": page,
                 "pages": pages,
                 "size": size,
+                "next_cursor": next_cursor,
+                "tier": tier,
             }
+            if include_facets:
+                response["facets"] = self._parse_facets(extras.get("facets"))
+            if include_facet_tree:
+                response["facet_tree"] = self._parse_facet_tree(extras.get("facet_tree"))
+            return response
+        except Exception:
+            return search_local()
+
+    async def get_facet_tree(self) -> dict[str, Any] | None:
+        """Unfiltered facet tree on its own, for pages served from cache without it."""
+        client = await self._get_client()
+        if not client:
+            return None
+
+        try:
+            result = await self._execute(
+                client.search,
+                timeout=settings.opensearch_search_timeout,
+                index=self.index_name,
+                body=self.FACET_TREE_BODY,
+            )
+        except Exception:
+            return None
+        return self._parse_facet_tree(result)
+
+    async def highlight(self, doc_ids: list[int], keyword: str) -> dict[int, list[str]] | None:
+        """
+        Content snippets for ``keyword`` in just the given documents.
+
+        Uses the fast-vector highlighter over the stored term vectors. Indices
+        built before ``content`` had term vectors fall back to the default
+        highlighter. Returns None when OpenSearch cannot be queried.
+        """
+        client = await self._get_client()
+        if not client or not doc_ids:
+            return None
+
+        content_highlight: dict[str, Any] = {
+            "type": "fvh",
+            "fragment_size": 150,
+            "number_of_fragments": 3,
+        }
+        body = {
+            "query": {"ids": {"values": [str(doc_id) for doc_id in doc_ids]}},
+            "_source": False,
+            "size": len(doc_ids),
+            "highlight": {
+                "fields": {"content": content_highlight},
+                "highlight_query": {
+                    "match": {
+                        "content": {"query": keyword, "fuzziness": "AUTO", "prefix_length": 2}
+                    }
+                },
+                "pre_tags": ["<mark>"],
+                "post_tags": ["</mark>"],
+            },
+        }
+
+        try:
+            try:
+                result = await self._execute(
+                    client.search,
+                    timeout=settings.opensearch_search_timeout,
+                    index=self.index_name,
+                    body=body,
+                )
+            except TransportError as exc:
+                if exc.status_code != 400:
+                    raise
+                content_highlight.pop("type")
+                result = await self._execute(
+                    client.search,
+                    timeout=settings.opensearch_search_timeout,
+                    index=self.index_name,
+                    body=body,
+                )
+        except Exception:
+            return None
+
+        highlights: dict[int, list[str]] = {doc_id: [] for doc_id in doc_ids}
+        for hit in result["hits"]["hits"]:
+            highlights[int(hit["_id"])] = hit.get("highlight", {}).get("content", [])
+        return highlights
+
+    async def suggest(self, prefix: str, limit: int = 10) -> list[dict[str, Any]] | None:
+        client = await self._get_client()
+        if not client:
+            return None
+
+        body = {
+            "query": {
+                "match": {
+                    "document_name.suggest": {"query": prefix, "operator": "and"},
+                }
+            },
+            "_source": ["id", "document_name"],
+            "size": limit,
+            "sort": [{"_score": {"order": "desc"}}, {"view_count": {"order": "desc"}}],
+        }
+
+        try:
+            result = await self._execute(
+                client.search,
+                timeout=settings.opensearch_search_timeout,
+                index=self.index_name,
+                body=body,
+            )
+            return [
+                {"id": hit["_source"]["id"], "name": hit["_source"]["document_name"]}
+                for hit in result["hits"]["hits"]
+            ]
         except Exception:
             return None
 
@@ -600,11 +1751,12 @@ class SearchService:
                 return {"exists": False, "doc_count": 0}
 
             stats = await client.indices.stats(index=self.index_name)
-            doc_count = stats["indices"][self.index_name]["primaries"]["docs"]["count"]
-            size_bytes = stats["indices"][self.index_name]["primaries"]["store"]["size_in_bytes"]
+            doc_count = stats["_all"]["primaries"]["docs"]["count"]
+            size_bytes = stats["_all"]["primaries"]["store"]["size_in_bytes"]
 
             return {
                 "exists": True,
+                "index": next(iter(stats["indices"]), None),
                 "doc_count": doc_count,
                 "size_bytes": size_bytes,
                 "size_mb": round(size_bytes / (1024 * 1024), 2),
@@ -613,9 +1765,31 @@ class SearchService:
             return None
 
     async def close(self) -> None:
+        self._refresher.cancel()
+        if self._monitor_task:
+            self._monitor_task.cancel()
+            self._monitor_task = None
         if self._client:
             await self._client.close()
             self._client = None
 
 
-search_service = SearchService()
+def get_search_service() -> SearchBackend:
+    """
+    Factory function to get the configured search backend.
+
+    Returns the OpenSearch service unless ``search_backend`` selects the
+    Postgres full-text backend.
+
+    Returns:
+        SearchBackend: Concrete search backend instance.
+    """
+    if settings.search_backend == "postgres":
+        from app.services.pg_search import PostgresSearchBackend
+
+        return PostgresSearchBackend()
+    return SearchService()
+
+
+# Singleton instance
+search_service = get_search_service()
@@ -0,0 +1,176 @@
+import asyncio
+import contextlib
+import json
+from typing import Any
+
+from app.core.config import settings
+from app.schemas.library import SearchPageSchema
+from app.services.cache import (
+    cache_service,
+    canonicalize_keyword,
+    generate_search_cache_key,
+    pack_cache_value,
+)
+from app.services.search import search_service
+from app.services.task_client import task_client
+
+
+async def search_page_cache_key(
+    keyword: str | None = None,
+    category: str | None = None,
+    subject: str | None = None,
+    doc_type: str | None = None,
+    year: int | None = None,
+    page: int = 1,
+    size: int = 50,
+    cursor: str | None = None,
+    facets: bool = False,
+) -> str:
+    generation = await cache_service.get_search_generation(category, subject, facets)
+    return generate_search_cache_key(
+        keyword=keyword,
+        category=category,
+        subject=subject,
+        doc_type=doc_type,
+        year=year,
+        page=page,
+        size=size,
+        cursor=cursor,
+        facets=facets,
+        generation=generation,
+    )
+
+
+def render_search_page(search_result: dict[str, Any]) -> tuple[bytes, int]:
+    """
+    Validate a search_full page once and pack it for the cache with its TTL.
+
+    The facet tree is left out; it has its own cache entry and is spliced
+    into each response. Pages without hits get the short negative TTL.
+    """
+    rendered = SearchPageSchema.model_validate(search_result).model_dump_json(
+        exclude={"facet_tree"}
+    )
+    ttl = settings.redis_cache_ttl
+    if not search_result.get("items"):
+        ttl = settings.redis_empty_cache_ttl
+    return pack_cache_value(rendered.encode()), ttl
+
+
+class SearchCacheWarmer:
+    """
+    Re-populates cached pages for the most looked-up search queries.
+
+    Runs at startup and after note changes, but only once the change is
+    searchable: queued index and delete tasks are polled together until they
+    finish, then the index is refreshed. Bulk reindexes are not warmed. Queries come from the per-query lookup stats,
+    searched with the keyword as a user last typed it, and are loaded through
+    ``get_or_load``, so pages that are still cached or being loaded by another
+    worker are skipped. At most ``cache_warm_concurrency`` searches run at a time.
+    """
+
+    def __init__(self) -> None:
+        self._task: asyncio.Task[None] | None = None
+        self._rerun = False
+        self._task_ids: set[str] = set()
+
+    def schedule(self, *task_ids: str | None) -> None:
+        """Warm once the given queued index or delete tasks have landed their changes."""
+        if not cache_service.is_enabled or settings.cache_warm_top_n <= 0:
+            return
+
+        self._task_ids.update(task_id for task_id in task_ids if task_id)
+
+        if self._task is not None and not self._task.done():
+            # Invalidations during a run are picked up by one more run afterwards.
+            self._rerun = True
+            return
+
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def _run(self) -> None:
+        while True:
+            self._rerun = False
+            task_ids, self._task_ids = self._task_ids, set()
+            with contextlib.suppress(Exception):
+                if await self._wait_until_searchable(task_ids):
+                    await self.warm()
+            if not self._rerun:
+                return
+
+    async def _wait_until_searchable(self, task_ids: set[str]) -> bool:
+        """Wait for the queued tasks and a refresh; False if a task failed or timed out."""
+        # Polled together, so all of them share one cache_warm_task_timeout.
+        landed = await asyncio.gather(
+            *(
+                task_client.wait_for_task(task_id, settings.cache_warm_task_timeout)
+                for task_id in task_ids
+            )
+        )
+        if not all(landed):
+            # Warming now could cache pages without the change; lookups load them instead.
+            return False
+        await search_service.refresh()
+        return True
+
+    async def warm(self) -> int:
+        """Load every missing top query page and return how many were loaded."""
+        if not await search_service.is_searchable():
+            return 0
+
+        stats = await cache_service.get_query_stats(settings.cache_warm_top_n)
+        semaphore = asyncio.Semaphore(settings.cache_warm_concurrency)
+        loaded = 0
+
+        async def warm_query(query: str, typed_keyword: str | None) -> None:
+            params = json.loads(query)
+            keyword = typed_keyword or params.get("keyword")
+            facets = params.get("facets", False)
+
+            async def load_page() -> tuple[bytes, int] | None:
+                nonlocal loaded
+                # Searched exactly as /notes/search searches this keyword.
+                search_result = await search_service.search_full(
+                    keyword=canonicalize_keyword(keyword) or None,
+                    category=params.get("category"),
+                    subject=params.get("subject"),
+                    doc_type=params.get("doc_type"),
+                    year=params.get("year"),
+                    page=params.get("page", 1),
+                    size=params.get("size", 50),
+                    fuzzy=True,
+                    include_facets=facets,
+                )
+                if not search_result:
+                    return None
+                loaded += 1
+                return render_search_page(search_result)
+
+            async with semaphore:
+                key = await search_page_cache_key(
+                    keyword=keyword,
+                    category=params.get("category"),
+                    subject=params.get("subject"),
+                    doc_type=params.get("doc_type"),
+                    year=params.get("year"),
+                    page=params.get("page", 1),
+                    size=params.get("size", 50),
+                    facets=facets,
+                )
+                await cache_service.get_or_load(key, load_page)
+
+        await asyncio.gather(
+            *(warm_query(stat["query"], stat.get("keyword")) for stat in stats),
+            return_exceptions=True,
+        )
+        return loaded
+
+    async def close(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+
+
+search_cache_warmer = SearchCacheWarmer()
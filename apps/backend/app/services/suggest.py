@@ -0,0 +1,263 @@
+import asyncio
+import contextlib
+import heapq
+import re
+import time
+from bisect import bisect_left, insort
+from collections.abc import Iterable
+from typing import Any
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+
+MAX_KEY_LENGTH = 64
+# Prefixes up to this long match the largest slices, so their top ids are cached.
+CACHED_PREFIX_LENGTH = 3
+_WORD_RE = re.compile(r"\w+")
+_SPACE_RE = re.compile(r"\s+")
+
+
+def normalize_prefix(text: str) -> str:
+    return _SPACE_RE.sub(" ", text.casefold()).strip()[:MAX_KEY_LENGTH]
+
+
+def word_start_keys(text: str) -> set[str]:
+    """Every suffix of ``text`` that starts at a word, so "phys" matches "H2 Physics"."""
+    normalized = normalize_prefix(text)
+    return {normalized[match.start() :] for match in _WORD_RE.finditer(normalized)}
+
+
+def _prefix_end(prefix: str) -> str:
+    """Smallest string above every string that starts with ``prefix``."""
+    return prefix[:-1] + chr(ord(prefix[-1]) + 1)
+
+
+class PrefixIndex:
+    """
+    Sorted word-start keys mapping prefixes to weighted item ids.
+
+    Each word-start suffix of a label is one ``(key, id)`` entry of a sorted
+    list, so the entries matching a prefix are one slice found with ``bisect``.
+    Short prefixes match the largest slices, so their top ``top_k`` ids are
+    cached and kept current on insert; a removal drops the caches it touches
+    and they are recomputed on the next lookup.
+    """
+
+    def __init__(self, top_k: int = 10) -> None:
+        self.top_k = top_k
+        self._entries: list[tuple[str, int]] = []
+        self._labels: dict[int, str] = {}
+        self._weights: dict[int, int] = {}
+        self._keys: dict[int, set[str]] = {}
+        self._top: dict[str, list[int]] = {}
+
+    @classmethod
+    def build(cls, items: Iterable[tuple[int, str, int]], top_k: int = 10) -> "PrefixIndex":
+        """Index ``(id, label, weight)`` items with a single sort."""
+        index = cls(top_k)
+        for item_id, label, weight in items:
+            keys = word_start_keys(label)
+            index._labels[item_id] = label
+            index._weights[item_id] = weight
+            index._keys[item_id] = keys
+            index._entries.extend((key, item_id) for key in keys)
+        index._entries.sort()
+        return index
+
+    def __len__(self) -> int:
+        return len(self._labels)
+
+    def label(self, item_id: int) -> str:
+        return self._labels[item_id]
+
+    def _rank(self, item_id: int) -> tuple[int, int]:
+        return self._weights[item_id], -item_id
+
+    def add(self, item_id: int, label: str, weight: int = 0) -> None:
+        if item_id in self._labels:
+            self.remove(item_id)
+
+        keys = word_start_keys(label)
+        self._labels[item_id] = label
+        self._weights[item_id] = weight
+        self._keys[item_id] = keys
+
+        for key in keys:
+            insort(self._entries, (key, item_id))
+            for length in range(min(len(key), CACHED_PREFIX_LENGTH) + 1):
+                top = self._top.get(key[:length])
+                if top is not None and item_id not in top:
+                    top.append(item_id)
+                    top.sort(key=self._rank, reverse=True)
+                    del top[self.top_k :]
+
+    def remove(self, item_id: int) -> None:
+        if item_id not in self._labels:
+            return
+
+        for key in self._keys.pop(item_id):
+            position = bisect_left(self._entries, (key, item_id))
+            del self._entries[position]
+            for length in range(min(len(key), CACHED_PREFIX_LENGTH) + 1):
+                top = self._top.get(key[:length])
+                if top is not None and item_id in top:
+                    del self._top[key[:length]]
+
+        del self._labels[item_id]
+        del self._weights[item_id]
+
+    def search(self, prefix: str, limit: int) -> list[int]:
+        prefix = normalize_prefix(prefix)
+        if len(prefix) > CACHED_PREFIX_LENGTH:
+            return self._collect(prefix)[:limit]
+
+        top = self._top.get(prefix)
+        if top is None:
+            top = self._top[prefix] = self._collect(prefix)
+        return top[:limit]
+
+    def _collect(self, prefix: str) -> list[int]:
+        start = bisect_left(self._entries, (prefix,))
+        end = bisect_left(self._entries, (_prefix_end(prefix),)) if prefix else len(self._entries)
+        ids = {item_id for _, item_id in self._entries[start:end]}
+        return heapq.nlargest(self.top_k, ids, key=self._rank)
+
+
+class SuggestService:
+    """
+    In-process typeahead over approved document names and subjects.
+
+    Loaded from Postgres at startup, kept current by the approval, update and
+    deletion endpoints, and rebuilt in the background once older than
+    ``suggest_rebuild_interval`` seconds so other workers converge. Loads run
+    one at a time under a lock and build the indexes off the event loop.
+    """
+
+    def __init__(self) -> None:
+        self.documents = PrefixIndex(top_k=settings.suggest_max_results)
+        self.subjects = PrefixIndex(top_k=settings.suggest_max_results)
+        self._subject_categories: dict[int, str] = {}
+        self._loaded_at: float | None = None
+        self._lock = asyncio.Lock()
+        self._task: asyncio.Task[None] | None = None
+        # Document changes made while a load runs, replayed onto its result.
+        self._changes: list[tuple[int, str | None, int]] | None = None
+
+    @property
+    def is_loaded(self) -> bool:
+        return self._loaded_at is not None
+
+    async def ensure_loaded(self, session: AsyncSession) -> None:
+        if self._loaded_at is None:
+            async with self._lock:
+                if self._loaded_at is None:
+                    await self._load(session)
+        elif time.monotonic() - self._loaded_at > settings.suggest_rebuild_interval:
+            self.schedule_load()
+
+    def schedule_load(self) -> None:
+        """Rebuild both indexes in a background task with its own session."""
+        if self._task is not None and not self._task.done():
+            return
+        self._task = asyncio.get_running_loop().create_task(self._reload())
+
+    async def _reload(self) -> None:
+        from app.db.database import async_session
+
+        # Without a database the current indexes keep serving until the next attempt.
+        with contextlib.suppress(Exception):
+            async with async_session() as session:
+                await self.load(session)
+
+    async def load(self, session: AsyncSession) -> None:
+        async with self._lock:
+            await self._load(session)
+
+    async def _load(self, session: AsyncSession) -> None:
+        from app.models.categories import CategoryLevel, Subjects
+        from app.models.library import Library
+
+        self._changes = []
+        try:
+            documents = (
+                await session.execute(
+                    select(Library.id, Library.document_name, Library.view_count).where(
+                        Library.approved == True  # noqa: E712
+                    )
+                )
+            ).all()
+            subject_rows = (
+                await session.execute(
+                    select(Subjects.id, Subjects.name, CategoryLevel.name).join(
+                        CategoryLevel, Subjects.category_id == CategoryLevel.id
+                    )
+                )
+            ).all()
+
+            top_k = settings.suggest_max_results
+            document_index = await asyncio.to_thread(
+                PrefixIndex.build,
+                [(doc_id, name, views) for doc_id, name, views in documents],
+                top_k,
+            )
+            subject_index = PrefixIndex.build(
+                ((subject_id, name, 0) for subject_id, name, _ in subject_rows), top_k
+            )
+
+            for doc_id, document_name, view_count in self._changes:
+                if document_name is None:
+                    document_index.remove(doc_id)
+                else:
+                    document_index.add(doc_id, document_name, view_count)
+
+            self.documents = document_index
+            self.subjects = subject_index
+            self._subject_categories = {
+                subject_id: category_name for subject_id, _, category_name in subject_rows
+            }
+            self._loaded_at = time.monotonic()
+        finally:
+            self._changes = None
+
+    def invalidate(self) -> None:
+        self._loaded_at = None
+
+    def add_document(self, doc_id: int, document_name: str, view_count: int = 0) -> None:
+        if self._changes is not None:
+            self._changes.append((doc_id, document_name, view_count))
+        if self.is_loaded:
+            self.documents.add(doc_id, document_name, view_count)
+
+    def remove_document(self, doc_id: int) -> None:
+        if self._changes is not None:
+            self._changes.append((doc_id, None, 0))
+        if self.is_loaded:
+            self.documents.remove(doc_id)
+
+    def suggest_documents(self, prefix: str, limit: int) -> list[dict[str, Any]]:
+        return [
+            {"id": doc_id, "name": self.documents.label(doc_id)}
+            for doc_id in self.documents.search(prefix, limit)
+        ]
+
+    def suggest_subjects(self, prefix: str, limit: int) -> list[dict[str, Any]]:
+        return [
+            {
+                "id": subject_id,
+                "name": self.subjects.label(subject_id),
+                "category": self._subject_categories.get(subject_id),
+            }
+            for subject_id in self.subjects.search(prefix, limit)
+        ]
+
+    async def close(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+
+
+suggest_service = SuggestService()
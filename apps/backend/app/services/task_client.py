@@ -1,4 +1,6 @@
+import asyncio
 import logging
+import time
 from datetime import datetime
 
 import httpx
@@ -29,6 +31,8 @@ class TaskClient:
         subject_id: int | None = None,
         type_id: int | None = None,
         user_id: int | None = None,
+        index: str | None = None,
+        refresh: str | None = None,
     ) -> str | None:
         try:
             async with httpx.AsyncClient(timeout=10.0) as client:
@@ -50,6 +54,8 @@ class TaskClient:
                         "subject_id": subject_id,
                         "type_id": type_id,
                         "user_id": user_id,
+                        "index": index,
+                        "refresh": refresh,
                     },
                 )
                 if response.status_code == 200:
@@ -68,12 +74,12 @@ class TaskClient:
             logger.error(f"Unexpected error queuing index task: {e}")
             return None
 
-    async def trigger_delete_document(self, doc_id: int) -> str | None:
+    async def trigger_delete_document(self, doc_id: int, refresh: str | None = None) -> str | None:
         try:
             async with httpx.AsyncClient(timeout=10.0) as client:
                 response = await client.post(
                     f"{self._base_url}/tasks/delete-document",
-                    json={"doc_id": doc_id},
+                    json={"doc_id": doc_id, "refresh": refresh},
                 )
                 if response.status_code == 200:
                     result = response.json()
@@ -93,11 +99,56 @@ class TaskClient:
             logger.error(f"Unexpected error queuing delete task: {e}")
             return None
 
+    async def trigger_extract_content(
+        self, doc_id: int, file_name: str, extension: str
+    ) -> str | None:
+        try:
+            async with httpx.AsyncClient(timeout=10.0) as client:
+                response = await client.post(
+                    f"{self._base_url}/tasks/extract-document-content",
+                    json={"doc_id": doc_id, "file_name": file_name, "extension": extension},
+                )
+                if response.status_code == 200:
+                    task_id: str | None = response.json().get("task_id")
+                    logger.info(f"Queued content extraction for document {doc_id}: {task_id}")
+                    return task_id
+                else:
+                    logger.error(
+                        f"Failed to queue content extraction for document {doc_id}: "
+                        f"{response.status_code}"
+                    )
+                    return None
+        except httpx.RequestError as e:
+            logger.warning(f"Task service unavailable, could not queue content extraction: {e}")
+            return None
+        except Exception as e:
+            logger.error(f"Unexpected error queuing content extraction: {e}")
+            return None
+
+    async def wait_for_task(self, task_id: str, timeout: float) -> bool:
+        """Poll a queued task until it finishes; True if it succeeded within ``timeout`` seconds."""
+        deadline = time.monotonic() + timeout
+        try:
+            async with httpx.AsyncClient(timeout=10.0) as client:
+                while time.monotonic() < deadline:
+                    response = await client.get(f"{self._base_url}/tasks/{task_id}/status")
+                    if response.status_code == 200:
+                        status = response.json().get("status")
+                        if status == "SUCCESS":
+                            return True
+                        if status in ("FAILURE", "REVOKED"):
+                            return False
+                    await asyncio.sleep(settings.cache_warm_poll_interval)
+        except httpx.RequestError as e:
+            logger.warning(f"Task service unavailable, could not check task {task_id}: {e}")
+        return False
+
     async def trigger_bulk_index(
         self,
         documents: list[dict],
-    ) -> tuple[int, int]:
-        queued = 0
+    ) -> tuple[list[str], int]:
+        """Queue an index task per document and return the queued task ids and failure count."""
+        task_ids = []
         failed = 0
         for doc in documents:
             task_id = await self.trigger_index_document(
@@ -116,12 +167,13 @@ class TaskClient:
                 subject_id=doc.get("subject_id"),
                 type_id=doc.get("type_id"),
                 user_id=doc.get("user_id"),
+                index=doc.get("index"),
             )
             if task_id:
-                queued += 1
+                task_ids.append(task_id)
             else:
                 failed += 1
-        return queued, failed
+        return task_ids, failed
 
 
 task_client = TaskClient()
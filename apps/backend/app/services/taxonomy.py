@@ -0,0 +1,208 @@
+import asyncio
+import hashlib
+from typing import Any
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.services.cache import cache_service, dump_json
+
+# Bumped on every taxonomy write; workers holding an older snapshot reload on their next read.
+TAXONOMY_GENERATION_KEY = "cache:gen:taxonomy"
+
+
+def make_etag(body: bytes) -> str:
+    """Strong ETag derived from the payload, so every worker agrees on it."""
+    return f'"{hashlib.sha256(body).hexdigest()[:32]}"'
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    # If-None-Match uses the weak comparison, so a W/ prefix still matches.
+    candidates = {candidate.strip().removeprefix("W/") for candidate in if_none_match.split(",")}
+    return "*" in candidates or etag in candidates
+
+
+class TaxonomySnapshot:
+    """
+    Categories, subjects and document types as loaded at one generation.
+
+    Items are plain dicts shaped like their response schemas, keyed by id in
+    id order. Rendered JSON payloads and their ETags are built on first use
+    and kept for the life of the snapshot. Filters by name resolve to ids
+    here, and listings attach the related objects with ``hydrate``.
+    """
+
+    __slots__ = (
+        "categories",
+        "document_types",
+        "subjects",
+        "_category_ids",
+        "_document_type_ids",
+        "_payloads",
+        "_subject_ids",
+    )
+
+    def __init__(
+        self,
+        categories: dict[int, dict[str, Any]],
+        subjects: dict[int, dict[str, Any]],
+        document_types: dict[int, dict[str, Any]],
+    ) -> None:
+        self.categories = categories
+        self.subjects = subjects
+        self.document_types = document_types
+        self._payloads: dict[str, tuple[bytes, str]] = {}
+        self._category_ids = {item["name"]: item_id for item_id, item in categories.items()}
+        self._document_type_ids = {
+            item["name"]: item_id for item_id, item in document_types.items()
+        }
+        # Subject names are only unique within a category.
+        self._subject_ids: dict[str, list[int]] = {}
+        for item_id, item in subjects.items():
+            self._subject_ids.setdefault(item["name"], []).append(item_id)
+
+    def category_id(self, name: str) -> int | None:
+        return self._category_ids.get(name)
+
+    def document_type_id(self, name: str) -> int | None:
+        return self._document_type_ids.get(name)
+
+    def subject_ids(self, name: str) -> list[int]:
+        return self._subject_ids.get(name, [])
+
+    def can_hydrate(self, note: dict[str, Any]) -> bool:
+        return (
+            note["category"] in self.categories
+            and note["subject"] in self.subjects
+            and note["type"] in self.document_types
+        )
+
+    def hydrate(self, note: dict[str, Any]) -> dict[str, Any]:
+        """Attach doc_category, doc_subject and doc_type to a note row keyed by column."""
+        note["doc_category"] = self.categories[note["category"]]
+        note["doc_subject"] = self.subjects[note["subject"]]
+        note["doc_type"] = self.document_types[note["type"]]
+        return note
+
+    def _render(self, key: str, items: list[dict[str, Any]]) -> tuple[bytes, str]:
+        payload = self._payloads.get(key)
+        if payload is None:
+            body = dump_json(items)
+            payload = (body, make_etag(body))
+            self._payloads[key] = payload
+        return payload
+
+    def categories_payload(self) -> tuple[bytes, str]:
+        return self._render("categories", list(self.categories.values()))
+
+    def document_types_payload(self) -> tuple[bytes, str]:
+        return self._render("document_types", list(self.document_types.values()))
+
+    def subjects_payload(self, category_id: int | None = None) -> tuple[bytes, str]:
+        if category_id is None:
+            return self._render("subjects", list(self.subjects.values()))
+
+        items = [
+            subject
+            for subject in self.subjects.values()
+            if subject["category"]["id"] == category_id
+        ]
+        if category_id not in self.categories:
+            # Not memoised, so arbitrary ids cannot grow the snapshot.
+            body = dump_json(items)
+            return body, make_etag(body)
+        return self._render(f"subjects:{category_id}", items)
+
+
+class TaxonomyService:
+    """
+    In-process snapshot of the taxonomy lookup tables.
+
+    Loaded at startup and rebuilt by the taxonomy write endpoints, which also
+    bump a generation counter in Redis. Reads compare the snapshot against
+    that counter through the L1 cache, so other workers reload within moments
+    of a write and steady-state reads never reach Postgres.
+    """
+
+    def __init__(self) -> None:
+        self._snapshot: TaxonomySnapshot | None = None
+        self._generation: str | None = None
+        self._lock = asyncio.Lock()
+
+    @property
+    def is_loaded(self) -> bool:
+        return self._snapshot is not None
+
+    async def get(self, session: AsyncSession) -> TaxonomySnapshot:
+        generation = await cache_service.get_generation(TAXONOMY_GENERATION_KEY)
+        if self._snapshot is not None and generation == self._generation:
+            return self._snapshot
+
+        async with self._lock:
+            snapshot = self._snapshot
+            if snapshot is None or generation != self._generation:
+                snapshot = await self.load(session, generation)
+            return snapshot
+
+    async def load(self, session: AsyncSession, generation: str | None = None) -> TaxonomySnapshot:
+        from app.models.categories import CategoryLevel, DocumentTypes, Subjects
+
+        # Read the generation first so a write racing this load triggers another one.
+        if generation is None:
+            generation = await cache_service.get_generation(TAXONOMY_GENERATION_KEY)
+
+        category_rows = await session.execute(
+            select(CategoryLevel.id, CategoryLevel.name).order_by(CategoryLevel.id)
+        )
+        categories = {
+            category_id: {"name": name, "id": category_id} for category_id, name in category_rows
+        }
+
+        subject_rows = await session.execute(
+            select(Subjects.id, Subjects.name, Subjects.category_id).order_by(Subjects.id)
+        )
+        subjects = {
+            subject_id: {"id": subject_id, "name": name, "category": categories[category_id]}
+            for subject_id, name, category_id in subject_rows
+            if category_id in categories
+        }
+
+        type_rows = await session.execute(
+            select(DocumentTypes.id, DocumentTypes.name).order_by(DocumentTypes.id)
+        )
+        document_types = {
+            doc_type_id: {"name": name, "id": doc_type_id} for doc_type_id, name in type_rows
+        }
+
+        self._snapshot = TaxonomySnapshot(categories, subjects, document_types)
+        self._generation = generation
+        return self._snapshot
+
+    async def hydrate(
+        self, session: AsyncSession, notes: list[dict[str, Any]]
+    ) -> list[dict[str, Any]]:
+        """
+        Attach taxonomy objects to note rows from the snapshot.
+
+        A row referring to an id the snapshot has not seen yet means it is
+        older than the data, so it is reloaded once before hydrating.
+        """
+        snapshot = await self.get(session)
+        if not all(snapshot.can_hydrate(note) for note in notes):
+            snapshot = await self.load(session)
+        return [snapshot.hydrate(note) for note in notes]
+
+    async def rebuild(self, session: AsyncSession) -> TaxonomySnapshot:
+        """Reload after a taxonomy write and make every other worker reload too."""
+        generation = await cache_service.bump_generation(TAXONOMY_GENERATION_KEY)
+        return await self.load(session, generation)
+
+    def reset(self) -> None:
+        """Drop this worker's snapshot; the next read reloads it."""
+        self._snapshot = None
+        self._generation = None
+
+
+taxonomy_service = TaxonomyService()
@@ -306,6 +306,40 @@ def test_get_subjects_from_category(
     assert resp[0]["name"] == second_sub_cat_1["name"]
 
 
+def test_get_category_level_not_modified(
+    test_client_developer: TestClient,
+    test_category_insert_gce_a_level,
+    test_category_insert_gce_o_level,
+):
+    payload = jsonable_encoder(test_category_insert_gce_a_level)
+    response = test_client_developer.post(CATEGORY_LEVEL_URL, json=payload)
+    assert response.status_code == status.HTTP_200_OK
+
+    response = test_client_developer.get(GET_ALL_CATEGORY_LEVEL_URL)
+    assert response.status_code == status.HTTP_200_OK
+    assert len(response.json()) == 1
+    etag = response.headers["etag"]
+    assert "cache-control" in response.headers
+
+    response = test_client_developer.get(
+        GET_ALL_CATEGORY_LEVEL_URL, headers={"If-None-Match": etag}
+    )
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+    assert response.headers["etag"] == etag
+    assert response.content == b""
+
+    payload = jsonable_encoder(test_category_insert_gce_o_level)
+    response = test_client_developer.post(CATEGORY_LEVEL_URL, json=payload)
+    assert response.status_code == status.HTTP_200_OK
+
+    response = test_client_developer.get(
+        GET_ALL_CATEGORY_LEVEL_URL, headers={"If-None-Match": etag}
+    )
+    assert response.status_code == status.HTTP_200_OK
+    assert len(response.json()) == 2
+    assert response.headers["etag"] != etag
+
+
 # ----------------- UPDATE TESTS -----------------
 
 
@@ -1,6 +1,7 @@
 from fastapi.testclient import TestClient
 
 from app import schemas
+from app.services import suggest_service
 
 CREATE_URL = "/auth/create"
 GET_USER_URL = "/auth/get"
@@ -11,6 +12,8 @@ CATEGORY_LEVEL_URL = "/category"
 NOTE_URL = "/note"
 GET_APPROVED_NOTES_URL = "/notes/approved"
 GET_PENDING_NOTES_URL = "/notes/pending"
+SEARCH_NOTES_URL = "/notes/search"
+SUGGEST_NOTES_URL = "/notes/suggest"
 ADMIN_APPROVE_NOTES_URL = "/admin/approve"
 
 
@@ -559,3 +562,32 @@ def test_create_note_with_zip_file_not_developer(
 #     assert (
 #         first_updated_note_response["document_name"] == test_note_insert.document_name
 #     )
+
+
+# -------- SEARCH TEST --------
+
+
+def test_get_approved_notes_with_malformed_cursor(test_not_logged_in_client: TestClient):
+    response = test_not_logged_in_client.get(
+        GET_APPROVED_NOTES_URL, params={"cursor": "not-a-cursor"}
+    )
+
+    assert response.status_code == 400
+
+
+def test_search_notes_with_malformed_cursor(test_not_logged_in_client: TestClient):
+    response = test_not_logged_in_client.get(SEARCH_NOTES_URL, params={"cursor": "not-a-cursor"})
+
+    assert response.status_code == 400
+
+
+def test_suggest_notes_returns_subject_completions(
+    create_doc_type_subject_education_level,
+    test_not_logged_in_client: TestClient,
+):
+    suggest_service.invalidate()
+
+    response = test_not_logged_in_client.get(SUGGEST_NOTES_URL, params={"q": "math"})
+
+    assert response.status_code == 200
+    assert [subject["name"] for subject in response.json()["subjects"]] == ["Mathematics"]
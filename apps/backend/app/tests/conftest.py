@@ -32,6 +32,7 @@ from app.schemas.auth import (
     AccountUpdatePasswordSchema,
     AuthSchema,
 )
+from app.services import taxonomy_service
 
 GCE_A_LEVEL_SUBJECT = "GCE 'A' Levels"
 GCE_O_LEVEL_SUBJECT = "GCE 'O' Levels"
@@ -68,6 +69,7 @@ async def init_models(event_loop):
         await conn.run_sync(Base.metadata.drop_all)
         await conn.run_sync(Base.metadata.create_all)
     app.dependency_overrides[get_session] = override_session
+    taxonomy_service.reset()
 
 
 async def override_session() -> AsyncGenerator[AsyncSession, None]:
@@ -371,6 +373,8 @@ async def create_education_level(event_loop):
     session = TestingSessionLocal()
     session.add(new_category)
     await session.commit()
+    # Rows added behind the API's back; reload the taxonomy snapshot on next read.
+    taxonomy_service.reset()
     yield new_category
 
 
@@ -382,6 +386,7 @@ async def create_two_education_level(event_loop):
     session.add(new_category_1)
     session.add(new_category_2)
     await session.commit()
+    taxonomy_service.reset()
     yield new_category_1, new_category_2
 
 
@@ -403,6 +408,7 @@ async def create_doc_type_subject_education_level(event_loop):
     session.add(new_subject)
     session.add(new_category)
     await session.commit()
+    taxonomy_service.reset()
 
     yield new_valid_user, new_doc_type, new_subject, new_category
 
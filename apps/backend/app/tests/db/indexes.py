@@ -0,0 +1,69 @@
+from sqlalchemy import false, select, text
+
+from app.db.database import async_session as TestingSessionLocal, engine as test_engine
+from app.models.auth import Account
+from app.models.library import SEARCH_TEXT_CONFIG, Library
+
+
+async def explain(stmt) -> str:
+    """
+    Plan for ``stmt`` with sequential scans disabled.
+
+    The test tables are tiny, so this shows whether an index can serve the query at all.
+    """
+    sql = stmt.compile(dialect=test_engine.dialect, compile_kwargs={"literal_binds": True})
+    async with TestingSessionLocal() as session:
+        connection = await session.connection()
+        await connection.exec_driver_sql("SET LOCAL enable_seqscan = off")
+        result = await connection.exec_driver_sql(f"EXPLAIN {sql}")
+        plan = "\n".join(row[0] for row in result)
+        await session.rollback()
+    return plan
+
+
+async def test_document_name_keyword_uses_trigram_index():
+    plan = await explain(
+        select(Library.id).where(
+            Library.approved == False,  # noqa: E712
+            Library.document_name_contains("physics"),
+        )
+    )
+
+    assert "ix_library_document_name_trgm" in plan
+
+
+async def test_document_name_keyword_with_wildcards_uses_trigram_index():
+    plan = await explain(select(Library.id).where(Library.document_name_contains("50%_off")))
+
+    assert "ix_library_document_name_trgm" in plan
+
+
+async def test_username_lookup_uses_upper_username_index():
+    plan = await explain(select(Account).where(Account.username_matches("TestUser")))
+
+    assert "username_case_sensitive_index" in plan
+
+
+async def test_full_text_search_uses_search_vector_index():
+    # Spelled out because REGCONFIG arguments cannot be rendered as literal binds.
+    query = text(f"websearch_to_tsquery('{SEARCH_TEXT_CONFIG}', 'physics waves')")
+    plan = await explain(select(Library.id).where(Library.search_vector.bool_op("@@")(query)))
+
+    assert "ix_library_search_vector" in plan
+
+
+async def test_moderation_queue_uses_pending_partial_index():
+    plan = await explain(
+        select(Library.id)
+        .where(Library.approved == false())
+        .order_by(Library.uploaded_on.desc(), Library.id.desc())
+        .limit(20)
+    )
+
+    assert "ix_library_pending_uploaded_on" in plan
+
+
+async def test_reset_password_token_lookup_uses_token_index():
+    plan = await explain(select(Account).where(Account.reset_password_token == "a" * 32))
+
+    assert "ix_account_reset_password_token" in plan
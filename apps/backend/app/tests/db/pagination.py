@@ -0,0 +1,93 @@
+import datetime
+
+from app.db.database import async_session as TestingSessionLocal
+from app.models.auth import Account
+from app.models.library import Library
+
+PAGE_SIZE = 3
+
+
+async def follow_cursors(fetch) -> list[list[int]]:
+    """Item ids on each page, starting from page 1 and following next_cursor to the end."""
+    pages = []
+    cursor = None
+    while True:
+        result = await fetch(cursor)
+        pages.append(result)
+        cursor = result["next_cursor"]
+        if cursor is None:
+            return [[item["id"] for item in page["items"]] for page in pages]
+
+
+async def add_notes(session, user, doc_type, subject, category) -> None:
+    # Several notes share an upload time, so pages must break ties on id.
+    base = datetime.datetime(2024, 1, 1)
+    for index in range(8):
+        session.add(
+            Library(
+                category=category.id,
+                subject=subject.id,
+                type=doc_type.id,
+                document_name=f"Note {index}",
+                file_name=f"note-{index}.pdf",
+                uploaded_by=user.user_id,
+                extension=".pdf",
+                approved=True,
+                uploaded_on=base + datetime.timedelta(days=index // 3),
+            )
+        )
+    await session.commit()
+
+
+async def test_note_cursors_match_offset_pages(create_doc_type_subject_education_level):
+    async with TestingSessionLocal() as session:
+        await add_notes(session, *create_doc_type_subject_education_level)
+
+        listed = {}
+        for order in ("desc", "asc"):
+
+            async def fetch(cursor, page=1, order=order):
+                return await Library.get_all_notes_paginated(
+                    session, page, PAGE_SIZE, sorted_by_upload_date=order, cursor=cursor
+                )
+
+            cursor_pages = await follow_cursors(fetch)
+            offset_pages = [
+                [note["id"] for note in (await fetch(None, page))["items"]] for page in (1, 2, 3)
+            ]
+
+            assert cursor_pages == offset_pages
+            listed[order] = [note_id for page in cursor_pages for note_id in page]
+            assert len(listed[order]) == len(set(listed[order])) == 8
+
+        assert listed["asc"] == listed["desc"][::-1]
+
+
+async def test_user_cursors_match_offset_pages(create_doc_type_subject_education_level):
+    async with TestingSessionLocal() as session:
+        for index, role in enumerate((1, 3, 2, 1, 3, 1, 2)):
+            session.add(
+                Account(
+                    username=f"user{index}",
+                    password="123456",
+                    role=role,
+                    email=f"user{index}@gmail.com",
+                )
+            )
+        await session.commit()
+
+        async def fetch(cursor, page=1):
+            result = await Account.get_all_users_paginated(session, page, PAGE_SIZE, cursor=cursor)
+            return {
+                **result,
+                "items": [{"id": user.user_id, "role": user.role} for user in result["items"]],
+            }
+
+        cursor_pages = await follow_cursors(fetch)
+        offset_pages = [
+            [user["id"] for user in (await fetch(None, page))["items"]] for page in (1, 2, 3)
+        ]
+
+        assert cursor_pages == offset_pages
+        ids = [user_id for page in cursor_pages for user_id in page]
+        assert len(ids) == len(set(ids)) == 8
@@ -0,0 +1,153 @@
+import datetime
+
+from app.db.database import async_session as TestingSessionLocal
+from app.models.categories import CategoryLevel, Subjects
+from app.models.library import Library
+from app.services import pg_search
+from app.services.pg_search import PostgresSearchBackend
+
+# (name, subject, year); every name matches "kinematics".
+NOTES = [
+    ("Kinematics Notes", "Mathematics", 2023),
+    ("Kinematics Practice", "Physics", 2023),
+    ("Kinematics Revision", "Physics", 2024),
+    ("Kinematics Summary", "Physics", 2024),
+    ("Kinematics Worked Examples", "Mathematics", 2024),
+]
+
+
+async def add_notes(user, doc_type, subject, category) -> dict[int, tuple[str, str, int]]:
+    async with TestingSessionLocal() as session:
+        physics = Subjects(name="Physics", category_id=category.id)
+        session.add(physics)
+        await session.commit()
+        subjects = {"Mathematics": subject.id, "Physics": physics.id}
+
+        notes = {}
+        for index, (name, subject_name, year) in enumerate(NOTES):
+            note = Library(
+                category=category.id,
+                subject=subjects[subject_name],
+                type=doc_type.id,
+                document_name=name,
+                file_name=f"note-{index}.pdf",
+                uploaded_by=user.user_id,
+                extension=".pdf",
+                year=year,
+                approved=True,
+                # Two notes share an upload time, so cursors must break ties on id.
+                uploaded_on=datetime.datetime(2024, 1, 1 + min(index, 3)),
+            )
+            session.add(note)
+            await session.commit()
+            notes[note.id] = (name, subject_name, year)
+
+    backend = PostgresSearchBackend()
+    await backend.bulk_index_documents(
+        [
+            {"id": note_id, "category": category.name, "subject": subject_name}
+            for note_id, (_, subject_name, _) in notes.items()
+        ]
+    )
+    return notes
+
+
+async def follow_cursors(backend, **params) -> list[list[int]]:
+    pages = []
+    cursor = None
+    while True:
+        result = await backend.search_full(size=2, cursor=cursor, **params)
+        pages.append([item["id"] for item in result["items"]])
+        cursor = result["next_cursor"]
+        if cursor is None:
+            return pages
+
+
+async def test_search_cursors_match_offset_pages(create_doc_type_subject_education_level):
+    notes = await add_notes(*create_doc_type_subject_education_level)
+    backend = PostgresSearchBackend()
+
+    for params in ({"keyword": "kinematics"}, {}):
+        cursor_pages = await follow_cursors(backend, **params)
+        offset_pages = [
+            [
+                item["id"]
+                for item in (await backend.search_full(size=2, page=page, **params))["items"]
+            ]
+            for page in (1, 2, 3)
+        ]
+
+        assert cursor_pages == offset_pages
+        ids = [note_id for page in cursor_pages for note_id in page]
+        assert sorted(ids) == sorted(notes)
+
+
+async def test_facets_ignore_their_own_filter(create_doc_type_subject_education_level):
+    await add_notes(*create_doc_type_subject_education_level)
+    backend = PostgresSearchBackend()
+
+    result = await backend.search_full(
+        keyword="kinematics", subject="Physics", year=2024, include_facets=True
+    )
+
+    assert result["total"] == 2
+    facets = result["facets"]
+    assert facets["subjects"] == [
+        {"key": "Physics", "count": 2},
+        {"key": "Mathematics", "count": 1},
+    ]
+    assert facets["years"] == [{"key": 2024, "count": 2}, {"key": 2023, "count": 1}]
+    assert facets["doc_types"] == [{"key": "Notes", "count": 2}]
+
+
+async def test_renames_rewrite_the_indexed_taxonomy(create_doc_type_subject_education_level):
+    notes = await add_notes(*create_doc_type_subject_education_level)
+    _, _, subject, category = create_doc_type_subject_education_level
+    backend = PostgresSearchBackend()
+
+    async with TestingSessionLocal() as session:
+        await Subjects.update(session, subject.id, {"name": "Calculus"})
+        await CategoryLevel.update(session, category.id, {"name": "Baccalaureate"})
+
+    maths = sorted(note_id for note_id, note in notes.items() if note[1] == "Mathematics")
+    result = await backend.search_full(keyword="calculus")
+    assert sorted(item["id"] for item in result["items"]) == maths
+    result = await backend.search_full(keyword="baccalaureate")
+    assert sorted(item["id"] for item in result["items"]) == sorted(notes)
+
+
+async def test_approval_stores_content_extracted_by_the_task_service(
+    create_doc_type_subject_education_level, monkeypatch
+):
+    notes = await add_notes(*create_doc_type_subject_education_level)
+    note_id, (name, subject_name, year) = next(iter(notes.items()))
+    _, _, _, category = create_doc_type_subject_education_level
+    queued = []
+
+    async def trigger_extract_content(doc_id, file_name, extension):
+        queued.append(doc_id)
+        return f"extract-{doc_id}"
+
+    monkeypatch.setattr(pg_search.task_client, "trigger_extract_content", trigger_extract_content)
+
+    backend = PostgresSearchBackend()
+    assert await backend.index_document(
+        doc_id=note_id,
+        document_name=name,
+        category=category.name,
+        subject=subject_name,
+        doc_type="Notes",
+        year=year,
+        uploaded_by="testuser",
+        uploaded_on=datetime.datetime(2024, 1, 1),
+        file_name="note-0.pdf",
+        extension=".pdf",
+    )
+    assert queued == [note_id]
+
+    # The extraction task posts the text back once it has run.
+    assert await backend.store_content(note_id, "projectile motion under gravity")
+    assert not await backend.store_content(-1, "projectile motion under gravity")
+
+    result = await backend.search_full(keyword="projectile")
+    assert [item["id"] for item in result["items"]] == [note_id]
@@ -0,0 +1,75 @@
+from sqlalchemy import select, update
+
+from app.db.database import async_session as TestingSessionLocal
+from app.models.auth import Account
+from app.models.library import Library
+from app.models.scoreboard import Scoreboard
+
+
+async def upload_count(session, user_id: int) -> int | None:
+    return await session.scalar(
+        select(Scoreboard.upload_count).where(Scoreboard.user_id == user_id)
+    )
+
+
+async def add_note(session, user, doc_type, subject, category) -> Library:
+    note = Library(
+        category=category.id,
+        subject=subject.id,
+        type=doc_type.id,
+        document_name="Differentiation",
+        file_name="differentiation.pdf",
+        uploaded_by=user.user_id,
+        extension=".pdf",
+    )
+    session.add(note)
+    await session.commit()
+    return note
+
+
+async def test_upload_count_follows_approval_and_deletion(
+    create_doc_type_subject_education_level,
+):
+    user, doc_type, subject, category = create_doc_type_subject_education_level
+    async with TestingSessionLocal() as session:
+        note = await add_note(session, user, doc_type, subject, category)
+        assert await upload_count(session, user.user_id) is None
+
+        await Library.approve_note(session, note.id)
+        await Library.approve_note(session, note.id)
+        assert await upload_count(session, user.user_id) == 1
+        assert await Scoreboard.update_scoreboard_users(session) == 0
+
+        await Library.delete_note(session, user, note.id)
+        assert await upload_count(session, user.user_id) == 0
+
+
+async def test_update_scoreboard_users_corrects_drift(create_doc_type_subject_education_level):
+    user, doc_type, subject, category = create_doc_type_subject_education_level
+    async with TestingSessionLocal() as session:
+        note = await add_note(session, user, doc_type, subject, category)
+        await Library.approve_note(session, note.id)
+        await session.execute(
+            update(Scoreboard).where(Scoreboard.user_id == user.user_id).values(upload_count=7)
+        )
+        await session.commit()
+
+        assert await Scoreboard.update_scoreboard_users(session) == 1
+        assert await upload_count(session, user.user_id) == 1
+
+
+async def test_rank_skips_excluded_users(create_doc_type_subject_education_level):
+    user, *_ = create_doc_type_subject_education_level
+    async with TestingSessionLocal() as session:
+        admin = Account(username="admin", password="123456", role=3, email="admin@gmail.com")
+        session.add(admin)
+        await session.commit()
+        for account, count in ((admin, 9), (user, 2)):
+            await Scoreboard.adjust_upload_count(session, account.user_id, count)
+        await session.commit()
+
+        ranked = await Scoreboard.get_authenticated_approved_user(session, user, {admin.user_id})
+        assert (ranked.upload_count, ranked.rank) == (2, 1)
+
+        ranked = await Scoreboard.get_authenticated_approved_user(session, user, set())
+        assert (ranked.upload_count, ranked.rank) == (2, 2)
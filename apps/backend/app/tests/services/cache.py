@@ -0,0 +1,168 @@
+import asyncio
+import sys
+import time
+
+from app.services import cache
+from app.services.cache import (
+    CacheService,
+    LocalCache,
+    canonicalize_keyword,
+    deserialize_search_results,
+    generate_search_cache_key,
+    pack_cache_value,
+    serialize_search_results,
+    unpack_cache_value,
+)
+from app.tests.services.fake_redis import FakeRedis
+
+
+def cache_with_fake_redis() -> tuple[CacheService, FakeRedis]:
+    service = CacheService()
+    client = FakeRedis()
+
+    async def get_client():
+        return client
+
+    service._get_client = get_client
+    return service, client
+
+
+def counting_loader(values: list[bytes | None]):
+    calls = []
+
+    async def load():
+        calls.append(len(calls))
+        await asyncio.sleep(0.01)
+        value = values[len(calls) - 1]
+        if value is None:
+            raise RuntimeError("upstream down")
+        return value, 60
+
+    return load, calls
+
+
+def test_canonical_keyword_ignores_case_width_and_spacing():
+    assert canonicalize_keyword("  Physics\tNOTES \n") == "physics notes"
+    assert canonicalize_keyword("Ｐｈｙｓｉｃｓ") == "physics"
+    assert canonicalize_keyword("STRASSE") == canonicalize_keyword("straße")
+
+
+def test_canonical_keyword_keeps_order_stop_words_and_syntax():
+    assert canonicalize_keyword("notes physics") != canonicalize_keyword("physics notes")
+    assert canonicalize_keyword("the physics of waves") == "the physics of waves"
+    assert canonicalize_keyword('"kinetic energy" -notes') == '"kinetic energy" -notes'
+
+
+def test_canonical_keyword_of_blank_input_is_empty():
+    assert canonicalize_keyword(None) == ""
+    assert canonicalize_keyword("") == ""
+    assert canonicalize_keyword("   ") == ""
+
+
+def test_search_cache_key_depends_on_word_order():
+    assert generate_search_cache_key(keyword="Physics  Notes") == generate_search_cache_key(
+        keyword="physics notes"
+    )
+    assert generate_search_cache_key(keyword="notes physics") != generate_search_cache_key(
+        keyword="physics notes"
+    )
+
+
+def test_local_cache_evicts_least_recently_used_entry():
+    local = LocalCache(max_entries=2, max_bytes=1 << 20)
+    local.set("a", b"1", 10)
+    local.set("b", b"2", 10)
+    assert local.get("a") == b"1"
+
+    local.set("c", b"3", 10)
+
+    assert local.get("b") is None
+    assert (local.get("a"), local.get("c")) == (b"1", b"3")
+    assert len(local) == 2
+
+
+def test_local_cache_stays_within_byte_bound():
+    value = b"x" * 100
+    size = sys.getsizeof(value)
+    local = LocalCache(max_entries=10, max_bytes=2 * size)
+    for key in "abc":
+        local.set(key, value, 10)
+
+    assert local.get("a") is None
+    assert local.size_bytes == 2 * size
+
+    local.set("huge", b"x" * 1000, 10)
+    assert local.get("huge") is None
+    assert local.size_bytes == 2 * size
+
+
+def test_local_cache_expires_entries(monkeypatch):
+    now = 1000.0
+    monkeypatch.setattr(cache.time, "monotonic", lambda: now)
+    local = LocalCache(max_entries=10, max_bytes=1 << 20)
+    local.set("a", b"1", 5)
+    local.set("b", b"2", 0)
+
+    assert local.get("a") == b"1"
+    assert local.get("b") is None
+
+    now += 5
+    assert local.get("a") is None
+    assert (len(local), local.size_bytes) == (0, 0)
+
+
+async def test_get_or_load_coalesces_concurrent_misses():
+    service, client = cache_with_fake_redis()
+    load, calls = counting_loader([b"page"])
+
+    results = await asyncio.gather(*(service.get_or_load("search:1", load) for _ in range(5)))
+
+    assert results == [b"page"] * 5
+    assert len(calls) == 1
+    assert await client.get("lock:search:1") is None
+    assert await service.get_or_load("search:1", load) == b"page"
+    assert len(calls) == 1
+
+
+async def test_get_or_load_serves_stale_value_while_refreshing():
+    service, client = cache_with_fake_redis()
+    await client.set("search:1", f"{time.time() - 1:.3f}|".encode() + b"old")
+    load, calls = counting_loader([b"new"])
+
+    assert await service.get_or_load("search:1", load) == b"old"
+    assert await service.get_or_load("search:1", load) == b"old"
+    await asyncio.gather(*service._loads.values())
+
+    assert len(calls) == 1
+    assert (await client.get("search:1")).partition(b"|")[2] == b"new"
+
+
+async def test_get_or_load_keeps_stale_value_when_refresh_fails():
+    service, client = cache_with_fake_redis()
+    await client.set("search:1", f"{time.time() - 1:.3f}|".encode() + b"old")
+    load, calls = counting_loader([None, None])
+
+    for _ in range(2):
+        assert await service.get_or_load("search:1", load) == b"old"
+        await asyncio.gather(*service._loads.values())
+
+    assert len(calls) == 2
+    assert await client.get("lock:search:1") is None
+
+
+def test_pack_cache_value_round_trips_both_codecs(monkeypatch):
+    monkeypatch.setattr(cache.settings, "cache_compress_min_bytes", 64)
+    small = b'{"items": []}'
+    large = b'{"items": [' + b'{"id": 1, "name": "notes"},' * 20 + b"]}"
+
+    assert pack_cache_value(small)[:1] == b"r"
+    assert pack_cache_value(large)[:1] == b"z"
+    assert len(pack_cache_value(large)) < len(large)
+    for data in (small, large, b""):
+        assert unpack_cache_value(pack_cache_value(data)) == data
+
+
+def test_search_results_survive_serialization():
+    results = {"items": [{"id": 1, "document_name": "Wave Motion"}], "total": 1}
+
+    assert deserialize_search_results(serialize_search_results(results)) == results
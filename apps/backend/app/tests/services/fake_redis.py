@@ -0,0 +1,146 @@
+"""
+In-memory stand-in for the subset of ``redis.asyncio.Redis`` the services use.
+
+Values are stored the way a ``decode_responses`` client would hand them back
+only where the services rely on it: strings stay strings, bytes stay bytes,
+and members and hash fields are stored as strings.
+"""
+
+import time
+from typing import Any
+
+
+class FakePipeline:
+    def __init__(self, client: "FakeRedis") -> None:
+        self._client = client
+        self._calls: list[tuple[str, tuple[Any, ...], dict[str, Any]]] = []
+
+    async def __aenter__(self) -> "FakePipeline":
+        return self
+
+    async def __aexit__(self, *exc: Any) -> None:
+        self._calls = []
+
+    def __getattr__(self, name: str) -> Any:
+        def queue(*args: Any, **kwargs: Any) -> "FakePipeline":
+            self._calls.append((name, args, kwargs))
+            return self
+
+        return queue
+
+    async def execute(self) -> list[Any]:
+        calls, self._calls = self._calls, []
+        return [await getattr(self._client, name)(*args, **kwargs) for name, args, kwargs in calls]
+
+
+class FakeRedis:
+    def __init__(self) -> None:
+        self.data: dict[str, Any] = {}
+        self.expires: dict[str, float] = {}
+        self.published: list[tuple[str, str]] = []
+
+    def _live(self, key: str) -> Any:
+        if key in self.expires and self.expires[key] <= time.time():
+            self.data.pop(key, None)
+            self.expires.pop(key, None)
+        return self.data.get(key)
+
+    def pipeline(self, transaction: bool = True) -> FakePipeline:
+        return FakePipeline(self)
+
+    async def exists(self, *keys: str) -> int:
+        return sum(self._live(key) is not None for key in keys)
+
+    async def get(self, key: str) -> Any:
+        return self._live(key)
+
+    async def mget(self, keys: list[str]) -> list[Any]:
+        return [self._live(key) for key in keys]
+
+    async def set(
+        self,
+        key: str,
+        value: Any,
+        ex: float | None = None,
+        px: float | None = None,
+        nx: bool = False,
+    ) -> bool | None:
+        if nx and self._live(key) is not None:
+            return None
+        self.data[key] = value
+        self.expires.pop(key, None)
+        if ex is not None:
+            self.expires[key] = time.time() + ex
+        elif px is not None:
+            self.expires[key] = time.time() + px / 1000
+        return True
+
+    async def delete(self, *keys: str) -> int:
+        deleted = 0
+        for key in keys:
+            deleted += self.data.pop(key, None) is not None
+            self.expires.pop(key, None)
+        return deleted
+
+    async def rename(self, source: str, destination: str) -> bool:
+        self.data[destination] = self.data.pop(source)
+        return True
+
+    async def incr(self, key: str) -> int:
+        value = int(self._live(key) or 0) + 1
+        self.data[key] = str(value).encode()
+        return value
+
+    async def eval(self, script: str, numkeys: int, key: str, token: str) -> int:
+        # Only the lock release script is used: delete the key if it still holds the token.
+        if self._live(key) == token:
+            return await self.delete(key)
+        return 0
+
+    async def publish(self, channel: str, message: str) -> int:
+        self.published.append((channel, message))
+        return 0
+
+    async def hset(
+        self,
+        key: str,
+        field: Any = None,
+        value: Any = None,
+        mapping: dict[Any, Any] | None = None,
+    ) -> int:
+        hash_ = self.data.setdefault(key, {})
+        items = dict(mapping or {})
+        if field is not None:
+            items[field] = value
+        hash_.update({str(name): str(item) for name, item in items.items()})
+        return len(items)
+
+    async def hmget(self, key: str, fields: list[Any]) -> list[Any]:
+        hash_ = self._live(key) or {}
+        return [hash_.get(str(field)) for field in fields]
+
+    async def zadd(self, key: str, mapping: dict[Any, float]) -> int:
+        zset = self.data.setdefault(key, {})
+        zset.update({str(member): float(score) for member, score in mapping.items()})
+        return len(mapping)
+
+    def _descending(self, key: str) -> list[tuple[str, float]]:
+        # Equal scores are ordered by descending member, compared as strings.
+        zset = self._live(key) or {}
+        return sorted(zset.items(), key=lambda item: (item[1], item[0]), reverse=True)
+
+    async def zrevrange(
+        self, key: str, start: int, end: int, withscores: bool = False
+    ) -> list[Any]:
+        members = self._descending(key)[start : None if end == -1 else end + 1]
+        return members if withscores else [member for member, _ in members]
+
+    async def zrevrank(self, key: str, member: Any) -> int | None:
+        ranked = [name for name, _ in self._descending(key)]
+        return ranked.index(str(member)) if str(member) in ranked else None
+
+    async def zscore(self, key: str, member: Any) -> float | None:
+        return (self._live(key) or {}).get(str(member))
+
+    async def zcard(self, key: str) -> int:
+        return len(self._live(key) or {})
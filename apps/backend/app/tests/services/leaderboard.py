@@ -0,0 +1,58 @@
+from app.schemas.auth import CurrentUserSchema, RoleEnum
+from app.services.leaderboard import LEADERBOARD_KEY, USERNAMES_KEY, LeaderboardService
+from app.tests.services.fake_redis import FakeRedis
+
+# Upload counts by user ID. Users 1 and 9 are excluded; the four users on five
+# uploads tie, so Redis orders them by descending ID text: 3, 2, 12, 1.
+COUNTS = {1: 5, 2: 5, 3: 5, 7: 2, 9: 9, 12: 5}
+EXCLUDED = {1, 9}
+
+
+async def leaderboard_with_fake_redis() -> LeaderboardService:
+    service = LeaderboardService()
+    client = FakeRedis()
+    await client.zadd(LEADERBOARD_KEY, {str(user_id): count for user_id, count in COUNTS.items()})
+    await client.hset(USERNAMES_KEY, mapping={str(user_id): f"user{user_id}" for user_id in COUNTS})
+
+    async def get_client():
+        return client
+
+    service._get_client = get_client
+    return service
+
+
+def account(user_id: int) -> CurrentUserSchema:
+    return CurrentUserSchema(
+        user_id=user_id, email=None, username=f"user{user_id}", role=RoleEnum.USER, verified=True
+    )
+
+
+async def test_top_users_skip_excluded_and_order_ties_like_redis():
+    service = await leaderboard_with_fake_redis()
+
+    top = await service.get_top_users(None, top_n=3, exclude_ids=EXCLUDED)
+
+    assert [(entry.user.user_id, entry.user.username, entry.upload_count) for entry in top] == [
+        (3, "user3", 5),
+        (2, "user2", 5),
+        (12, "user12", 5),
+    ]
+
+
+async def test_user_rank_discounts_excluded_users_above():
+    service = await leaderboard_with_fake_redis()
+
+    # User 9 outscores user 12; user 1 ties with them but sorts after "12".
+    tied = await service.get_user(None, account(12), EXCLUDED)
+    assert (tied.upload_count, tied.rank) == (5, 3)
+
+    last = await service.get_user(None, account(7), EXCLUDED)
+    assert (last.upload_count, last.rank) == (2, 4)
+
+
+async def test_user_without_uploads_ranks_after_everyone_ranked():
+    service = await leaderboard_with_fake_redis()
+
+    unranked = await service.get_user(None, account(40), EXCLUDED)
+
+    assert (unranked.upload_count, unranked.rank) == (0, 5)
@@ -0,0 +1,45 @@
+from app.core.config import settings
+from app.services.local_search import LocalSearchIndex
+from app.services.search import decode_search_cursor, encode_search_cursor
+
+
+def index_with_notes(count: int) -> LocalSearchIndex:
+    index = LocalSearchIndex()
+    index._checked_at = float("inf")
+    for doc_id in range(1, count + 1):
+        index.add_document(
+            {
+                "id": doc_id,
+                "document_name": f"Calculus notes {doc_id}",
+                "category": "A Level",
+                "subject": "Mathematics",
+                "doc_type": "Notes",
+                "uploaded_by": "user1",
+                "uploaded_on": f"2024-01-{doc_id:02d}T00:00:00",
+            }
+        )
+    return index
+
+
+def test_local_cursors_are_tagged_and_resume(monkeypatch):
+    monkeypatch.setattr(settings, "local_search_enabled", True)
+    index = index_with_notes(3)
+
+    first = index.search("calculus", size=2)
+    assert decode_search_cursor(first["next_cursor"])["engine"] == "local"
+
+    second = index.search("calculus", size=2, cursor=first["next_cursor"])
+    assert second["page"] == 2
+    assert [note["id"] for note in second["items"]] == [1]
+
+
+def test_cursor_from_another_engine_restarts_from_the_first_page(monkeypatch):
+    monkeypatch.setattr(settings, "local_search_enabled", True)
+    index = index_with_notes(3)
+
+    # Compared with the BM25 scores here, this OpenSearch score would seek past every note.
+    foreign = encode_search_cursor([0.0, 0, 0], 4)
+    result = index.search("calculus", page=4, size=2, cursor=foreign)
+
+    assert result["page"] == 1
+    assert [note["id"] for note in result["items"]] == [3, 2]
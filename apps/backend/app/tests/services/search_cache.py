@@ -0,0 +1,63 @@
+import asyncio
+
+from app.services import search_cache
+from app.services.search_cache import SearchCacheWarmer
+
+
+def fake_dependencies(monkeypatch, landed: bool) -> list[str]:
+    events = []
+
+    async def wait_for_task(task_id, timeout):
+        events.append(f"wait:{task_id}")
+        return landed
+
+    async def refresh():
+        events.append("refresh")
+
+    async def warm(self):
+        events.append("warm")
+        return 0
+
+    monkeypatch.setattr(search_cache.task_client, "wait_for_task", wait_for_task)
+    monkeypatch.setattr(search_cache.search_service, "refresh", refresh)
+    monkeypatch.setattr(SearchCacheWarmer, "warm", warm)
+    return events
+
+
+async def test_warms_after_queued_tasks_and_refresh(monkeypatch):
+    events = fake_dependencies(monkeypatch, landed=True)
+    warmer = SearchCacheWarmer()
+
+    warmer.schedule("index-1", None)
+    await warmer._task
+
+    assert events == ["wait:index-1", "refresh", "warm"]
+
+
+async def test_skips_warming_when_a_task_does_not_land(monkeypatch):
+    events = fake_dependencies(monkeypatch, landed=False)
+    warmer = SearchCacheWarmer()
+
+    warmer.schedule("index-1")
+    await warmer._task
+
+    assert events == ["wait:index-1"]
+
+
+async def test_waits_for_queued_tasks_together(monkeypatch):
+    events = fake_dependencies(monkeypatch, landed=True)
+
+    async def wait_for_task(task_id, timeout):
+        events.append(f"wait:{task_id}")
+        await asyncio.sleep(0.01)
+        events.append(f"landed:{task_id}")
+        return True
+
+    monkeypatch.setattr(search_cache.task_client, "wait_for_task", wait_for_task)
+    warmer = SearchCacheWarmer()
+
+    warmer.schedule("index-1", "delete-2")
+    await warmer._task
+
+    assert sorted(events[:2]) == ["wait:delete-2", "wait:index-1"]
+    assert events[-2:] == ["refresh", "warm"]
@@ -0,0 +1,46 @@
+from app.services.suggest import PrefixIndex
+
+NAMES = {
+    1: ("H2 Physics Notes", 5),
+    2: ("Physical Geography", 9),
+    3: ("Pure Mathematics", 1),
+    4: ("Physics Practice Paper", 9),
+}
+
+
+def build_index(top_k: int = 10) -> PrefixIndex:
+    return PrefixIndex.build(
+        ((item_id, name, weight) for item_id, (name, weight) in NAMES.items()), top_k
+    )
+
+
+def test_prefix_matches_any_word_start_by_weight():
+    index = build_index()
+
+    assert index.search("phys", 10) == [2, 4, 1]
+    assert index.search("  NOTES", 10) == [1]
+    assert index.search("hysics", 10) == []
+
+
+def test_cached_short_prefix_follows_adds_and_removes():
+    index = build_index(top_k=2)
+    assert index.search("p", 10) == [2, 4]
+
+    index.add(5, "Probability", 20)
+    assert index.search("p", 10) == [5, 2]
+
+    index.remove(5)
+    index.remove(2)
+    assert index.search("p", 10) == [4, 1]
+    assert index.search("probability", 10) == []
+
+
+def test_re_adding_an_item_replaces_its_label():
+    index = build_index()
+
+    index.add(3, "Further Mathematics", 1)
+
+    assert index.search("pure", 10) == []
+    assert index.search("further", 10) == [3]
+    assert index.label(3) == "Further Mathematics"
+    assert len(index) == 4
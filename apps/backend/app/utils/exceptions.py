@@ -42,6 +42,10 @@ class AppError:
         status_code=status.HTTP_409_CONFLICT, detail="Resource already exists"
     )
 
+    SERVICE_UNAVAILABLE_ERROR = HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail="Service is unavailable"
+    )
+
     @staticmethod
     def MULTIPLE_GENERIC_ERRORS(**kwargs) -> HTTPException:
         """
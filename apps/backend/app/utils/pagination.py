@@ -0,0 +1,84 @@
+"""
+Helpers for paginated Postgres listings.
+
+Provides opaque keyset cursors, so following pages seek past the last row
+instead of scanning an OFFSET, and totals that are cached per filter set or
+estimated from planner statistics instead of counted on every request.
+"""
+import base64
+import hashlib
+import json
+from typing import Any
+
+from sqlalchemy import Select, func, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.services.cache import cache_service
+
+
+def encode_keyset_cursor(after: list[Any], page: int) -> str:
+    raw = json.dumps({"after": after, "page": page}, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_keyset_cursor(cursor: str, length: int) -> dict[str, Any]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (ValueError, TypeError) as exc:
+        raise ValueError("Malformed pagination cursor") from exc
+
+    if (
+        not isinstance(payload, dict)
+        or not isinstance(payload.get("after"), list)
+        or len(payload["after"]) != length
+        or not isinstance(payload.get("page"), int)
+        or payload["page"] < 1
+    ):
+        raise ValueError("Malformed pagination cursor")
+    return payload
+
+
+def page_count(total: int, size: int) -> int:
+    return total // size if total % size == 0 else (total // size) + 1
+
+
+def listing_count_key(listing: str, **filters: Any) -> str:
+    canonical = json.dumps(
+        {key: value for key, value in filters.items() if value is not None},
+        sort_keys=True,
+        separators=(",", ":"),
+        default=str,
+    )
+    return f"count:{listing}:{hashlib.md5(canonical.encode()).hexdigest()[:16]}"
+
+
+async def cached_count(session: AsyncSession, key: str, stmt: Select[Any]) -> int:
+    """
+    Row count of ``stmt``, shared by every page of the same filters.
+
+    Counts are cached for ``listing_count_ttl`` seconds, so totals can lag
+    writes by that much; the rows themselves are always current.
+    """
+    cached = await cache_service.get(key)
+    if cached is not None:
+        return int(cached)
+
+    total = await session.scalar(
+        select(func.count()).select_from(stmt.order_by(None).subquery())  # pylint: disable=E1102
+    )
+    total = total or 0
+    await cache_service.set(key, str(total).encode(), ttl=settings.listing_count_ttl)
+    return total
+
+
+async def estimated_count(session: AsyncSession, table: str) -> int | None:
+    """Planner estimate of a table's row count, or None if it was never analyzed."""
+    estimate: int | None = await session.scalar(
+        text("SELECT reltuples::bigint FROM pg_class WHERE oid = to_regclass(:table)"),
+        {"table": table},
+    )
+    if estimate is None or estimate < 0:
+        return None
+    return estimate
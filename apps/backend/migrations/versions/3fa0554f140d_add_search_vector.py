@@ -0,0 +1,71 @@
+"""add-search-vector
+
+Revision ID: 3fa0554f140d
+Revises: 7703344fdf3b
+Create Date: 2026-10-18 14:37:05.618204
+
+"""
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = "3fa0554f140d"
+down_revision = "7703344fdf3b"
+branch_labels = None
+depends_on = None
+
+SEARCH_VECTOR_SQL = (
+    "setweight(to_tsvector('english', document_name), 'A') || "
+    "setweight(to_tsvector('english', coalesce(search_taxonomy, '')), 'B') || "
+    "setweight(to_tsvector('english', coalesce(search_content, '')), 'C')"
+)
+
+
+def upgrade():
+    op.add_column("library", sa.Column("search_taxonomy", sa.Text(), nullable=True))
+    op.add_column("library", sa.Column("search_content", sa.Text(), nullable=True))
+    # Content is left for scripts/build_search_index.py, which extracts it.
+    op.execute(
+        """
+        UPDATE library
+        SET search_taxonomy = category_level.name || ' ' || subjects.name
+        FROM category_level, subjects
+        WHERE category_level.id = library.category AND subjects.id = library.subject
+        """
+    )
+    # A stored generated column rewrites the table once, under an exclusive lock, so it is
+    # added after the backfill to compute each vector with its taxonomy already in place.
+    op.add_column(
+        "library",
+        sa.Column(
+            "search_vector",
+            postgresql.TSVECTOR(),
+            sa.Computed(SEARCH_VECTOR_SQL, persisted=True),
+            nullable=True,
+        ),
+    )
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_library_search_vector",
+            "library",
+            ["search_vector"],
+            unique=False,
+            postgresql_using="gin",
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_library_search_vector",
+            table_name="library",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+    op.drop_column("library", "search_vector")
+    op.drop_column("library", "search_content")
+    op.drop_column("library", "search_taxonomy")
@@ -0,0 +1,74 @@
+"""add-listing-indexes
+
+Revision ID: 4a5715062826
+Revises: 3fa0554f140d
+Create Date: 2026-10-18 16:02:19.470385
+
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "4a5715062826"
+down_revision = "3fa0554f140d"
+branch_labels = None
+depends_on = None
+
+# name -> (table, columns, partial index predicate)
+INDEXES = {
+    "ix_library_approved_uploaded_on": ("library", ["approved", "uploaded_on", "id"], None),
+    "ix_library_approved_category_subject_uploaded_on": (
+        "library",
+        ["approved", "category", "subject", "uploaded_on", "id"],
+        None,
+    ),
+    "ix_library_approved_type_uploaded_on": (
+        "library",
+        ["approved", "type", "uploaded_on", "id"],
+        None,
+    ),
+    "ix_library_approved_year_uploaded_on": (
+        "library",
+        ["approved", "year", "uploaded_on", "id"],
+        None,
+    ),
+    "ix_library_pending_uploaded_on": ("library", ["uploaded_on", "id"], "approved = false"),
+    "ix_library_uploaded_by_approved": ("library", ["uploaded_by", "approved"], None),
+    "ix_account_email_verification_token": (
+        "account",
+        ["email_verification_token"],
+        "email_verification_token IS NOT NULL",
+    ),
+    "ix_account_reset_password_token": (
+        "account",
+        ["reset_password_token"],
+        "reset_password_token IS NOT NULL",
+    ),
+}
+
+
+def upgrade():
+    # Built concurrently so uploads and approvals are not blocked while they build.
+    with op.get_context().autocommit_block():
+        for name, (table, columns, where) in INDEXES.items():
+            op.create_index(
+                name,
+                table,
+                columns,
+                unique=False,
+                postgresql_where=sa.text(where) if where else None,
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        for name, (table, _, _) in reversed(INDEXES.items()):
+            op.drop_index(
+                name,
+                table_name=table,
+                postgresql_concurrently=True,
+                if_exists=True,
+            )
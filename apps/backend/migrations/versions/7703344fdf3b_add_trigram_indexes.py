@@ -0,0 +1,41 @@
+"""add-trigram-indexes
+
+Revision ID: 7703344fdf3b
+Revises: 4b5888d54fc3
+Create Date: 2026-10-18 10:12:41.227913
+
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "7703344fdf3b"
+down_revision = "4b5888d54fc3"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    # Built concurrently so uploads and approvals are not blocked while it builds.
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_library_document_name_trgm",
+            "library",
+            ["document_name"],
+            unique=False,
+            postgresql_using="gin",
+            postgresql_ops={"document_name": "gin_trgm_ops"},
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_library_document_name_trgm",
+            table_name="library",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+"""
+Compare plans of the listing, moderation and token queries before and after the
+composite and partial indexes.
+
+Seeds library and account copies with synthetic rows in a scratch schema, so
+the real tables are never touched. Each query is run with EXPLAIN ANALYZE
+first with only the single-column indexes the tables used to have, then with
+the indexes added by the add-listing-indexes migration. Index definitions are
+taken from the models, so the benchmark follows them.
+
+Usage:
+    cd apps/backend
+    uv run python scripts/benchmark_listing_indexes.py [--rows 500000] [--plans] [--keep]
+
+Options:
+    --rows N      Library rows to seed (default: 500000); accounts are a fiftieth of that
+    --plans       Print the full plans instead of the scans used and timing
+    --keep        Keep the scratch schema afterwards for manual EXPLAINs
+"""
+import argparse
+import asyncio
+import hashlib
+import re
+import sys
+from pathlib import Path
+
+from sqlalchemy import false, func, select, text, true
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.schema import CreateIndex
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.core.config import settings  # noqa: E402
+from app.models.auth import Account  # noqa: E402
+from app.models.library import Library  # noqa: E402
+
+SCHEMA = "index_benchmark"
+
+# Added by the add-listing-indexes migration; everything else existed before it.
+NEW_INDEXES = {
+    "ix_library_approved_uploaded_on",
+    "ix_library_approved_category_subject_uploaded_on",
+    "ix_library_approved_type_uploaded_on",
+    "ix_library_approved_year_uploaded_on",
+    "ix_library_pending_uploaded_on",
+    "ix_library_uploaded_by_approved",
+    "ix_account_email_verification_token",
+    "ix_account_reset_password_token",
+}
+
+PAGE = 51
+
+# Tokens the seed gives the twentieth and fiftieth accounts.
+VERIFY_TOKEN = hashlib.md5(b"verify20").hexdigest()
+RESET_TOKEN = hashlib.md5(b"reset50").hexdigest()
+
+SCAN_PATTERN = re.compile(
+    r"(?:Seq Scan|Index Only Scan(?: Backward)?|Index Scan(?: Backward)?|Bitmap Index Scan)"
+    r"(?: using \w+)?(?: on \w+)?"
+)
+
+SEED_ACCOUNTS = """
+INSERT INTO account (user_id, username, password, role, verified,
+                     email_verification_token, reset_password_token)
+SELECT g, 'user' || g, 'x', 1, g % 20 <> 0,
+       CASE WHEN g % 20 = 0 THEN md5('verify' || g) END,
+       CASE WHEN g % 50 = 0 THEN md5('reset' || g) END
+FROM generate_series(1, :accounts) AS g
+"""
+
+# About 3% of rows wait for moderation; years are missing on a tenth.
+SEED_LIBRARY = """
+INSERT INTO library (id, category, subject, type, document_name, file_name, view_count,
+                     uploaded_by, uploaded_on, approved, year, extension)
+SELECT g, 1 + g % 3, 1 + g % 40, 1 + g % 6, 'Document ' || g, g || '.pdf', g % 500,
+       1 + (g * 7919) % :accounts,
+       now() - make_interval(secs => (g * 104729) % (5 * 365 * 86400)),
+       (g * 31) % 100 >= 3,
+       CASE WHEN g % 10 <> 0 THEN 2010 + g % 15 END,
+       '.pdf'
+FROM generate_series(1::bigint, :rows) AS g
+"""
+
+
+def listing(*filters, oldest_first: bool = False):
+    order = (
+        (Library.uploaded_on.asc(), Library.id.asc())
+        if oldest_first
+        else (Library.uploaded_on.desc(), Library.id.desc())
+    )
+    return (
+        select(Library.id, Library.document_name, Library.uploaded_on)
+        .where(*filters)
+        .order_by(*order)
+        .limit(PAGE)
+    )
+
+
+QUERIES = [
+    ("approved, newest first", listing(Library.approved == true())),
+    (
+        "approved by category and subject",
+        listing(Library.approved == true(), Library.category == 2, Library.subject == 8),
+    ),
+    (
+        "approved by category and subject, oldest first",
+        listing(
+            Library.approved == true(),
+            Library.category == 2,
+            Library.subject == 8,
+            oldest_first=True,
+        ),
+    ),
+    ("approved by document type", listing(Library.approved == true(), Library.type == 3)),
+    ("approved by year", listing(Library.approved == true(), Library.year == 2020)),
+    ("moderation queue", listing(Library.approved == false())),
+    (
+        "verify email token",
+        select(Account.user_id).where(Account.email_verification_token == VERIFY_TOKEN),
+    ),
+    (
+        "reset password token",
+        select(Account.user_id).where(Account.reset_password_token == RESET_TOKEN),
+    ),
+    (
+        "scoreboard upload counts",
+        select(Library.uploaded_by, func.count())  # pylint: disable=E1102
+        .where(Library.approved == true())
+        .group_by(Library.uploaded_by),
+    ),
+]
+
+
+def index_ddl(engine, new: bool) -> list[str]:
+    """B-tree indexes of both tables from the models, either the new ones or the older ones."""
+    statements = []
+    for table in (Account.__table__, Library.__table__):
+        for index in sorted(table.indexes, key=lambda index: index.name):
+            if index.dialect_options["postgresql"]["using"]:
+                continue
+            if (index.name in NEW_INDEXES) == new:
+                statements.append(str(CreateIndex(index).compile(dialect=engine.dialect)))
+    return statements
+
+
+async def explain(conn, engine, stmt) -> tuple[str, float]:
+    sql = stmt.compile(dialect=engine.dialect, compile_kwargs={"literal_binds": True})
+    result = await conn.exec_driver_sql(f"EXPLAIN (ANALYZE, BUFFERS) {sql}")
+    plan = "\n".join(row[0] for row in result)
+    match = re.search(r"Execution Time: ([\d.]+) ms", plan)
+    return plan, float(match.group(1)) if match else 0.0
+
+
+async def run_queries(conn, engine) -> dict[str, tuple[str, float]]:
+    await conn.exec_driver_sql("VACUUM ANALYZE library")
+    await conn.exec_driver_sql("VACUUM ANALYZE account")
+    results = {}
+    for name, stmt in QUERIES:
+        # The first run warms the cache; the second is the one reported.
+        await explain(conn, engine, stmt)
+        results[name] = await explain(conn, engine, stmt)
+    return results
+
+
+def access_paths(plan: str) -> str:
+    """The scans a plan reads the tables with, in plan order."""
+    return ", ".join(dict.fromkeys(SCAN_PATTERN.findall(plan))) or "no table scan"
+
+
+async def run_benchmark(rows: int, show_plans: bool, keep: bool) -> None:
+    engine = create_async_engine(settings.database_url, isolation_level="AUTOCOMMIT")
+    accounts = max(rows // 50, 1)
+    try:
+        async with engine.connect() as conn:
+            await conn.exec_driver_sql(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE")
+            await conn.exec_driver_sql(f"CREATE SCHEMA {SCHEMA}")
+            await conn.exec_driver_sql(f"SET search_path TO {SCHEMA}, public")
+            for table in ("account", "library"):
+                await conn.exec_driver_sql(
+                    f"CREATE TABLE {table} (LIKE public.{table} INCLUDING DEFAULTS)"
+                )
+            await conn.exec_driver_sql("ALTER TABLE account ADD PRIMARY KEY (user_id)")
+            await conn.exec_driver_sql("ALTER TABLE library ADD PRIMARY KEY (id)")
+
+            print(f"Seeding {accounts} accounts and {rows} library rows into {SCHEMA}...")
+            await conn.execute(text(SEED_ACCOUNTS), {"accounts": accounts})
+            await conn.execute(text(SEED_LIBRARY), {"accounts": accounts, "rows": rows})
+
+            for statement in index_ddl(engine, new=False):
+                await conn.exec_driver_sql(statement)
+            before = await run_queries(conn, engine)
+
+            print("Building the composite and partial indexes...")
+            for statement in index_ddl(engine, new=True):
+                await conn.exec_driver_sql(statement)
+            after = await run_queries(conn, engine)
+
+            if not keep:
+                await conn.exec_driver_sql(f"DROP SCHEMA {SCHEMA} CASCADE")
+    finally:
+        await engine.dispose()
+
+    print()
+    for name, _ in QUERIES:
+        (before_plan, before_ms), (after_plan, after_ms) = before[name], after[name]
+        print(f"=== {name} ===")
+        if show_plans:
+            print("-- before --")
+            print(before_plan)
+            print("-- after --")
+            print(after_plan)
+        else:
+            print(f"before: {before_ms:>9.2f} ms  {access_paths(before_plan)}")
+            print(f"after:  {after_ms:>9.2f} ms  {access_paths(after_plan)}")
+        print()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the listing and moderation indexes")
+    parser.add_argument("--rows", type=int, default=500_000)
+    parser.add_argument("--plans", action="store_true")
+    parser.add_argument("--keep", action="store_true")
+    args = parser.parse_args()
+
+    asyncio.run(run_benchmark(args.rows, args.plans, args.keep))
+
+
+if __name__ == "__main__":
+    main()
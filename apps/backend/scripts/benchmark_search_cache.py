@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Compare cached /notes/search payloads in the old JSON format and the binary codec.
+
+The old format stored each page as a JSON string and every hit parsed it,
+validated it against SearchPageSchema and serialised it again. The binary
+codec stores the validated, rendered page (zlib-compressed above
+CACHE_COMPRESS_MIN_BYTES) and a hit only decompresses it and splices in the
+facet tree. Prints the stored bytes and the CPU time per hit for both.
+
+Pages are synthetic by default. With --live they are fetched from OpenSearch.
+
+Usage:
+    cd apps/backend
+    uv run python scripts/benchmark_search_cache.py [--size 50] [--runs 2000] [--live]
+
+Options:
+    --size N      Hits per page (default: 50)
+    --runs N      Cache hits to time per format (default: 2000)
+    --live        Build pages from OpenSearch results for a few common keywords
+"""
+import argparse
+import asyncio
+import json
+import sys
+import time
+from pathlib import Path
+
+from fastapi.encoders import jsonable_encoder
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.api.endpoints.library import _render_search_page  # noqa: E402
+from app.schemas.library import SearchPageSchema  # noqa: E402
+from app.services.cache import pack_cache_value, unpack_cache_value  # noqa: E402
+from app.services.search import search_service  # noqa: E402
+
+LIVE_KEYWORDS = ["physics", "chemistry", "h2 mathematics", ""]
+
+
+def synthetic_page(size: int) -> dict:
+    items = []
+    for i in range(size):
+        items.append(
+            {
+                "id": i + 1,
+                "category": 1,
+                "subject": 10 + i % 7,
+                "type": 2,
+                "year": 2020 + i % 5,
+                "document_name": f"H2 Physics Paper {i} Kinematics and Dynamics Summary",
+                "file_name": f"0f3c2a8e-{i:04d}-physics.pdf",
+                "uploaded_by": 100 + i % 13,
+                "view_count": 37 * i,
+                "uploaded_on": f"2024-03-0{1 + i % 9}T12:34:56",
+                "approved": True,
+                "doc_type": {"id": 2, "name": "Summary Notes"},
+                "doc_category": {"id": 1, "name": "GCE 'A' Levels"},
+                "doc_subject": {
+                    "id": 10 + i % 7,
+                    "name": "H2 Physics",
+                    "category": {"id": 1, "name": "GCE 'A' Levels"},
+                },
+                "account": {"user_id": 100 + i % 13, "username": f"student{i % 13:04d}"},
+                "extension": ".pdf",
+                "score": 12.5 - i * 0.1,
+                "highlights": {"document_name": [f"H2 <mark>Physics</mark> Paper {i}"]},
+            }
+        )
+    return {
+        "items": items,
+        "total": 1234,
+        "page": 1,
+        "pages": 25,
+        "size": size,
+        "next_cursor": "eyJhZnRlciI6WzEyLjUsMTcwOTI5NjQ5NjAwMCwxXSwicGFnZSI6Mn0",
+        "tier": "exact",
+    }
+
+
+async def live_pages(size: int) -> list[dict]:
+    if not await search_service.is_available(refresh=True):
+        print("ERROR: OpenSearch is not available!")
+        sys.exit(1)
+
+    pages = []
+    for keyword in LIVE_KEYWORDS:
+        page = await search_service.search_full(keyword=keyword or None, size=size)
+        if page and page["items"]:
+            pages.append(page)
+    await search_service.close()
+    return pages
+
+
+def old_hit(stored: str) -> bytes:
+    # What a hit used to cost: parse, FastAPI response validation, JSONResponse rendering.
+    page = SearchPageSchema.model_validate(json.loads(stored))
+    return json.dumps(jsonable_encoder(page), separators=(",", ":")).encode()
+
+
+def new_hit(stored: bytes) -> bytes:
+    return _render_search_page(unpack_cache_value(stored), None)
+
+
+def time_per_hit(func, stored, runs: int) -> float:
+    start = time.perf_counter()
+    for _ in range(runs):
+        func(stored)
+    return (time.perf_counter() - start) / runs * 1_000_000
+
+
+def run_benchmark(pages: list[dict], runs: int) -> None:
+    print(f"{'page':<6} {'format':<8} {'bytes':>10} {'us/hit':>10}")
+    print("-" * 37)
+    for number, page in enumerate(pages, 1):
+        old_stored = json.dumps(page)
+        rendered = SearchPageSchema.model_validate(page).model_dump_json(exclude={"facet_tree"})
+        new_stored = pack_cache_value(rendered.encode())
+
+        old_bytes = len(old_stored.encode())
+        new_bytes = len(new_stored)
+        old_us = time_per_hit(old_hit, old_stored, runs)
+        new_us = time_per_hit(new_hit, new_stored, runs)
+
+        print(f"{number:<6} {'json':<8} {old_bytes:>10} {old_us:>10.1f}")
+        print(f"{'':<6} {'binary':<8} {new_bytes:>10} {new_us:>10.1f}")
+        print(
+            f"{'':<6} {'saved':<8} {100 * (1 - new_bytes / old_bytes):>9.1f}% "
+            f"{100 * (1 - new_us / old_us):>9.1f}%"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark cached search payload formats")
+    parser.add_argument("--size", type=int, default=50)
+    parser.add_argument("--runs", type=int, default=2000)
+    parser.add_argument("--live", action="store_true")
+    args = parser.parse_args()
+
+    pages = asyncio.run(live_pages(args.size)) if args.live else [synthetic_page(args.size)]
+    run_benchmark(pages, args.runs)
+
+
+if __name__ == "__main__":
+    main()
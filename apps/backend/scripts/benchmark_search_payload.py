@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Measure OpenSearch response size and latency with and without source filtering.
+
+Runs the same /notes/search query body twice per keyword: once returning the
+full _source (content and all) and once projected to the fields the API
+actually returns. Prints the mean response bytes and latency for each mode.
+
+Usage:
+    cd apps/backend
+    uv run python scripts/benchmark_search_payload.py [--keywords physics "h2 math"] [--runs N]
+
+Options:
+    --keywords K [K ...]  Keywords to search for (default: a few common subjects)
+    --size N              Hits per query (default: 50)
+    --runs N              Repetitions per keyword and mode (default: 20)
+"""
+import argparse
+import asyncio
+import json
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.core.config import settings  # noqa: E402
+from app.services.search import SEARCH_SORT, search_service  # noqa: E402
+
+DEFAULT_KEYWORDS = ["physics", "chemistry", "h2 mathematics", "economics essay", ""]
+
+
+async def measure(body: dict, runs: int) -> tuple[float, float]:
+    client = await search_service._get_client()
+    sizes = []
+    latencies = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        result = await client.search(index=search_service.index_name, body=body)
+        latencies.append((time.perf_counter() - start) * 1000)
+        sizes.append(len(json.dumps(result).encode()))
+    return statistics.mean(sizes), statistics.median(latencies)
+
+
+async def run_benchmark(keywords: list[str], size: int, runs: int) -> None:
+    print(f"OpenSearch Host: {settings.opensearch_host}:{settings.opensearch_port}")
+    print(f"OpenSearch Index: {settings.opensearch_index}")
+    print()
+
+    if not await search_service.is_available(refresh=True):
+        print("ERROR: OpenSearch is not available!")
+        sys.exit(1)
+
+    print(f"{'keyword':<20} {'mode':<10} {'bytes':>12} {'p50 ms':>10}")
+    print("-" * 55)
+
+    for keyword in keywords:
+        query = search_service._build_query(keyword or None, None, None, None, None, True)
+        base_body = {"query": query, "size": size, "sort": SEARCH_SORT}
+
+        full_bytes, full_ms = await measure(base_body, runs)
+        projected_bytes, projected_ms = await measure(
+            {**base_body, "_source": search_service.SEARCH_FULL_SOURCE_FIELDS}, runs
+        )
+
+        label = keyword or "<empty>"
+        print(f"{label:<20} {'full':<10} {full_bytes:>12.0f} {full_ms:>10.1f}")
+        print(f"{'':<20} {'projected':<10} {projected_bytes:>12.0f} {projected_ms:>10.1f}")
+        if full_bytes:
+            saved = 100 * (1 - projected_bytes / full_bytes)
+            print(f"{'':<20} {'saved':<10} {saved:>11.1f}%")
+
+    await search_service.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark search response payloads")
+    parser.add_argument("--keywords", nargs="+", default=DEFAULT_KEYWORDS)
+    parser.add_argument("--size", type=int, default=50)
+    parser.add_argument("--runs", type=int, default=20)
+    args = parser.parse_args()
+
+    asyncio.run(run_benchmark(args.keywords, args.size, args.runs))
+
+
+if __name__ == "__main__":
+    main()
@@ -8,13 +8,18 @@ to OpenSearch for full-text search capabilities.
 Usage:
     cd apps/backend
     uv run python scripts/build_search_index.py [--recreate] [--limit N] [--extract-content]
+    uv run python scripts/build_search_index.py --local
 
 Options:
-    --recreate         Delete and recreate the index before indexing
+    --recreate         Build a new index version and switch the search alias to it when done
     --limit N          Limit indexing to first N documents (for testing)
     --extract-content  Extract text from PDF files (slower but enables content search)
     --no-extract       Skip PDF content extraction (faster, metadata only)
     --concurrency N    Number of concurrent PDF downloads (default: 10)
+    --local            Write the local fallback index instead of indexing to OpenSearch
+
+Extracted PDF text is cached under LOCAL_SEARCH_TEXT_DIR, so later runs only
+download documents that have not been seen before.
 """
 import argparse
 import asyncio
@@ -30,6 +35,11 @@ from sqlalchemy.orm import selectinload, sessionmaker  # noqa: E402
 
 from app.core.config import settings  # noqa: E402
 from app.models.library import Library  # noqa: E402
+from app.services.local_search import (  # noqa: E402
+    read_cached_text,
+    write_cached_text,
+    write_local_index,
+)
 from app.services.search import search_service  # noqa: E402
 from app.utils.pdf_extractor import extract_text_from_url  # noqa: E402
 
@@ -44,8 +54,15 @@ async def extract_content_for_doc(doc: dict, base_url: str, semaphore: asyncio.S
         if extension not in PDF_EXTENSIONS:
             return doc
 
+        cached = read_cached_text(doc["id"])
+        if cached is not None:
+            doc["content"] = cached
+            return doc
+
         url = f"{base_url}/{file_name}"
         content = await extract_text_from_url(url, max_chars=50000, timeout=60.0)
+        if content:
+            write_cached_text(doc["id"], content)
         doc["content"] = content
         return doc
 
@@ -55,32 +72,42 @@ async def build_index(
     limit: int | None = None,
     extract_content: bool = True,
     concurrency: int = 10,
+    local: bool = False,
 ) -> None:
+    target_index: str | None = None
     print(f"OpenSearch Host: {settings.opensearch_host}:{settings.opensearch_port}")
     print(f"OpenSearch Index: {settings.opensearch_index}")
     print(f"OpenSearch Enabled: {settings.opensearch_enabled}")
     print(f"CloudFront URL: {settings.aws_cloudfront_url}")
     print(f"Extract Content: {extract_content}")
+    if local:
+        print(f"Local Index Path: {settings.local_search_path}")
     print()
 
-    if not await search_service.is_available():
-        print("ERROR: OpenSearch is not available!")
-        print("Make sure OpenSearch is running:")
-        print("  docker compose -f docker/docker-compose.db.yml up opensearch")
-        sys.exit(1)
-
-    print("OpenSearch connection: OK")
-
-    if recreate:
-        print("Recreating index...")
-        await search_service.create_index(delete_existing=True)
-    else:
-        print("Creating index if not exists...")
-        await search_service.create_index(delete_existing=False)
+    if not local:
+        if not await search_service.is_available(refresh=True):
+            print("ERROR: OpenSearch is not available!")
+            print("Make sure OpenSearch is running:")
+            print("  docker compose -f docker/docker-compose.db.yml up opensearch")
+            print("Or build the local fallback index instead with --local")
+            sys.exit(1)
+
+        print("OpenSearch connection: OK")
+
+        if recreate:
+            print("Creating new index version...")
+            target_index = await search_service.begin_reindex()
+            if target_index is None:
+                print("ERROR: Could not create a new index version!")
+                sys.exit(1)
+            print(f"Building into: {target_index}")
+        else:
+            print("Creating index if not exists...")
+            await search_service.create_index()
 
-    stats = await search_service.get_index_stats()
-    if stats:
-        print(f"Current index stats: {stats['doc_count']} documents, {stats['size_mb']} MB")
+        stats = await search_service.get_index_stats()
+        if stats:
+            print(f"Current index stats: {stats['doc_count']} documents, {stats['size_mb']} MB")
 
     engine = create_async_engine(settings.database_url)
     async_session = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
@@ -170,10 +197,24 @@ async def build_index(
         elif extract_content:
             print("WARNING: CloudFront URL not configured, skipping content extraction")
 
+        if local:
+            print()
+            print(f"Writing local index for {len(docs_to_index)} documents...")
+            start_time = time.time()
+            written = write_local_index(docs_to_index)
+            size_mb = Path(settings.local_search_path).stat().st_size / (1024 * 1024)
+            print(f"Local index written in {time.time() - start_time:.1f}s")
+            print(f"  Documents: {written}")
+            print(f"  Size: {size_mb:.2f} MB")
+            await engine.dispose()
+            return
+
         print()
         print(f"Indexing {len(docs_to_index)} documents...")
 
-        success, failed = await search_service.bulk_index_documents(docs_to_index)
+        success, failed = await search_service.bulk_index_documents(
+            docs_to_index, index=target_index
+        )
 
         print()
         print("=== Indexing Summary ===")
@@ -181,6 +222,16 @@ async def build_index(
         print(f"Successfully indexed: {success}")
         print(f"Failed: {failed}")
 
+        if target_index:
+            print()
+            if failed:
+                print(f"Not switching the search alias: {failed} documents failed to index.")
+                print(f"Promote manually with: scripts/manage_search_index.py promote {target_index}")
+            elif await search_service.promote_index(target_index):
+                print(f"Search alias now points to {target_index}")
+            else:
+                print(f"ERROR: Could not switch the search alias to {target_index}")
+
         stats = await search_service.get_index_stats()
         if stats:
             print()
@@ -196,7 +247,7 @@ def main() -> None:
     parser.add_argument(
         "--recreate",
         action="store_true",
-        help="Delete and recreate the index before indexing",
+        help="Build a new index version and switch the search alias to it when done",
     )
     parser.add_argument(
         "--limit",
@@ -223,6 +274,11 @@ def main() -> None:
         default=10,
         help="Number of concurrent PDF downloads (default: 10)",
     )
+    parser.add_argument(
+        "--local",
+        action="store_true",
+        help="Write the local fallback index instead of indexing to OpenSearch",
+    )
 
     args = parser.parse_args()
 
@@ -237,6 +293,7 @@ def main() -> None:
             limit=args.limit,
             extract_content=args.extract_content,
             concurrency=args.concurrency,
+            local=args.local,
         )
     )
 
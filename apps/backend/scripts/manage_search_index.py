@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Manage the versioned OpenSearch indices behind the search alias.
+
+Searches read through the alias OPENSEARCH_INDEX, which points at one
+physical index named OPENSEARCH_INDEX_v<N>. Full rebuilds fill a new version
+and then move the alias, so older versions stay around for rollback until
+they are garbage-collected.
+
+Usage:
+    cd apps/backend
+    uv run python scripts/manage_search_index.py status
+    uv run python scripts/manage_search_index.py promote holy_grail_documents_v8
+    uv run python scripts/manage_search_index.py rollback
+    uv run python scripts/manage_search_index.py cleanup
+
+Commands:
+    status          List index versions and which one serves searches
+    promote INDEX   Restore live settings on INDEX and point the alias at it
+    rollback        Point the alias back at the previous version
+    cleanup         Delete versions beyond OPENSEARCH_INDEX_RETAIN_VERSIONS
+"""
+import argparse
+import asyncio
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.core.config import settings  # noqa: E402
+from app.services.cache import cache_service  # noqa: E402
+from app.services.search import search_service  # noqa: E402
+
+
+async def print_status() -> None:
+    versions = await search_service.list_index_versions()
+    if not versions:
+        print("No versioned indices found.")
+        return
+
+    for version in versions:
+        flags = []
+        if version["live"]:
+            flags.append("live")
+        if version["building"]:
+            flags.append("building")
+        suffix = f" ({', '.join(flags)})" if flags else ""
+        print(f"  {version['index']}{suffix}")
+
+
+async def run(command: str, index: str | None) -> None:
+    print(f"OpenSearch Host: {settings.opensearch_host}:{settings.opensearch_port}")
+    print(f"Search Alias: {search_service.index_name}")
+    print()
+
+    if not await search_service.is_available(refresh=True):
+        print("ERROR: OpenSearch is not available!")
+        sys.exit(1)
+
+    if command == "promote":
+        if not await search_service.promote_index(index):
+            print(f"ERROR: Could not promote {index}")
+            sys.exit(1)
+        await cache_service.invalidate_search()
+        print(f"Search alias now points to {index}")
+    elif command == "rollback":
+        previous = await search_service.rollback_index()
+        if previous is None:
+            print("ERROR: No older version to roll back to")
+            sys.exit(1)
+        await cache_service.invalidate_search()
+        print(f"Search alias now points to {previous}")
+    elif command == "cleanup":
+        deleted = await search_service.cleanup_indices()
+        print(f"Deleted {len(deleted)} old versions: {', '.join(deleted) or '-'}")
+
+    print()
+    print("Index versions:")
+    await print_status()
+
+    await search_service.close()
+    await cache_service.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Manage versioned search indices")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    subparsers.add_parser("status", help="List index versions")
+    promote = subparsers.add_parser("promote", help="Point the search alias at an index version")
+    promote.add_argument("index", help="Index version to promote")
+    subparsers.add_parser("rollback", help="Point the search alias at the previous version")
+    subparsers.add_parser("cleanup", help="Delete versions beyond the retention limit")
+
+    args = parser.parse_args()
+    asyncio.run(run(args.command, getattr(args, "index", None)))
+
+
+if __name__ == "__main__":
+    main()
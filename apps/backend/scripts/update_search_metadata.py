@@ -34,7 +34,7 @@ async def update_metadata() -> None:
     print(f"OpenSearch Index: {settings.opensearch_index}")
     print()
 
-    if not await search_service.is_available():
+    if not await search_service.is_available(refresh=True):
         print("ERROR: OpenSearch is not available!")
         print("Make sure OpenSearch is running:")
         print("  docker compose -f docker/docker-compose.db.yml up opensearch")
@@ -1,3 +1,5 @@
+from typing import Literal
+
 from dotenv import load_dotenv
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
@@ -6,12 +8,14 @@ from pydantic import BaseModel, EmailStr
 load_dotenv()
 
 from tasks.delete_document import delete_document_task  # noqa: E402
+from tasks.extract_document_content import extract_document_content_task  # noqa: E402
 from tasks.fetch_google_analytics import fetch_google_analytics  # noqa: E402
 from tasks.health_check import ping  # noqa: E402
 from tasks.index_document import index_document_task  # noqa: E402
 from tasks.new_password_email import send_new_password_email_task  # noqa: E402
 from tasks.reset_password_email import send_reset_password_email_task  # noqa: E402
 from tasks.update_scoreboard_users import update_scoreboard_users_task  # noqa: E402
+from tasks.update_search_popularity import update_search_popularity_task  # noqa: E402
 from tasks.verify_email import send_verification_email_task  # noqa: E402
 from worker import celery_app  # noqa: E402
 
@@ -59,10 +63,19 @@ class IndexDocumentRequest(BaseModel):
     subject_id: int | None = None
     type_id: int | None = None
     user_id: int | None = None
+    index: str | None = None
+    refresh: Literal["true", "false", "wait_for"] | None = None
+
+
+class ExtractDocumentContentRequest(BaseModel):
+    doc_id: int
+    file_name: str
+    extension: str
 
 
 class DeleteDocumentRequest(BaseModel):
     doc_id: int
+    refresh: Literal["true", "false", "wait_for"] | None = None
 
 
 @app.get("/")
@@ -117,6 +130,12 @@ async def trigger_update_scoreboard_users():
     return {"task_id": task.id, "status": "queued"}
 
 
+@app.post("/tasks/update-search-popularity")
+async def trigger_update_search_popularity():
+    task = update_search_popularity_task.delay()
+    return {"task_id": task.id, "status": "queued"}
+
+
 @app.post("/tasks/fetch-google-analytics")
 async def trigger_fetch_google_analytics():
     task = fetch_google_analytics.delay()
@@ -151,6 +170,8 @@ async def trigger_index_document(request: IndexDocumentRequest):
         subject_id=request.subject_id,
         type_id=request.type_id,
         user_id=request.user_id,
+        index=request.index,
+        refresh=request.refresh,
     )
     return {"task_id": task.id, "status": "queued"}
 
@@ -159,5 +180,16 @@ async def trigger_index_document(request: IndexDocumentRequest):
 async def trigger_delete_document(request: DeleteDocumentRequest):
     task = delete_document_task.delay(
         doc_id=request.doc_id,
+        refresh=request.refresh,
+    )
+    return {"task_id": task.id, "status": "queued"}
+
+
+@app.post("/tasks/extract-document-content")
+async def trigger_extract_document_content(request: ExtractDocumentContentRequest):
+    task = extract_document_content_task.delay(
+        doc_id=request.doc_id,
+        file_name=request.file_name,
+        extension=request.extension,
     )
     return {"task_id": task.id, "status": "queued"}
@@ -1,3 +1,5 @@
+from typing import Literal
+
 from pydantic_settings import BaseSettings
 
 
@@ -9,6 +11,8 @@ class Settings(BaseSettings):
     opensearch_user: str | None = None
     opensearch_password: str | None = None
     opensearch_use_ssl: bool | None = None
+    opensearch_refresh_policy: Literal["true", "false", "wait_for", "coalesce"] = "coalesce"
+    opensearch_refresh_interval_ms: int = 1000
 
     aws_cloudfront_url: str | None = None
 
@@ -1,22 +1,78 @@
+import contextlib
+import threading
+import time
 from datetime import datetime
 
 from opensearchpy import OpenSearch
+from opensearchpy.exceptions import NotFoundError
 
 from config import settings
 
 
+class RefreshCoalescer:
+    """
+    Collapses refresh requests from many writes in this worker process into at
+    most one explicit ``indices.refresh`` per ``interval`` seconds.
+    """
+
+    def __init__(self, interval: float) -> None:
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._pending: set[str] = set()
+        self._last_refresh = 0.0
+        self._timer: threading.Timer | None = None
+
+    def request(self, client: OpenSearch, index: str) -> None:
+        with self._lock:
+            self._pending.add(index)
+            if self._timer is not None:
+                return
+            delay = max(self._last_refresh + self.interval - time.monotonic(), 0.0)
+            self._timer = threading.Timer(delay, self._flush, args=(client,))
+            self._timer.daemon = True
+            self._timer.start()
+
+    def _flush(self, client: OpenSearch) -> None:
+        with self._lock:
+            indices, self._pending = sorted(self._pending), set()
+            self._timer = None
+            self._last_refresh = time.monotonic()
+
+        # A missed refresh only delays visibility until the index's own refresh_interval.
+        with contextlib.suppress(Exception):
+            client.indices.refresh(index=",".join(indices))
+
+
 class SearchService:
     INDEX_SETTINGS = {
         "settings": {
             "number_of_shards": 1,
             "number_of_replicas": 0,
+            "codec": "best_compression",
             "analysis": {
                 "analyzer": {
                     "document_analyzer": {
                         "type": "standard",
                         "stopwords": "_english_",
+                    },
+                    "autocomplete_analyzer": {
+                        "type": "custom",
+                        "tokenizer": "standard",
+                        "filter": ["lowercase", "autocomplete_filter"],
+                    },
+                    "autocomplete_search_analyzer": {
+                        "type": "custom",
+                        "tokenizer": "standard",
+                        "filter": ["lowercase"],
+                    },
+                },
+                "filter": {
+                    "autocomplete_filter": {
+                        "type": "edge_ngram",
+                        "min_gram": 1,
+                        "max_gram": 20,
                     }
-                }
+                },
             },
         },
         "mappings": {
@@ -25,19 +81,33 @@ class SearchService:
                 "document_name": {
                     "type": "text",
                     "analyzer": "document_analyzer",
-                    "fields": {"keyword": {"type": "keyword"}},
+                    "fields": {
+                        "keyword": {"type": "keyword"},
+                        "suggest": {
+                            "type": "text",
+                            "analyzer": "autocomplete_analyzer",
+                            "search_analyzer": "autocomplete_search_analyzer",
+                        },
+                    },
+                    "copy_to": "search_text",
                 },
-                "category": {"type": "keyword"},
-                "subject": {"type": "keyword"},
+                "category": {"type": "keyword", "copy_to": "search_text"},
+                "subject": {"type": "keyword", "copy_to": "search_text"},
                 "doc_type": {"type": "keyword"},
                 "year": {"type": "integer"},
                 "uploaded_by": {"type": "keyword"},
                 "uploaded_on": {"type": "date"},
-                "content": {"type": "text", "analyzer": "document_analyzer"},
+                "content": {
+                    "type": "text",
+                    "analyzer": "document_analyzer",
+                    "term_vector": "with_positions_offsets",
+                },
                 "search_text": {"type": "text", "analyzer": "document_analyzer"},
                 "file_name": {"type": "keyword"},
                 "extension": {"type": "keyword"},
                 "view_count": {"type": "integer"},
+                "popularity": {"type": "rank_feature"},
+                "recent_downloads": {"type": "rank_feature"},
                 "approved": {"type": "boolean"},
                 "category_id": {"type": "integer"},
                 "subject_id": {"type": "integer"},
@@ -53,6 +123,7 @@ class SearchService:
     def __init__(self) -> None:
         self._client: OpenSearch | None = None
         self._connected = False
+        self._refresher = RefreshCoalescer(settings.opensearch_refresh_interval_ms / 1000)
 
     @property
     def client(self) -> OpenSearch | None:
@@ -62,8 +133,14 @@ class SearchService:
 
     @property
     def index_name(self) -> str:
+        """Read alias in front of the versioned physical indices."""
         return settings.opensearch_index
 
+    @property
+    def building_alias(self) -> str:
+        """Alias on a version that the backend is rebuilding."""
+        return f"{settings.opensearch_index}_building"
+
     @property
     def is_enabled(self) -> bool:
         return settings.opensearch_enabled
@@ -115,22 +192,39 @@ class SearchService:
         except Exception:
             return False
 
-    def create_index(self, delete_existing: bool = False) -> bool:
+    def create_index(self) -> bool:
+        """Create version 1 behind the read alias on a fresh cluster; never replaces an index."""
         if not self.client:
             return False
 
         try:
             if self.client.indices.exists(index=self.index_name):
-                if delete_existing:
-                    self.client.indices.delete(index=self.index_name)
-                else:
-                    return True
+                return True
 
-            self.client.indices.create(index=self.index_name, body=self.INDEX_SETTINGS)
+            self.client.indices.create(
+                index=f"{self.index_name}_v1",
+                body={**self.INDEX_SETTINGS, "aliases": {self.index_name: {}}},
+            )
             return True
         except Exception:
             return False
 
+    def _resolve_refresh(self, refresh: bool | str | None) -> tuple[bool | str, bool]:
+        if refresh is None:
+            refresh = settings.opensearch_refresh_policy
+        if refresh == "coalesce":
+            return "false", True
+        return refresh, False
+
+    def _write_targets(self, index: str | None) -> list[str]:
+        if index:
+            return [index]
+
+        targets = [self.index_name]
+        with contextlib.suppress(NotFoundError):
+            targets.extend(self.client.indices.get_alias(name=self.building_alias))
+        return targets
+
     def index_document(
         self,
         doc_id: int,
@@ -150,14 +244,12 @@ class SearchService:
         subject_id: int | None = None,
         type_id: int | None = None,
         user_id: int | None = None,
+        index: str | None = None,
+        refresh: bool | str | None = None,
     ) -> bool:
         if not self.client:
             return False
 
-        search_text = f"{document_name} {subject} {category}"
-        if content:
-            search_text += f" {content[:1000]}"
-
         doc_body = {
             "id": doc_id,
             "document_name": document_name,
@@ -168,10 +260,10 @@ class SearchService:
             "uploaded_by": uploaded_by,
             "uploaded_on": uploaded_on.isoformat(),
             "content": content or "",
-            "search_text": search_text,
             "file_name": file_name or "",
             "extension": extension or "",
             "view_count": view_count,
+            "popularity": view_count + 1,
             "approved": approved,
             "category_id": category_id,
             "subject_id": subject_id,
@@ -182,27 +274,38 @@ class SearchService:
             "doc_type_name": doc_type,
         }
 
+        refresh, coalesce = self._resolve_refresh(refresh)
         try:
-            self.client.index(
-                index=self.index_name,
-                id=str(doc_id),
-                body=doc_body,
-                refresh=True,
-            )
+            for target in self._write_targets(index):
+                self.client.index(
+                    index=target,
+                    id=str(doc_id),
+                    body=doc_body,
+                    refresh=refresh,
+                )
+                # Versions being built keep refresh disabled until they are promoted.
+                if coalesce and target == self.index_name:
+                    self._refresher.request(self.client, target)
             return True
         except Exception:
             return False
 
-    def delete_document(self, doc_id: int) -> bool:
+    def delete_document(self, doc_id: int, refresh: bool | str | None = None) -> bool:
         if not self.client:
             return False
 
+        refresh, coalesce = self._resolve_refresh(refresh)
         try:
+            live, *building = self._write_targets(None)
             self.client.delete(
-                index=self.index_name,
+                index=live,
                 id=str(doc_id),
-                refresh=True,
+                refresh=refresh,
             )
+            for target in building:
+                self.client.delete(index=target, id=str(doc_id), refresh=refresh, ignore=404)
+            if coalesce:
+                self._refresher.request(self.client, live)
             return True
         except Exception:
             return False
@@ -24,6 +24,7 @@ class DeleteDocumentTask(Task):
 def delete_document_task(
     _self,
     doc_id: int,
+    refresh: str | None = None,
 ) -> dict:
     logger.info(f"Deleting document {doc_id} from search index")
 
@@ -31,7 +32,7 @@ def delete_document_task(
         logger.warning("OpenSearch is not available, retrying...")
         raise Exception("OpenSearch is not available")
 
-    success = search_service.delete_document(doc_id)
+    success = search_service.delete_document(doc_id, refresh=refresh)
 
     if not success:
         logger.warning(f"Document {doc_id} not found in index or already deleted")
@@ -0,0 +1,40 @@
+import logging
+import os
+
+import requests
+
+from tasks.index_document import IndexDocumentTask, extract_content
+from worker import celery_app
+
+logger = logging.getLogger(__name__)
+
+BACKEND_CONTAINER_URL = os.getenv("BACKEND_CONTAINER_URL", "http://localhost:8000")
+
+
+@celery_app.task(
+    bind=True,
+    base=IndexDocumentTask,
+    name="extract_document_content",
+    # Storing the text is idempotent, so a task lost with its worker is run again.
+    acks_late=True,
+)
+def extract_document_content_task(_self, doc_id: int, file_name: str, extension: str) -> dict:
+    """
+    Extract the text of an approved document for a search backend that stores it itself.
+
+    The Postgres search backend keeps the text on the library row, which this
+    worker cannot write, so it is posted back to the backend. A failed post
+    raises and the task is retried.
+    """
+    logger.info(f"Extracting content for document {doc_id}")
+    content = extract_content(file_name, extension)
+    if not content:
+        return {"doc_id": doc_id, "stored": False}
+
+    resp = requests.post(
+        f"{BACKEND_CONTAINER_URL}/analytics/update_search_content",
+        json={"doc_id": doc_id, "content": content},
+        timeout=30,
+    )
+    resp.raise_for_status()
+    return resp.json()
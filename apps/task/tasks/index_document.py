@@ -11,6 +11,21 @@ from worker import celery_app
 logger = logging.getLogger(__name__)
 
 
+def extract_content(file_name: str, extension: str) -> str:
+    """Text of an uploaded PDF, or an empty string for other files or failed extractions."""
+    if not settings.aws_cloudfront_url or extension.lower() != ".pdf":
+        return ""
+
+    file_url = f"{settings.aws_cloudfront_url}/{file_name}"
+    logger.info(f"Extracting text from PDF: {file_url}")
+    content = extract_text_from_pdf_sync(file_url, max_chars=50000)
+    if content:
+        logger.info(f"Extracted {len(content)} characters from PDF")
+    else:
+        logger.warning(f"No text extracted from PDF: {file_url}")
+    return content
+
+
 class IndexDocumentTask(Task):
     autoretry_for = (Exception,)
     retry_backoff = True
@@ -41,6 +56,8 @@ def index_document_task(
     subject_id: int | None = None,
     type_id: int | None = None,
     user_id: int | None = None,
+    index: str | None = None,
+    refresh: str | None = None,
 ) -> dict:
     logger.info(f"Starting indexing for document {doc_id}: {document_name}")
 
@@ -48,17 +65,10 @@ def index_document_task(
         logger.warning("OpenSearch is not available, retrying...")
         raise Exception("OpenSearch is not available")
 
-    search_service.create_index(delete_existing=False)
+    if index is None:
+        search_service.create_index()
 
-    content = ""
-    if settings.aws_cloudfront_url and extension.lower() == ".pdf":
-        file_url = f"{settings.aws_cloudfront_url}/{file_name}"
-        logger.info(f"Extracting text from PDF: {file_url}")
-        content = extract_text_from_pdf_sync(file_url, max_chars=50000)
-        if content:
-            logger.info(f"Extracted {len(content)} characters from PDF")
-        else:
-            logger.warning(f"No text extracted from PDF: {file_url}")
+    content = extract_content(file_name, extension)
 
     uploaded_on_dt = datetime.fromisoformat(uploaded_on.replace("Z", "+00:00"))
 
@@ -80,6 +90,8 @@ def index_document_task(
         subject_id=subject_id,
         type_id=type_id,
         user_id=user_id,
+        index=index,
+        refresh=refresh,
     )
 
     if not success:
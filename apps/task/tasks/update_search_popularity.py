@@ -0,0 +1,29 @@
+"""
+Celery task for refreshing search ranking signals.
+
+This module contains a periodic task that pushes changed download
+counters into the search index as partial updates.
+"""
+
+import os
+
+import requests
+
+from worker import celery_app
+
+BACKEND_CONTAINER_URL = os.getenv("BACKEND_CONTAINER_URL", "http://localhost:8000")
+
+
+@celery_app.task(name="update_search_popularity")
+def update_search_popularity_task() -> dict:
+    """
+    Update popularity ranking signals in the search index.
+
+    Runs periodically so documents downloaded since the last run get
+    fresh view count and recent-downloads values without reindexing.
+
+    Returns:
+        dict: Response from the backend API.
+    """
+    resp = requests.post(f"{BACKEND_CONTAINER_URL}/analytics/update_search_popularity")
+    return resp.json()
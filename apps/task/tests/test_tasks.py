@@ -112,6 +112,18 @@ class TestTaskEndpoints:
         assert response.json() == {"task_id": "test-scoreboard-task-123", "status": "queued"}
         mock_delay.assert_called_once()
 
+    @patch("tasks.update_search_popularity.update_search_popularity_task.delay")
+    def test_update_search_popularity(self, mock_delay, test_client: TestClient):
+        """Test triggering the search popularity sync task."""
+        mock_task = MagicMock()
+        mock_task.id = "test-popularity-task-123"
+        mock_delay.return_value = mock_task
+
+        response = test_client.post("/tasks/update-search-popularity")
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json() == {"task_id": "test-popularity-task-123", "status": "queued"}
+        mock_delay.assert_called_once()
+
     @patch("tasks.fetch_google_analytics.fetch_google_analytics_task.delay")
     def test_fetch_google_analytics(self, mock_delay, test_client: TestClient):
         """Test fetching Google Analytics task."""
@@ -125,6 +137,60 @@ class TestTaskEndpoints:
         assert response.json() == {"task_id": "test-analytics-task-123", "status": "queued"}
         mock_delay.assert_called_once()
 
+    @patch("tasks.index_document.index_document_task.delay")
+    def test_index_document_into_version(self, mock_delay, test_client: TestClient):
+        """Test that a rebuild can target a specific index version."""
+        mock_task = MagicMock()
+        mock_task.id = "test-index-task-123"
+        mock_delay.return_value = mock_task
+
+        request_data = {
+            "doc_id": 1,
+            "document_name": "H2 Physics Notes",
+            "category": "GCE 'A' Levels",
+            "subject": "Physics",
+            "doc_type": "Notes",
+            "uploaded_by": "testuser",
+            "uploaded_on": "2024-01-01T00:00:00",
+            "file_name": "physics.pdf",
+            "extension": ".pdf",
+            "index": "holy_grail_documents_v2",
+        }
+
+        response = test_client.post("/tasks/index-document", json=request_data)
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json() == {"task_id": "test-index-task-123", "status": "queued"}
+        assert mock_delay.call_args.kwargs["index"] == "holy_grail_documents_v2"
+
+    @patch("tasks.extract_document_content.extract_document_content_task.delay")
+    def test_extract_document_content(self, mock_delay, test_client: TestClient):
+        """Test queuing content extraction for the Postgres search backend."""
+        mock_task = MagicMock()
+        mock_task.id = "test-extract-task-123"
+        mock_delay.return_value = mock_task
+
+        request_data = {"doc_id": 1, "file_name": "physics.pdf", "extension": ".pdf"}
+
+        response = test_client.post("/tasks/extract-document-content", json=request_data)
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json() == {"task_id": "test-extract-task-123", "status": "queued"}
+        mock_delay.assert_called_once_with(doc_id=1, file_name="physics.pdf", extension=".pdf")
+
+    @patch("tasks.extract_document_content.requests.post")
+    @patch("tasks.index_document.extract_text_from_pdf_sync", return_value="Kinematics")
+    def test_extract_document_content_posts_text(self, mock_extract, mock_post):
+        """Test that the extracted text is posted to the backend to store."""
+        from tasks.extract_document_content import extract_document_content_task
+
+        mock_post.return_value.json.return_value = {"status": "success", "stored": True}
+        with patch("tasks.index_document.settings.aws_cloudfront_url", "https://cdn.example"):
+            result = extract_document_content_task.run(1, "physics.pdf", ".pdf")
+
+        assert result == {"status": "success", "stored": True}
+        mock_extract.assert_called_once_with("https://cdn.example/physics.pdf", max_chars=50000)
+        assert mock_post.call_args.args[0].endswith("/analytics/update_search_content")
+        assert mock_post.call_args.kwargs["json"] == {"doc_id": 1, "content": "Kinematics"}
+
     @patch("worker.celery_app.AsyncResult")
     def test_get_task_status_pending(self, mock_async_result, test_client: TestClient):
         """Test getting status of a pending task."""
@@ -13,8 +13,10 @@ celery_app = Celery(
         "tasks.reset_password_email",
         "tasks.new_password_email",
         "tasks.update_scoreboard_users",
+        "tasks.update_search_popularity",
         "tasks.fetch_google_analytics",
         "tasks.index_document",
+        "tasks.extract_document_content",
         "tasks.delete_document",
     ],
 )
@@ -40,4 +42,8 @@ celery_app.conf.beat_schedule = {
         "task": "fetch_google_analytics",
         "schedule": 86400.0,
     },
+    "update_search_popularity": {
+        "task": "update_search_popularity",
+        "schedule": 600.0,
+    },
 }